@@ -0,0 +1,61 @@
+"""
+Rows/sec of logging learnings with one commit per row (learning_repository.create)
+versus the BufferedWriter that commits once per flush
+
+    python -m benchmarks.bench_buffered_writer --rows 5000
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from src.db import connection
+from src.repositories import learning_repository
+from src.repositories.buffered_writer import BufferedWriter
+
+
+def one_commit_per_row(rows: int):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(rows):
+            learning_repository.create(None, f"challenge {index}", "solution", "hard")
+
+
+def buffered(rows: int, max_rows: int):
+    with BufferedWriter(max_rows=max_rows) as writer:
+        for index in range(rows):
+            writer.add_learning(None, f"challenge {index}", "solution", "hard")
+
+
+def rows_per_second(function, rows: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        connection.configure(database=str(Path(directory) / "worklog.db"))
+        connection.get_connection()
+
+        start = time.perf_counter()
+        function(rows)
+        elapsed = time.perf_counter() - start
+
+        connection.close_all()
+
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--max-rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    per_row = rows_per_second(one_commit_per_row, args.rows)
+    batched = rows_per_second(lambda rows: buffered(rows, args.max_rows), args.rows)
+
+    print(f"one commit per row: {per_row:10.0f} rows/sec")
+    print(f"buffered writer:    {batched:10.0f} rows/sec")
+    print(f"speedup:            {batched / per_row:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Write throughput of concurrent writer processes sharing one worklog, each
+process logs learnings one transaction at a time like parallel `wl` calls
+
+    python -m benchmarks.bench_concurrency --writers 1 2 4 8 --writes 200
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.db import connection
+from src.repositories import learning_repository
+
+
+def write_learnings(database: str, writes: int):
+    connection.configure(database=database)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(writes):
+            learning_repository.create(None, f"challenge {index}", "solution", "hard")
+
+
+def run(writers: int, writes: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / "worklog.db")
+
+        # Migrates the database before the writers race for it
+        connection.configure(database=database)
+        connection.get_connection()
+        connection.close_all()
+
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=write_learnings, args=(database, writes))
+            for _ in range(writers)
+        ]
+
+        start = time.perf_counter()
+
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join()
+
+        elapsed = time.perf_counter() - start
+
+        with sqlite3.connect(database) as check:
+            (total,) = check.execute("SELECT count(*) FROM Learning").fetchone()
+
+    if total != writers * writes:
+        raise RuntimeError(f"Lost writes: {total} of {writers * writes}")
+
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+
+    for writers in args.writers:
+        print(f"{writers:3} writers: {run(writers, args.writes):10.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Per-call latency of a repository lookup with a fresh connection per call versus
+the pooled connection from src.db.connection
+
+    python -m benchmarks.bench_connection --calls 5000
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.db import connection
+from src.repositories import learning_repository
+
+GET_LEARNING_QUERY = "SELECT * FROM Learning WHERE id = ?"
+
+
+def fresh_connection_get(database: str, id: int):
+    with sqlite3.connect(database) as fresh:
+        fresh.row_factory = sqlite3.Row
+        return fresh.execute(GET_LEARNING_QUERY, (id,)).fetchone()
+
+
+def time_calls(function, calls: int) -> float:
+    start = time.perf_counter()
+
+    for index in range(calls):
+        function(index % 100 + 1)
+
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / "worklog.db")
+        connection.configure(database=database)
+
+        for index in range(100):
+            learning_repository.create(None, f"challenge {index}", "solution", "hard")
+
+        before = time_calls(lambda id: fresh_connection_get(database, id), args.calls)
+        after = time_calls(learning_repository.get, args.calls)
+
+        connection.close_all()
+
+    print(f"fresh connection per call: {before * 1e6:8.1f} us/call")
+    print(f"pooled connection:         {after * 1e6:8.1f} us/call")
+    print(f"speedup:                   {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Latency of one short-lived `wl` call: the full CLI in a new process versus
+the client talking to a warm daemon
+
+    python -m benchmarks.bench_daemon --calls 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src import client
+from src.db.constants import DATABASE_NAME
+
+COMMANDS = {
+    "projects show": ["projects", "show", "1"],
+    "learnings create": [
+        "learnings",
+        "create",
+        "--challenge",
+        "challenge",
+        "--solution",
+        "solution",
+        "--type",
+        "hard",
+    ],
+}
+
+ROOT = Path(__file__).parent.parent
+
+
+def median_ms(module: str, args: list[str], calls: int, cwd: str) -> float:
+    samples = []
+    environment = {**os.environ, "PYTHONPATH": str(ROOT)}
+
+    for _ in range(calls):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", module, *args],
+            cwd=cwd,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        samples.append(time.perf_counter() - start)
+
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / DATABASE_NAME)
+        environment = {**os.environ, "PYTHONPATH": str(ROOT)}
+
+        subprocess.run(
+            [sys.executable, "-m", "src.main", "projects", "create"]
+            + ["--name", "worklog", "--context", "cli"],
+            cwd=directory,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "src.main", "daemon", "--database", database],
+            cwd=directory,
+            env=environment,
+        )
+
+        while not os.path.exists(client.socket_path(database)):
+            time.sleep(0.01)
+
+        try:
+            for name, command in COMMANDS.items():
+                cli = median_ms("src.main", command, args.calls, directory)
+                warm = median_ms("src.client", command, args.calls, directory)
+
+                print(
+                    f"{name:18} cli {cli:7.1f} ms   client + daemon {warm:7.1f} ms"
+                    f"   {cli / warm:4.1f}x"
+                )
+        finally:
+            client.send(client.socket_path(database), {"stop": True})
+            daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares two benchmarks/run.py result files by median latency, exits with 1
+when an operation got slower than the threshold allows
+
+    python -m benchmarks.compare baseline.json bench_results.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def regressions(
+    baseline: dict, current: dict, threshold: float
+) -> list[tuple[str, str, float]]:
+    """
+    Returns (group, operation, current/baseline ratio) for every operation
+    present in both runs whose p50 grew by more than threshold
+    """
+    found = []
+
+    for group, results in current["results"].items():
+        for name, result in results.items():
+            if (before := baseline["results"].get(group, {}).get(name)) is None:
+                continue
+
+            ratio = result["p50_us"] / before["p50_us"]
+
+            if ratio > 1 + threshold:
+                found.append((group, name, ratio))
+
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+
+    for group, results in current["results"].items():
+        print(group)
+
+        for name, result in results.items():
+            before = baseline["results"].get(group, {}).get(name)
+            change = (
+                f"{result['p50_us'] / before['p50_us']:6.2f}x" if before else "   new"
+            )
+            print(f"  {name:45} p50 {result['p50_us']:12.1f} us  {change}")
+
+    if found := regressions(baseline, current, args.threshold):
+        print(f"\n{len(found)} regression(s) over {args.threshold:.0%}:")
+
+        for group, name, ratio in found:
+            print(f"  {group} / {name}: {ratio:.2f}x slower")
+
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
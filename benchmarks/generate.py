@@ -0,0 +1,93 @@
+"""
+Synthetic worklog generator
+
+    python -m benchmarks.generate worklog.db --learnings 100000 --projects 2000
+"""
+
+import argparse
+import random
+import sqlite3
+
+from faker import Faker
+
+from src.db import migrations
+
+# Faker is slow per call, a pool of generated texts is sampled instead so a
+# million learnings take seconds instead of minutes
+TEXT_POOL_SIZE = 5000
+BATCH_SIZE = 10_000
+
+
+def generate_worklog(
+    database: str, learnings: int, projects: int, seed: int = 0
+) -> sqlite3.Connection:
+    """
+    Fills database with projects and learnings spread over the last three
+    years, the returned connection is left open for the caller
+    """
+    faker = Faker()
+    Faker.seed(seed)
+    randomizer = random.Random(seed)
+
+    connection = sqlite3.connect(database)
+    migrations.migrate(connection)
+
+    challenges = [faker.sentence(nb_words=10) for _ in range(TEXT_POOL_SIZE)]
+    solutions = [faker.paragraph(nb_sentences=4) for _ in range(TEXT_POOL_SIZE)]
+    dates = [
+        faker.date_time_between(start_date="-3y").strftime("%Y-%m-%d %H:%M:%S")
+        for _ in range(TEXT_POOL_SIZE)
+    ]
+
+    with connection:
+        connection.executemany(
+            "INSERT INTO Project (name, context) VALUES (?, ?)",
+            (
+                (f"{faker.catch_phrase()} {index}", faker.paragraph())
+                for index in range(projects)
+            ),
+        )
+
+    for start in range(0, learnings, BATCH_SIZE):
+        batch = []
+
+        for _ in range(min(BATCH_SIZE, learnings - start)):
+            created_at = randomizer.choice(dates)
+            batch.append(
+                (
+                    randomizer.choice(challenges),
+                    randomizer.choice(solutions),
+                    randomizer.choice(("soft", "hard")),
+                    randomizer.randint(1, projects) if projects else None,
+                    created_at,
+                    created_at,
+                )
+            )
+
+        with connection:
+            connection.executemany(
+                """
+                INSERT INTO Learning (
+                    challenge, solution, learning_type, project_id, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                batch,
+            )
+
+    return connection
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("database")
+    parser.add_argument("--learnings", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_worklog(args.database, args.learnings, args.projects, args.seed).close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Repository and parser benchmarks against generated worklogs in temporary SQLite
+files, results are written as JSON so runs can be compared with
+benchmarks/compare.py
+
+    python -m benchmarks.run --sizes 10000 100000 1000000 --output results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.generate import generate_worklog
+from src.db import connection
+from src.repositories import learning_repository, project_repository
+from src.utils import parse_user_input
+
+LEARNING_KEYS = ("challenge", "solution", "type", "project_id")
+
+
+def measure(function: Callable[[], Any], calls: int) -> dict[str, float]:
+    durations = []
+
+    # Repositories print a line per write, it would dominate the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(calls):
+            start = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - start)
+
+    durations.sort()
+
+    return {
+        "calls": calls,
+        "mean_us": statistics.fmean(durations) * 1e6,
+        "p50_us": durations[len(durations) // 2] * 1e6,
+        "p95_us": durations[int(len(durations) * 0.95)] * 1e6,
+        "max_us": durations[-1] * 1e6,
+    }
+
+
+def learning_text(solution_bytes: int) -> str:
+    line = "Traceback (most recent call last): File app.py, line 42, in main\n"
+
+    return (
+        "Challenge:\nservice crashed on startup\n\n---\n\n"
+        f"Solution:\n{line * (solution_bytes // len(line))}\n---\n\n"
+        "Type:\nhard\n\n---\nProject id:\n1\n"
+    )
+
+
+def run_size(size: int, projects: int, seed: int) -> dict[str, dict[str, float]]:
+    randomizer = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / "worklog.db")
+
+        generate_worklog(database, size, projects, seed).close()
+        connection.configure(database=database)
+        # One-off indexing of the generated learnings, similar would time it
+        learning_repository.index_pending_terms()
+
+        def random_learning_id() -> int:
+            return randomizer.randint(1, size)
+
+        def random_project_id() -> int:
+            return randomizer.randint(1, projects)
+
+        results = {
+            "learning_repository.create": measure(
+                lambda: learning_repository.create(
+                    random_project_id(), "challenge", "solution", "hard"
+                ),
+                500,
+            ),
+            "learning_repository.get": measure(
+                lambda: learning_repository.get(random_learning_id()), 2000
+            ),
+            "learning_repository.update": measure(
+                lambda: learning_repository.update(
+                    random_learning_id(),
+                    random_project_id(),
+                    "updated challenge",
+                    "updated solution",
+                    "soft",
+                ),
+                500,
+            ),
+            "learning_repository.read page": measure(
+                lambda: learning_repository.read(
+                    limit=100, after_id=random_learning_id()
+                ),
+                200,
+            ),
+            "learning_repository.read by project": measure(
+                lambda: learning_repository.read(project_id=random_project_id()),
+                200,
+            ),
+            "learning_repository.read_chunks full scan": measure(
+                lambda: sum(len(chunk) for chunk in learning_repository.read_chunks()),
+                3,
+            ),
+            "learning_repository.search": measure(
+                lambda: learning_repository.search("service crashed", limit=20), 200
+            ),
+            "learning_repository.similar": measure(
+                lambda: learning_repository.similar(random_learning_id()), 100
+            ),
+            "learning_repository.count_by_project": measure(
+                learning_repository.count_by_project, 20
+            ),
+            "learning_repository.count_by_period": measure(
+                lambda: learning_repository.count_by_period("week"), 20
+            ),
+            "project_repository.create": measure(
+                lambda: project_repository.create(
+                    f"project {randomizer.random()}", "context"
+                ),
+                200,
+            ),
+            "project_repository.get": measure(
+                lambda: project_repository.get(random_project_id()), 2000
+            ),
+            "project_repository.update": measure(
+                lambda: project_repository.update(
+                    random_project_id(), f"project {randomizer.random()}", "context"
+                ),
+                200,
+            ),
+            "project_repository.read": measure(project_repository.read, 20),
+        }
+
+        connection.close_all()
+
+    return results
+
+
+def run_parser() -> dict[str, dict[str, float]]:
+    small, large = learning_text(1_000), learning_text(1_000_000)
+
+    return {
+        "parse_user_input 1KB": measure(
+            lambda: parse_user_input(small, LEARNING_KEYS), 2000
+        ),
+        "parse_user_input 1MB": measure(
+            lambda: parse_user_input(large, LEARNING_KEYS), 20
+        ),
+        "parse_user_input 1MB stream": measure(
+            lambda: parse_user_input(io.StringIO(large), LEARNING_KEYS), 20
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--projects", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "results": {"parser": run_parser()},
+    }
+
+    for size in args.sizes:
+        report["results"][f"{size} learnings"] = run_size(
+            size, args.projects, args.seed
+        )
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    for group, results in report["results"].items():
+        print(group)
+
+        for name, result in results.items():
+            print(
+                f"  {name:45} p50 {result['p50_us']:12.1f} us"
+                f"  p95 {result['p95_us']:12.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
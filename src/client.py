@@ -0,0 +1,182 @@
+"""
+Lightweight `wl` for shell hooks and other short-lived calls
+
+    python -m src.client learnings create --challenge ... --solution ...
+
+The command is sent to a `wl daemon` over a Unix socket and its output is
+printed here, so the call doesn't import Typer, Rich or the repositories. When
+the daemon isn't running it's started in the background and the command runs
+in this process. Commands that open the editor, and the shell, always run in
+this process since they need the terminal
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import stat
+import sys
+from typing import Any, Optional
+
+from src.db.constants import DATABASE_NAME
+from src.logic.daemon_exceptions import UnsafeSocketDirectory
+
+# Without any option these open the editor with the template
+EDITOR_COMMANDS = (
+    ("learnings", "create"),
+    ("learnings", "update"),
+    ("projects", "create"),
+    ("projects", "update"),
+)
+IN_PROCESS_COMMANDS = ("shell", "daemon")
+# Options of `wl` itself that can come before the command, with how many
+# values each takes
+ROOT_OPTIONS = {"--profile": 0, "--profile-output": 1}
+
+
+def socket_path(database: str) -> str:
+    """
+    One daemon per worklog, the socket name is derived from the absolute
+    database path and lives in the user's runtime directory
+    """
+    digest = hashlib.sha1(os.path.abspath(database).encode()).hexdigest()[:16]
+
+    return os.path.join(socket_directory(), f"wl-{os.getuid()}-{digest}.sock")
+
+
+def socket_directory() -> str:
+    """
+    The user's runtime directory, or a directory of their own in /tmp without
+    it. Raises UnsafeSocketDirectory when another user could write to it, they
+    could bind the socket first and read the commands sent to it
+    """
+    directory = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/wl-{os.getuid()}"
+
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(directory, 0o700)
+
+    status = os.lstat(directory)
+
+    if (
+        not stat.S_ISDIR(status.st_mode)
+        or status.st_uid != os.getuid()
+        or status.st_mode & 0o077
+    ):
+        raise UnsafeSocketDirectory(directory)
+
+    return directory
+
+
+def runs_in_process(args: list[str]) -> bool:
+    args = _command_args(args)
+
+    if args and args[0] in IN_PROCESS_COMMANDS:
+        return True
+
+    return tuple(args[:2]) in EDITOR_COMMANDS and not any(
+        arg.startswith("--") for arg in args[2:]
+    )
+
+
+def _command_args(args: list[str]) -> list[str]:
+    # The command line without the root options in front of the command
+    position = 0
+
+    while position < len(args):
+        option, _, value = args[position].partition("=")
+
+        if option not in ROOT_OPTIONS:
+            break
+
+        position += 1 if value else 1 + ROOT_OPTIONS[option]
+
+    return args[position:]
+
+
+def send(path: str, request: dict[str, Any]) -> dict[str, Any]:
+    """
+    Sends one request as a JSON line and reads the JSON response, raises
+    FileNotFoundError or ConnectionRefusedError when no daemon listens on path
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        client.shutdown(socket.SHUT_WR)
+
+        with client.makefile("rb") as response:
+            return json.loads(response.read())
+
+
+def request(args: list[str]) -> dict[str, Any]:
+    try:
+        columns: Optional[int] = os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        columns = None
+
+    return {
+        "args": args,
+        "cwd": os.getcwd(),
+        # stdin is only read by --from-stdin, anything else would block
+        "stdin": sys.stdin.read() if "--from-stdin" in args else None,
+        "columns": columns,
+        "color": sys.stdout.isatty(),
+    }
+
+
+def start_daemon(database: str):
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, "-m", "src.main", "daemon", "--database", database],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def run_in_process(args: list[str], stdin: Optional[str] = None):
+    from src.main import app
+
+    if stdin is not None:
+        # Already read for the daemon
+        sys.stdin = io.StringIO(stdin)
+
+    app(args, prog_name="wl")
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    args = sys.argv[1:] if args is None else args
+    database = os.path.abspath(DATABASE_NAME)
+
+    if runs_in_process(args):
+        run_in_process(args)
+        return 0
+
+    message = request(args)
+
+    try:
+        path = socket_path(database)
+    except UnsafeSocketDirectory as e:
+        sys.stderr.write(f"wl: not using the daemon, {e} isn't private\n")
+        run_in_process(args, message["stdin"])
+        return 0
+
+    try:
+        response = send(path, message)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # The next call finds the daemon running
+        start_daemon(database)
+        run_in_process(args, message["stdin"])
+        return 0
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+
+    return response["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
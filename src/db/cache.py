@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+DEFAULT_MAX_SIZE = 1024
+
+
+class RowCache:
+    """
+    Bounded LRU cache of rows by id in front of a repository's get.
+
+    Writers call invalidate(id) for the rows they change. Commits made by
+    other connections, e.g. another wl process, show up as a new
+    PRAGMA data_version on the caller's connection and clear the whole cache,
+    as does a connection opened after connection.configure()
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._rows: OrderedDict[Any, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get(
+        self, connection: sqlite3.Connection, id: Any, load: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns the cached row for id or the row load() reads, missing rows
+        (None) aren't cached so a later create never leaves a stale miss
+        """
+        key = _key(id)
+
+        self._check_data_version(connection)
+
+        with self._lock:
+            if key in self._rows:
+                self._rows.move_to_end(key)
+                self.hits += 1
+                return self._rows[key]
+
+            self.misses += 1
+
+        row = load()
+
+        if row is not None:
+            with self._lock:
+                self._rows[key] = row
+                self._rows.move_to_end(key)
+
+                if len(self._rows) > self.max_size:
+                    self._rows.popitem(last=False)
+
+        return row
+
+    def invalidate(self, id: Any):
+        with self._lock:
+            self._rows.pop(_key(id), None)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _check_data_version(self, connection: sqlite3.Connection):
+        (version,) = connection.execute("PRAGMA data_version").fetchone()
+        seen: Optional[tuple[sqlite3.Connection, int]] = getattr(
+            self._local, "seen", None
+        )
+
+        if seen is not None and seen[0] is connection and seen[1] == version:
+            return
+
+        # Either another connection committed since this one last looked or
+        # the thread is on a new connection that can't tell what changed
+        # before it was opened, the cached rows can't be trusted
+        self.clear()
+
+        self._local.seen = (connection, version)
+
+
+def _key(id: Any) -> Any:
+    # Ids come in as ints from the code and as strings from the command line
+    try:
+        return int(id)
+    except (TypeError, ValueError):
+        return id
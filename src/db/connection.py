@@ -0,0 +1,183 @@
+import contextlib
+import functools
+import random
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Callable, Iterator, Optional, TypeVar
+
+from src.db import migrations
+from src.db.constants import DATABASE_NAME
+
+# WAL lets readers run next to a writer and makes commits cheaper, NORMAL
+# synchronous is durable across application crashes in WAL mode. Writers still
+# take turns, busy_timeout (ms) is how long one waits for the lock
+DEFAULT_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -8000,
+    "temp_store": "MEMORY",
+}
+
+BUSY_RETRIES = 5
+BUSY_BACKOFF_SECONDS = 0.05
+
+T = TypeVar("T")
+
+_local = threading.local()
+_lock = threading.Lock()
+_connections: set[sqlite3.Connection] = set()
+_generation = 0
+_database = DATABASE_NAME
+_pragmas: dict[str, str | int] = dict(DEFAULT_PRAGMAS)
+_migrated: set[str] = set()
+_factory: type[sqlite3.Connection] = sqlite3.Connection
+
+
+def configure(
+    database: Optional[str] = None,
+    pragmas: Optional[dict[str, str | int]] = None,
+    factory: Optional[type[sqlite3.Connection]] = None,
+):
+    """
+    Points the pool at another database, pragma set and/or connection class
+    (e.g. profiling.ProfiledConnection).
+
+    Every open connection is closed, threads reconnect lazily on their next call
+    """
+    global _database, _pragmas, _factory
+
+    close_all()
+
+    with _lock:
+        if database is not None:
+            _database = database
+
+        if pragmas is not None:
+            _pragmas = {**DEFAULT_PRAGMAS, **pragmas}
+
+        if factory is not None:
+            _factory = factory
+
+
+def database_name() -> str:
+    return _database
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Returns the connection owned by the calling thread, opening it on first use.
+    It's closed when the thread exits
+    """
+    entry: Optional[_Entry] = getattr(_local, "entry", None)
+
+    if entry is not None and entry.generation == _generation:
+        return entry.connection
+
+    connection = _connect()
+
+    with _lock:
+        _connections.add(connection)
+        entry = _Entry(_generation, connection)
+
+    # Thread locals are dropped when their thread exits, and the entry with
+    # them. Set outside the lock, dropping a previous entry takes it
+    weakref.finalize(entry, _release, connection)
+    _local.entry = entry
+
+    return connection
+
+
+class _Entry:
+    # A thread's connection and the pool generation it was opened in
+    __slots__ = ("generation", "connection", "__weakref__")
+
+    def __init__(self, generation: int, connection: sqlite3.Connection):
+        self.generation = generation
+        self.connection = connection
+
+
+def _release(connection: sqlite3.Connection):
+    with _lock:
+        _connections.discard(connection)
+
+    connection.close()
+
+
+@contextlib.contextmanager
+def snapshot() -> Iterator[sqlite3.Connection]:
+    """
+    Runs the calling thread's reads inside one read transaction, they all see
+    the worklog as it was at the first read while writers keep going (WAL)
+    """
+    connection = get_connection()
+    connection.execute("BEGIN")
+
+    try:
+        yield connection
+    finally:
+        connection.rollback()
+
+
+def close_all():
+    global _generation
+
+    with _lock:
+        for connection in _connections:
+            connection.close()
+
+        _connections.clear()
+        _generation += 1
+
+
+def _connect() -> sqlite3.Connection:
+    # Each connection is only ever used by the thread that opened it, the flag
+    # is disabled so close_all() can close it from any thread
+    connection = sqlite3.connect(_database, check_same_thread=False, factory=_factory)
+    connection.row_factory = sqlite3.Row
+
+    for name, value in _pragmas.items():
+        connection.execute(f"PRAGMA {name} = {value}")
+
+    # The schema is checked once per database and process, not on every call.
+    # Each in-memory connection is a new database so it's always migrated
+    if _database not in _migrated or _database == ":memory:":
+        migrations.migrate(connection)
+
+        with _lock:
+            _migrated.add(_database)
+
+    return connection
+
+
+def retry_when_busy(function: Callable[..., T]) -> Callable[..., T]:
+    """
+    Retries a write with exponential backoff when the database stays busy or
+    locked after busy_timeout, the wrapped function must run its statements in
+    a single transaction so a retry starts from scratch
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs) -> T:
+        for attempt in range(BUSY_RETRIES - 1):
+            try:
+                return function(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e):
+                    raise
+
+                # Jitter keeps writers that failed together from retrying together
+                time.sleep(BUSY_BACKOFF_SECONDS * 2**attempt * random.uniform(0.5, 1.5))
+
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    return getattr(error, "sqlite_errorcode", None) in (
+        sqlite3.SQLITE_BUSY,
+        sqlite3.SQLITE_LOCKED,
+    ) or "database is locked" in str(error)
@@ -1,2 +1 @@
-
-DATABASE_NAME = 'worklog.db'
\ No newline at end of file
+DATABASE_NAME = "worklog.db"
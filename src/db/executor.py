@@ -0,0 +1,116 @@
+import asyncio
+import queue
+import threading
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+MAX_BATCH_SIZE = 64
+
+_Call = tuple[asyncio.AbstractEventLoop, asyncio.Future, Callable[..., Any], tuple]
+# A call's future with its result or the exception it raised
+_Outcome = tuple[asyncio.Future, Any, Optional[BaseException]]
+
+
+class DatabaseExecutor:
+    """
+    Runs blocking database calls on one dedicated thread for asyncio code.
+
+    The thread owns its pooled connection. Calls queued while it's busy are
+    run back to back in a single wake-up and their results handed back to
+    each event loop at once, so the loop is woken once per batch instead of
+    once per call. A call's result is held until its batch is done
+    """
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE):
+        self._max_batch_size = max_batch_size
+        self._calls: queue.SimpleQueue[Optional[_Call]] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._work, name="wl-database", daemon=True
+        )
+        self._thread.start()
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._calls.put((loop, future, function, args))
+
+        return await future
+
+    def shutdown(self):
+        self._calls.put(None)
+        self._thread.join()
+
+    def _work(self):
+        while (call := self._calls.get()) is not None:
+            batch = [call]
+
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._calls.get_nowait())
+                except queue.Empty:
+                    break
+
+            outcomes: dict[asyncio.AbstractEventLoop, list[_Outcome]] = {}
+
+            for call in batch:
+                if call is None:
+                    break
+
+                loop, future, function, args = call
+                outcomes.setdefault(loop, []).append(_call(future, function, args))
+
+            for loop, loop_outcomes in outcomes.items():
+                try:
+                    loop.call_soon_threadsafe(_resolve, loop_outcomes)
+                except RuntimeError:
+                    # The caller's event loop was closed before the calls finished
+                    pass
+
+            if call is None:
+                return
+
+
+def _call(
+    future: asyncio.Future, function: Callable[..., Any], args: tuple
+) -> _Outcome:
+    try:
+        return future, function(*args), None
+    except BaseException as e:
+        return future, None, e
+
+
+def _resolve(outcomes: list[_Outcome]):
+    for future, result, error in outcomes:
+        # The awaiting task may have been cancelled in the meantime
+        if future.done():
+            continue
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+_executor: Optional[DatabaseExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> DatabaseExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = DatabaseExecutor()
+
+        return _executor
+
+
+def shutdown():
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
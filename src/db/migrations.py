@@ -0,0 +1,511 @@
+import sqlite3
+from typing import NamedTuple
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    statements: tuple[str, ...]
+
+
+# Append only: a released migration is never edited, schema changes go into a
+# new version. Statements use IF NOT EXISTS so worklogs created with the old
+# standalone create-table scripts are adopted without errors
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "create project table",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS Project (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                context TEXT NOT NULL,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            );
+            """,
+        ),
+    ),
+    Migration(
+        2,
+        "create learning table",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS Learning (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                challenge TEXT NOT NULL,
+                solution TEXT NOT NULL,
+                learning_type TEXT NOT NULL CHECK(learning_type IN ('soft', 'hard')),
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+                project_id INTEGER,
+                FOREIGN KEY (project_id) REFERENCES Project(id)
+            );
+            """,
+        ),
+    ),
+    Migration(
+        3,
+        "index learning project, type and creation date",
+        (
+            "CREATE INDEX IF NOT EXISTS LearningProjectId ON Learning (project_id);",
+            "CREATE INDEX IF NOT EXISTS LearningType ON Learning (learning_type);",
+            "CREATE INDEX IF NOT EXISTS LearningCreatedAt ON Learning (created_at);",
+        ),
+    ),
+    Migration(
+        4,
+        "full-text search over learnings",
+        (
+            # External content FTS5 index over challenge and solution, the
+            # triggers keep it in sync with Learning so the text is stored once
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS LearningSearch USING fts5(
+                challenge,
+                solution,
+                content='Learning',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            );
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningSearchInsert
+            AFTER INSERT ON Learning
+            BEGIN
+                INSERT INTO LearningSearch (rowid, challenge, solution)
+                VALUES (new.id, new.challenge, new.solution);
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningSearchDelete
+            AFTER DELETE ON Learning
+            BEGIN
+                INSERT INTO LearningSearch (LearningSearch, rowid, challenge, solution)
+                VALUES ('delete', old.id, old.challenge, old.solution);
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningSearchUpdate
+            AFTER UPDATE OF challenge, solution ON Learning
+            BEGIN
+                INSERT INTO LearningSearch (LearningSearch, rowid, challenge, solution)
+                VALUES ('delete', old.id, old.challenge, old.solution);
+                INSERT INTO LearningSearch (rowid, challenge, solution)
+                VALUES (new.id, new.challenge, new.solution);
+            END;
+            """,
+            # Indexes the learnings logged before the search table existed
+            "INSERT INTO LearningSearch (LearningSearch) VALUES ('rebuild');",
+        ),
+    ),
+    Migration(
+        5,
+        "learning counts per project and per day",
+        (
+            # Incremental counts for wl stats. A multi-year worklog has a few
+            # thousand rows in each table instead of one per learning, counts
+            # per project don't depend on the day and the other way round.
+            # Learnings without a project are counted under project 0 so the
+            # key has no NULLs
+            """
+            CREATE TABLE IF NOT EXISTS LearningProjectSummary (
+                project_id INTEGER NOT NULL,
+                learning_type TEXT NOT NULL,
+                learnings INTEGER NOT NULL,
+                PRIMARY KEY (project_id, learning_type)
+            ) WITHOUT ROWID;
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS LearningDaySummary (
+                day TEXT NOT NULL,
+                learning_type TEXT NOT NULL,
+                learnings INTEGER NOT NULL,
+                PRIMARY KEY (day, learning_type)
+            ) WITHOUT ROWID;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningSummaryInsert
+            AFTER INSERT ON Learning
+            BEGIN
+                INSERT INTO LearningProjectSummary (project_id, learning_type, learnings)
+                VALUES (ifnull(new.project_id, 0), new.learning_type, 1)
+                ON CONFLICT (project_id, learning_type)
+                DO UPDATE SET learnings = learnings + 1;
+
+                INSERT INTO LearningDaySummary (day, learning_type, learnings)
+                VALUES (date(new.created_at), new.learning_type, 1)
+                ON CONFLICT (day, learning_type)
+                DO UPDATE SET learnings = learnings + 1;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningSummaryDelete
+            AFTER DELETE ON Learning
+            BEGIN
+                UPDATE LearningProjectSummary SET learnings = learnings - 1
+                WHERE project_id = ifnull(old.project_id, 0)
+                AND learning_type = old.learning_type;
+
+                DELETE FROM LearningProjectSummary
+                WHERE project_id = ifnull(old.project_id, 0)
+                AND learning_type = old.learning_type
+                AND learnings = 0;
+
+                UPDATE LearningDaySummary SET learnings = learnings - 1
+                WHERE day = date(old.created_at) AND learning_type = old.learning_type;
+
+                DELETE FROM LearningDaySummary
+                WHERE day = date(old.created_at)
+                AND learning_type = old.learning_type
+                AND learnings = 0;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningSummaryUpdate
+            AFTER UPDATE OF project_id, learning_type, created_at ON Learning
+            BEGIN
+                UPDATE LearningProjectSummary SET learnings = learnings - 1
+                WHERE project_id = ifnull(old.project_id, 0)
+                AND learning_type = old.learning_type;
+
+                DELETE FROM LearningProjectSummary
+                WHERE project_id = ifnull(old.project_id, 0)
+                AND learning_type = old.learning_type
+                AND learnings = 0;
+
+                UPDATE LearningDaySummary SET learnings = learnings - 1
+                WHERE day = date(old.created_at) AND learning_type = old.learning_type;
+
+                DELETE FROM LearningDaySummary
+                WHERE day = date(old.created_at)
+                AND learning_type = old.learning_type
+                AND learnings = 0;
+
+                INSERT INTO LearningProjectSummary (project_id, learning_type, learnings)
+                VALUES (ifnull(new.project_id, 0), new.learning_type, 1)
+                ON CONFLICT (project_id, learning_type)
+                DO UPDATE SET learnings = learnings + 1;
+
+                INSERT INTO LearningDaySummary (day, learning_type, learnings)
+                VALUES (date(new.created_at), new.learning_type, 1)
+                ON CONFLICT (day, learning_type)
+                DO UPDATE SET learnings = learnings + 1;
+            END;
+            """,
+            """
+            INSERT INTO LearningProjectSummary (project_id, learning_type, learnings)
+            SELECT ifnull(project_id, 0), learning_type, count(*)
+            FROM Learning
+            GROUP BY 1, 2;
+            """,
+            """
+            INSERT INTO LearningDaySummary (day, learning_type, learnings)
+            SELECT date(created_at), learning_type, count(*)
+            FROM Learning
+            GROUP BY 1, 2;
+            """,
+            # Covers the per project counts computed straight from Learning
+            """
+            CREATE INDEX IF NOT EXISTS LearningProjectType
+            ON Learning (project_id, learning_type);
+            """,
+        ),
+    ),
+    Migration(
+        6,
+        "tags",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS Tag (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE
+            );
+            """,
+            # The primary key answers "tags of a learning", the index the other
+            # way round, both without touching the table rows
+            """
+            CREATE TABLE IF NOT EXISTS LearningTag (
+                learning_id INTEGER NOT NULL REFERENCES Learning(id),
+                tag_id INTEGER NOT NULL REFERENCES Tag(id),
+                PRIMARY KEY (learning_id, tag_id)
+            ) WITHOUT ROWID;
+            """,
+            "CREATE INDEX IF NOT EXISTS LearningTagTag ON LearningTag (tag_id, learning_id);",
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningTagDelete
+            AFTER DELETE ON Learning
+            BEGIN
+                DELETE FROM LearningTag WHERE learning_id = old.id;
+            END;
+            """,
+        ),
+    ),
+    Migration(
+        7,
+        "term vectors for similar learnings",
+        (
+            # One row per term of a learning with its weight in the learning's
+            # unit length vector, the primary key is the term's posting list
+            """
+            CREATE TABLE IF NOT EXISTS LearningTerm (
+                term TEXT NOT NULL,
+                learning_id INTEGER NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (term, learning_id)
+            ) WITHOUT ROWID;
+            """,
+            "CREATE INDEX IF NOT EXISTS LearningTermLearning ON LearningTerm (learning_id);",
+            # Document frequencies for the idf of query terms
+            """
+            CREATE TABLE IF NOT EXISTS TermDocuments (
+                term TEXT PRIMARY KEY,
+                documents INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """,
+            # Terms are extracted in Python, the triggers only queue the
+            # learnings whose text changed so every way of writing a learning
+            # (imports, restores, other tools) is picked up
+            """
+            CREATE TABLE IF NOT EXISTS LearningTermPending (
+                learning_id INTEGER PRIMARY KEY
+            );
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningTermInsert
+            AFTER INSERT ON Learning
+            BEGIN
+                INSERT OR IGNORE INTO LearningTermPending (learning_id) VALUES (new.id);
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningTermUpdate
+            AFTER UPDATE OF challenge, solution ON Learning
+            BEGIN
+                INSERT OR IGNORE INTO LearningTermPending (learning_id) VALUES (new.id);
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningTermDelete
+            AFTER DELETE ON Learning
+            BEGIN
+                UPDATE TermDocuments SET documents = documents - 1
+                WHERE term IN (SELECT term FROM LearningTerm WHERE learning_id = old.id);
+
+                DELETE FROM LearningTerm WHERE learning_id = old.id;
+                DELETE FROM LearningTermPending WHERE learning_id = old.id;
+            END;
+            """,
+            "INSERT OR IGNORE INTO LearningTermPending (learning_id) SELECT id FROM Learning;",
+        ),
+    ),
+    Migration(
+        8,
+        "change log for sync",
+        (
+            # One entry per project and learning, moved to a new sequence (the
+            # sync cursor) on every change. sync_id names the row across
+            # worklogs, deletes leave the entry behind as a tombstone
+            """
+            CREATE TABLE IF NOT EXISTS ChangeLog (
+                sequence INTEGER PRIMARY KEY,
+                entity TEXT NOT NULL CHECK(entity IN ('project', 'learning')),
+                row_id INTEGER,
+                sync_id TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+            );
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS ChangeLogRow ON ChangeLog (entity, row_id);",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ChangeLogSyncId ON ChangeLog (entity, sync_id);",
+            """
+            CREATE TRIGGER IF NOT EXISTS ProjectChangeInsert
+            AFTER INSERT ON Project
+            BEGIN
+                INSERT INTO ChangeLog (entity, row_id, sync_id)
+                VALUES ('project', new.id, lower(hex(randomblob(16))));
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS ProjectChangeUpdate
+            AFTER UPDATE ON Project
+            BEGIN
+                UPDATE ChangeLog
+                SET
+                    sequence = (SELECT max(sequence) FROM ChangeLog) + 1,
+                    changed_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE entity = 'project' AND row_id = new.id;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS ProjectChangeDelete
+            AFTER DELETE ON Project
+            BEGIN
+                UPDATE ChangeLog
+                SET
+                    sequence = (SELECT max(sequence) FROM ChangeLog) + 1,
+                    changed_at = strftime('%Y-%m-%d %H:%M:%f', 'now'),
+                    row_id = NULL,
+                    deleted = 1
+                WHERE entity = 'project' AND row_id = old.id;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningChangeInsert
+            AFTER INSERT ON Learning
+            BEGIN
+                INSERT INTO ChangeLog (entity, row_id, sync_id)
+                VALUES ('learning', new.id, lower(hex(randomblob(16))));
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningChangeUpdate
+            AFTER UPDATE ON Learning
+            BEGIN
+                UPDATE ChangeLog
+                SET
+                    sequence = (SELECT max(sequence) FROM ChangeLog) + 1,
+                    changed_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE entity = 'learning' AND row_id = new.id;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningChangeDelete
+            AFTER DELETE ON Learning
+            BEGIN
+                UPDATE ChangeLog
+                SET
+                    sequence = (SELECT max(sequence) FROM ChangeLog) + 1,
+                    changed_at = strftime('%Y-%m-%d %H:%M:%f', 'now'),
+                    row_id = NULL,
+                    deleted = 1
+                WHERE entity = 'learning' AND row_id = old.id;
+            END;
+            """,
+            # Tags travel with their learning
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningTagChangeInsert
+            AFTER INSERT ON LearningTag
+            BEGIN
+                UPDATE ChangeLog
+                SET
+                    sequence = (SELECT max(sequence) FROM ChangeLog) + 1,
+                    changed_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE entity = 'learning' AND row_id = new.learning_id;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningTagChangeDelete
+            AFTER DELETE ON LearningTag
+            BEGIN
+                UPDATE ChangeLog
+                SET
+                    sequence = (SELECT max(sequence) FROM ChangeLog) + 1,
+                    changed_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE entity = 'learning' AND row_id = old.learning_id;
+            END;
+            """,
+            # Existing rows get sync ids derived from their id and creation
+            # time, so copies of the same worklog upgraded apart agree on them
+            """
+            INSERT INTO ChangeLog (entity, row_id, sync_id, changed_at)
+            SELECT 'project', id, printf('%d@%s', id, created_at), updated_at
+            FROM Project
+            ORDER BY id;
+            """,
+            """
+            INSERT INTO ChangeLog (entity, row_id, sync_id, changed_at)
+            SELECT 'learning', id, printf('%d@%s', id, created_at), updated_at
+            FROM Learning
+            ORDER BY id;
+            """,
+        ),
+    ),
+    Migration(
+        9,
+        "maintain updated_at",
+        (
+            # Writes that set updated_at themselves are left alone, the nested
+            # update doesn't fire the trigger again (recursive_triggers is off)
+            """
+            CREATE TRIGGER IF NOT EXISTS ProjectTouch
+            AFTER UPDATE ON Project
+            WHEN new.updated_at = old.updated_at
+            BEGIN
+                UPDATE Project SET updated_at = datetime('now') WHERE id = new.id;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS LearningTouch
+            AFTER UPDATE ON Learning
+            WHEN new.updated_at = old.updated_at
+            BEGIN
+                UPDATE Learning SET updated_at = datetime('now') WHERE id = new.id;
+            END;
+            """,
+            "CREATE INDEX IF NOT EXISTS ProjectUpdatedAt ON Project (updated_at);",
+            "CREATE INDEX IF NOT EXISTS LearningUpdatedAt ON Learning (updated_at);",
+        ),
+    ),
+)
+
+CREATE_SCHEMA_MIGRATION_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS SchemaMigration (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+"""
+
+
+def pending(connection: sqlite3.Connection) -> list[Migration]:
+    connection.execute(CREATE_SCHEMA_MIGRATION_TABLE_QUERY)
+
+    applied = {
+        version
+        for (version,) in connection.execute("SELECT version FROM SchemaMigration")
+    }
+
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+def migrate(connection: sqlite3.Connection) -> list[Migration]:
+    """
+    Applies the pending migrations in a single transaction and returns them,
+    either every migration is applied or none is
+    """
+    if not pending(connection):
+        return []
+
+    # The write lock is taken before re-reading the applied versions so two
+    # processes starting at once don't apply the same migrations
+    connection.execute("BEGIN IMMEDIATE")
+
+    try:
+        to_apply = pending(connection)
+
+        for migration in to_apply:
+            for statement in migration.statements:
+                connection.execute(statement)
+
+            connection.execute(
+                "INSERT INTO SchemaMigration (version, name) VALUES (?, ?)",
+                (migration.version, migration.name),
+            )
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+    return to_apply
+
+
+def current_version(connection: sqlite3.Connection) -> int:
+    connection.execute(CREATE_SCHEMA_MIGRATION_TABLE_QUERY)
+
+    (version,) = connection.execute(
+        "SELECT coalesce(max(version), 0) FROM SchemaMigration"
+    ).fetchone()
+
+    return version
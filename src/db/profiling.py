@@ -0,0 +1,124 @@
+import sqlite3
+import time
+from typing import Any, Iterable, Optional
+
+
+class Query:
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.seconds = 0.0
+        self.rows = 0
+
+
+class QueryLog:
+    """
+    Every statement run through a ProfiledConnection while the log is active,
+    with the time spent executing it and fetching its rows
+    """
+
+    def __init__(self):
+        self.queries: list[Query] = []
+
+    def record(self, sql: str) -> Query:
+        query = Query(" ".join(sql.split()))
+        self.queries.append(query)
+        return query
+
+
+_log: Optional[QueryLog] = None
+
+
+def start() -> QueryLog:
+    global _log
+
+    _log = QueryLog()
+    return _log
+
+
+def stop():
+    global _log
+
+    _log = None
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Times execute and every fetch of a statement into the active QueryLog,
+    rows are the rows fetched or, for writes, the rows changed
+    """
+
+    _query: Optional[Query] = None
+
+    def execute(self, sql: str, parameters: Any = ()):
+        return self._timed(sql, super().execute, sql, parameters)
+
+    def executemany(self, sql: str, parameters: Iterable[Any]):
+        return self._timed(sql, super().executemany, sql, parameters)
+
+    def executescript(self, sql_script: str):
+        return self._timed(sql_script, super().executescript, sql_script)
+
+    def fetchone(self):
+        row = self._fetch(super().fetchone)
+        self._count(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size: int = 1):
+        rows = self._fetch(super().fetchmany, size)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(super().fetchall)
+        self._count(len(rows))
+        return rows
+
+    def __next__(self):
+        row = self._fetch(super().__next__)
+        self._count(1)
+        return row
+
+    def _timed(self, sql: str, run, *args):
+        self._query = _log.record(sql) if _log is not None else None
+        start = time.perf_counter()
+
+        try:
+            return run(*args)
+        finally:
+            if self._query is not None:
+                self._query.seconds += time.perf_counter() - start
+
+                if self.description is None:
+                    self._query.rows = max(self.rowcount, 0)
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+
+        try:
+            return fetch(*args)
+        finally:
+            if self._query is not None:
+                self._query.seconds += time.perf_counter() - start
+
+    def _count(self, rows: int):
+        if self._query is not None:
+            self._query.rows += rows
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """
+    Connection whose cursors, including the ones Connection.execute creates,
+    are ProfiledCursors
+    """
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters: Iterable[Any]):
+        return self.cursor().executemany(sql, parameters)
+
+    def executescript(self, sql_script: str):
+        return self.cursor().executescript(sql_script)
@@ -0,0 +1,6 @@
+# Kept apart from src.utils so the handlers can build their --format choices
+# without importing json and csv on every invocation
+
+# Formats write_records streams rows in, commands also render a Rich table
+RECORD_FORMATS = ("json", "ndjson", "csv")
+OUTPUT_FORMATS = ("table", *RECORD_FORMATS)
@@ -0,0 +1,37 @@
+from typing import Optional
+
+import typer
+
+
+def daemon(
+    ctx: typer.Context,
+    database: Optional[str] = None,
+    idle_timeout: float = 600,
+    stop: bool = False,
+):
+    """
+    Serves the commands sent by `python -m src.client` over a Unix socket,
+    keeping the connection and caches warm between them
+    """
+    from src.db.constants import DATABASE_NAME
+    from src.logic import daemon_logic
+    from src.logic.daemon_exceptions import (
+        DaemonAlreadyRunning,
+        UnsafeSocketDirectory,
+    )
+
+    try:
+        if stop:
+            if not daemon_logic.stop(database or DATABASE_NAME):
+                print("No daemon is running")
+            return
+
+        daemon_logic.serve(
+            ctx.find_root().command, database or DATABASE_NAME, idle_timeout
+        )
+    except DaemonAlreadyRunning:
+        print("A daemon is already running for this worklog")
+        raise typer.Exit(1)
+    except UnsafeSocketDirectory as e:
+        print(f"{e} can be written by other users, the daemon won't listen there")
+        raise typer.Exit(1)
@@ -0,0 +1,43 @@
+import typer
+
+app = typer.Typer()
+
+
+@app.command()
+def migrate():
+    """
+    Applies pending schema migrations
+    """
+    from src.logic import db_logic
+
+    db_logic.migrate()
+
+
+@app.command()
+def backup(destination: str, pages: int = 1024):
+    """
+    Copies the worklog into a new database file, safe while wl is writing
+    """
+    from src.logic import db_logic
+
+    db_logic.backup(destination, pages)
+
+
+@app.command()
+def export(path: str):
+    """
+    Writes every project and learning to a gzip compressed NDJSON archive
+    """
+    from src.logic import db_logic
+
+    db_logic.export(path)
+
+
+@app.command("import")
+def import_file(path: str, batch_size: int = 1000):
+    """
+    Restores the projects and learnings of an archive written by db export
+    """
+    from src.logic import db_logic
+
+    db_logic.import_file(path, batch_size)
@@ -1,20 +1,135 @@
+import sys
+from datetime import datetime
+from typing import Optional
+
+import click
 import typer
 
-from src.logic import learning_logic
+from src.formats import OUTPUT_FORMATS
 
 app = typer.Typer()
 
 
 @app.command()
-def create():
-    learning_logic.create()
+def create(
+    challenge: Optional[str] = None,
+    solution: Optional[str] = None,
+    type: Optional[str] = None,
+    project_id: Optional[int] = None,
+    tag: Optional[list[str]] = None,
+    from_stdin: bool = False,
+    similar: bool = True,
+):
+    """
+    Logs a learning, in the editor unless it comes from the options or from
+    stdin as template text, and shows similar past learnings. --no-similar
+    skips looking them up, e.g. in scripts
+    """
+    from src.logic import learning_logic
+
+    learning_logic.create(
+        sys.stdin if from_stdin else None,
+        challenge,
+        solution,
+        type,
+        project_id,
+        tag,
+        similar,
+    )
+
+
+@app.command()
+def update(
+    learning_id: int,
+    challenge: Optional[str] = None,
+    solution: Optional[str] = None,
+    type: Optional[str] = None,
+    project_id: Optional[int] = None,
+    tag: Optional[list[str]] = None,
+    from_stdin: bool = False,
+):
+    """
+    Edits a learning, in the editor unless the changes come from the options
+    or from stdin as template text. --tag replaces the learning's tags
+    """
+    from src.logic import learning_logic
+
+    learning_logic.update(
+        learning_id,
+        sys.stdin if from_stdin else None,
+        challenge,
+        solution,
+        type,
+        project_id,
+        tag,
+    )
 
 
 @app.command()
-def update(learning_id: int):
-    learning_logic.update(learning_id)
+def read(
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    stream: bool = False,
+    chunk_size: int = 500,
+    project_id: Optional[int] = None,
+    type: Optional[str] = None,
+    since: Optional[datetime] = typer.Option(None, formats=["%Y-%m-%d"]),
+    until: Optional[datetime] = typer.Option(None, formats=["%Y-%m-%d"]),
+    format: str = typer.Option("table", click_type=click.Choice(OUTPUT_FORMATS)),
+    tag: Optional[list[str]] = None,
+    any_tag: bool = False,
+    changed_since: Optional[datetime] = None,
+):
+    """
+    Lists learnings, use --limit/--after-id to page, --stream to print rows as
+    they are fetched, --project-id/--type/--since/--until to filter,
+    --tag (repeatable, all of them or --any-tag) to filter by tags,
+    --changed-since to list only the learnings updated since then (UTC) and
+    --format json|ndjson|csv for machine-readable output
+    """
+    from src.logic import learning_logic
+
+    learning_logic.read(
+        limit,
+        after_id,
+        stream,
+        chunk_size,
+        project_id,
+        type,
+        since.date() if since else None,
+        until.date() if until else None,
+        format,
+        tag,
+        any_tag,
+        changed_since,
+    )
 
 
 @app.command()
-def read():
-    learning_logic.read()
+def search(query: str, limit: int = 20):
+    """
+    Full-text search over challenges and solutions, best matches first
+    """
+    from src.logic import learning_logic
+
+    learning_logic.search(query, limit)
+
+
+@app.command()
+def similar(learning_id: int, limit: int = 5):
+    """
+    Lists the learnings most similar to a learning, to spot duplicates
+    """
+    from src.logic import learning_logic
+
+    learning_logic.similar(learning_id, limit)
+
+
+@app.command("import")
+def import_file(path: str, batch_size: int = 1000):
+    """
+    Imports learnings from a JSONL or CSV file
+    """
+    from src.logic import learning_logic
+
+    learning_logic.import_file(path, batch_size)
@@ -1,23 +1,75 @@
+import sys
+from datetime import datetime
+from typing import Optional
+
+import click
 import typer
 
-from src.logic import project_logic
+from src.formats import OUTPUT_FORMATS
 
 app = typer.Typer()
 
 
 @app.command()
-def create():
-    project_logic.create()
+def create(
+    name: Optional[str] = None,
+    context: Optional[str] = None,
+    from_stdin: bool = False,
+):
+    """
+    Creates a project, in the editor unless it comes from the options or from
+    stdin as template text
+    """
+    from src.logic import project_logic
+
+    project_logic.create(sys.stdin if from_stdin else None, name, context)
 
 
 @app.command()
-def update(id: int):
-    project_logic.update(id)
+def update(
+    id: int,
+    name: Optional[str] = None,
+    context: Optional[str] = None,
+    from_stdin: bool = False,
+):
+    """
+    Edits a project, in the editor unless the changes come from the options or
+    from stdin as template text
+    """
+    from src.logic import project_logic
+
+    project_logic.update(id, sys.stdin if from_stdin else None, name, context)
 
 
 @app.command()
-def read():
+def read(
+    format: str = typer.Option("table", click_type=click.Choice(OUTPUT_FORMATS)),
+    changed_since: Optional[datetime] = None,
+):
     """
-    Lists all projects
+    Lists all projects, --format json|ndjson|csv for machine-readable output
+    and --changed-since to list only the projects updated since then (UTC)
     """
-    project_logic.read()
+    from src.logic import project_logic
+
+    project_logic.read(format, changed_since)
+
+
+@app.command()
+def show(id: int):
+    """
+    Shows a project with its learnings
+    """
+    from src.logic import project_logic
+
+    project_logic.show(id)
+
+
+@app.command("import")
+def import_file(path: str, batch_size: int = 1000):
+    """
+    Imports projects from a JSONL or CSV file
+    """
+    from src.logic import project_logic
+
+    project_logic.import_file(path, batch_size)
@@ -0,0 +1,10 @@
+import typer
+
+
+def shell(ctx: typer.Context):
+    """
+    Runs wl commands in one process, without paying the startup cost for each
+    """
+    from src.logic import shell_logic
+
+    shell_logic.run(ctx.find_root().command)
@@ -0,0 +1,8 @@
+def stats(period: str = "month", summary: bool = True):
+    """
+    Shows how many learnings there are per project and per week or month,
+    --no-summary counts every learning instead of the trigger-maintained totals
+    """
+    from src.logic import stats_logic
+
+    stats_logic.show(period, summary)
@@ -0,0 +1,24 @@
+import typer
+
+app = typer.Typer()
+
+
+@app.command()
+def export(path: str, since: int = 0):
+    """
+    Writes the projects and learnings changed after the --since cursor (every
+    row without it) to a compressed changeset and prints the next cursor
+    """
+    from src.logic import sync_logic
+
+    sync_logic.export(path, since)
+
+
+@app.command()
+def apply(path: str, batch_size: int = 500):
+    """
+    Applies a changeset exported from another worklog, newer changes win
+    """
+    from src.logic import sync_logic
+
+    sync_logic.apply(path, batch_size)
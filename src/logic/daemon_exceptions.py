@@ -0,0 +1,6 @@
+class DaemonAlreadyRunning(Exception):
+    pass
+
+
+class UnsafeSocketDirectory(Exception):
+    pass
@@ -0,0 +1,157 @@
+import contextlib
+import fcntl
+import io
+import json
+import os
+import socketserver
+import sys
+from typing import Any
+
+import click
+from rich.console import Console
+
+from src import client
+from src.db import connection
+from src.logic import shell_logic
+from src.logic.daemon_exceptions import DaemonAlreadyRunning
+
+# Environment a request can set for the Rich consoles of its command
+REQUEST_ENVIRONMENT = ("COLUMNS", "FORCE_COLOR")
+
+
+def serve(command: click.Command, database: str, idle_timeout: float = 600):
+    """
+    Runs the commands clients send over the worklog's socket one at a time,
+    with one warm connection, its statement cache and the repository caches.
+    Stops after idle_timeout seconds without requests or on a stop request
+    """
+    path = client.socket_path(database)
+
+    with _single_instance(path):
+        connection.configure(database=os.path.abspath(database))
+        shell_logic.warm_up()
+
+        with contextlib.suppress(FileNotFoundError):
+            # Left behind by a daemon that didn't shut down cleanly
+            os.unlink(path)
+
+        previous_umask = os.umask(0o077)
+
+        try:
+            server = DaemonServer(path, command, idle_timeout)
+        finally:
+            os.umask(previous_umask)
+
+        try:
+            while not server.stopped:
+                server.handle_request()
+        finally:
+            server.server_close()
+
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+
+def stop(database: str) -> bool:
+    """
+    Asks the worklog's daemon to stop, returns False when none is running
+    """
+    try:
+        client.send(client.socket_path(database), {"stop": True})
+    except (FileNotFoundError, ConnectionRefusedError):
+        return False
+
+    return True
+
+
+def run_request(command: click.Command, request: dict[str, Any]) -> dict[str, Any]:
+    """
+    Runs the command line of a client request in the client's directory and
+    environment and returns its output and exit code
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    with _request_context(request), contextlib.redirect_stdout(
+        stdout
+    ), contextlib.redirect_stderr(stderr):
+        exit_code = shell_logic.run_command(
+            command, request["args"], Console(stderr=True)
+        )
+
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code,
+    }
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, command: click.Command, idle_timeout: float):
+        super().__init__(path, DaemonRequestHandler)
+        self.command = command
+        self.timeout = idle_timeout
+        self.stopped = False
+
+    def handle_timeout(self):
+        self.stopped = True
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self):
+        request = json.loads(self.rfile.read())
+
+        if request.get("stop"):
+            self.server.stopped = True
+            response: dict[str, Any] = {"stopped": True}
+        else:
+            response = run_request(self.server.command, request)
+
+        self.wfile.write(json.dumps(response).encode())
+
+
+@contextlib.contextmanager
+def _single_instance(path: str):
+    # Clients that find no daemon each start one, the lock lets the first keep
+    # running and the others exit. Its name is predictable and may be in /tmp,
+    # so a symlink planted there is never followed
+    lock = os.open(f"{path}.lock", os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+
+    try:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise DaemonAlreadyRunning()
+
+        yield
+    finally:
+        os.close(lock)
+
+
+@contextlib.contextmanager
+def _request_context(request: dict[str, Any]):
+    cwd = os.getcwd()
+    environment = {name: os.environ.get(name) for name in REQUEST_ENVIRONMENT}
+    stdin = sys.stdin
+
+    os.chdir(request["cwd"])
+    sys.stdin = io.StringIO(request.get("stdin") or "")
+
+    if request.get("columns"):
+        os.environ["COLUMNS"] = str(request["columns"])
+
+    if request.get("color"):
+        os.environ["FORCE_COLOR"] = "1"
+
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+        sys.stdin = stdin
+
+        for name, value in environment.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
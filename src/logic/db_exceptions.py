@@ -0,0 +1,6 @@
+class BackupDestinationExists(Exception):
+    pass
+
+
+class InvalidExportFile(Exception):
+    pass
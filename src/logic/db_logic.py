@@ -0,0 +1,244 @@
+import gzip
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from rich.console import Console
+from rich.progress import Progress
+
+from src.db import migrations
+from src.db.connection import database_name, snapshot
+from src.logic.db_exceptions import BackupDestinationExists, InvalidExportFile
+from src.repositories import learning_repository, project_repository, tag_repository
+
+EXPORT_FORMAT = "wl-export"
+EXPORT_VERSION = 1
+# gzip's default of 9 makes export CPU bound for a slightly smaller archive
+EXPORT_COMPRESSION_LEVEL = 6
+
+# The row types each row type of an export references, with the column holding
+# the archived id
+REFERENCES = {
+    "learning": (("project", "project_id"),),
+    "learning_tag": (("learning", "learning_id"),),
+}
+
+# Pause between backup steps so writers waiting on the lock in rollback journal
+# mode get their turn, in WAL mode the backup doesn't block them at all
+BACKUP_SLEEP_SECONDS = 0.01
+
+
+def migrate():
+    console = Console()
+
+    with closing(sqlite3.connect(database_name())) as connection:
+        applied = migrations.migrate(connection)
+        version = migrations.current_version(connection)
+
+    if not applied:
+        console.print(f"Database is up to date (version {version})")
+        return
+
+    for migration in applied:
+        console.print(f"Applied migration {migration.version}: {migration.name}")
+
+    console.print(f"Database migrated to version {version}")
+
+
+def backup(destination: str, pages: int = 1024):
+    """
+    Copies the worklog page by page with SQLite's online backup, pages at a
+    time, into a new database file. The copy is consistent even when wl writes
+    to the worklog meanwhile
+    """
+    if os.path.exists(destination):
+        raise BackupDestinationExists()
+
+    console = Console()
+    start = time.perf_counter()
+
+    with closing(sqlite3.connect(database_name())) as source, closing(
+        sqlite3.connect(destination)
+    ) as target, Progress(console=console, transient=True) as progress:
+        task = progress.add_task("Backing up", total=None)
+
+        def report(status: int, remaining: int, total: int):
+            progress.update(task, total=total, completed=total - remaining)
+
+        source.backup(target, pages=pages, progress=report, sleep=BACKUP_SLEEP_SECONDS)
+
+        (page_count,) = target.execute("PRAGMA page_count").fetchone()
+        (page_size,) = target.execute("PRAGMA page_size").fetchone()
+
+    elapsed = time.perf_counter() - start
+    megabytes = page_count * page_size / 1_000_000
+
+    console.print(
+        f"Backed up {megabytes:.1f} MB to {destination} in {elapsed:.2f}s "
+        f"({megabytes / elapsed if elapsed else 0:.1f} MB/s)"
+    )
+
+
+def export(path: str, chunk_size: int = 500):
+    """
+    Streams every project and learning into a gzip compressed NDJSON archive,
+    a header line first and then one {"type": ..., column: value} line per row
+    (projects, learnings and then the learnings' tags). Every row is read from
+    the same snapshot of the worklog
+    """
+    console = Console()
+    start = time.perf_counter()
+    exported = {"project": 0, "learning": 0, "learning_tag": 0}
+
+    with snapshot() as connection, gzip.open(
+        path, "wt", compresslevel=EXPORT_COMPRESSION_LEVEL, encoding="utf-8"
+    ) as file:
+        header = {
+            "format": EXPORT_FORMAT,
+            "version": EXPORT_VERSION,
+            "schema_version": migrations.current_version(connection),
+        }
+        file.write(json.dumps(header) + "\n")
+
+        for row_type, chunks, columns in (
+            (
+                "project",
+                project_repository.read_chunks(chunk_size),
+                project_repository.EXPORT_COLUMNS,
+            ),
+            (
+                "learning",
+                learning_repository.export_chunks(chunk_size),
+                learning_repository.EXPORT_COLUMNS,
+            ),
+            (
+                "learning_tag",
+                tag_repository.export_chunks(chunk_size),
+                tag_repository.EXPORT_COLUMNS,
+            ),
+        ):
+            for chunk in chunks:
+                file.write(
+                    "".join(
+                        json.dumps(
+                            {"type": row_type, **{key: row[key] for key in columns}}
+                        )
+                        + "\n"
+                        for row in chunk
+                    )
+                )
+                exported[row_type] += len(chunk)
+
+    elapsed = time.perf_counter() - start
+    rows = sum(exported.values())
+    megabytes = os.path.getsize(path) / 1_000_000
+
+    console.print(
+        f"Exported {exported['project']} projects, {exported['learning']} "
+        f"learnings and {exported['learning_tag']} tags to {path} "
+        f"({megabytes:.1f} MB) in {elapsed:.2f}s "
+        f"({rows / elapsed if elapsed else 0:.0f} rows/sec)"
+    )
+
+
+def import_file(path: str, batch_size: int = 1000):
+    """
+    Restores the rows of a db export archive with their timestamps, one
+    transaction per batch. Rows keep their archived id unless another row has
+    it, the rows that reference them follow them to their new id. Rows that
+    already exist are skipped, so an interrupted import can be run again
+    """
+    console = Console()
+    start = time.perf_counter()
+    repositories = {
+        "project": project_repository,
+        "learning": learning_repository,
+        "learning_tag": tag_repository,
+    }
+    batches: dict[str, list[tuple]] = {row_type: [] for row_type in repositories}
+    restored = {row_type: 0 for row_type in repositories}
+    # Archived ids restored under another local id
+    ids: dict[str, dict[int, int]] = {"project": {}, "learning": {}}
+    read = 0
+
+    def flush(row_type: str):
+        # The batches of the row types it references are written first so the
+        # local ids of its references are known
+        for referenced, _ in REFERENCES.get(row_type, ()):
+            if batches[referenced]:
+                flush(referenced)
+
+        rows = [
+            _remap(
+                row,
+                repositories[row_type].EXPORT_COLUMNS,
+                REFERENCES.get(row_type, ()),
+                ids,
+            )
+            for row in batches[row_type]
+        ]
+        batches[row_type] = []
+
+        if row_type == "learning_tag":
+            restored[row_type] += tag_repository.restore_many(rows)
+            return
+
+        inserted, remapped = repositories[row_type].restore_many(rows)
+        restored[row_type] += inserted
+        ids[row_type].update(remapped)
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            header = json.loads(file.readline())
+        except (json.JSONDecodeError, OSError, EOFError):
+            raise InvalidExportFile()
+
+        if not isinstance(header, dict) or header.get("format") != EXPORT_FORMAT:
+            raise InvalidExportFile()
+
+        for line in file:
+            try:
+                record = json.loads(line)
+                columns = repositories[record["type"]].EXPORT_COLUMNS
+            except (json.JSONDecodeError, TypeError, KeyError):
+                raise InvalidExportFile()
+
+            batches[record["type"]].append(tuple(record.get(key) for key in columns))
+            read += 1
+
+            if len(batches[record["type"]]) >= batch_size:
+                flush(record["type"])
+
+    for row_type in repositories:
+        if batches[row_type]:
+            flush(row_type)
+
+    elapsed = time.perf_counter() - start
+    imported = sum(restored.values())
+
+    console.print(
+        f"Restored {restored['project']} projects, {restored['learning']} "
+        f"learnings and {restored['learning_tag']} tags in {elapsed:.2f}s "
+        f"({read / elapsed if elapsed else 0:.0f} rows/sec)"
+    )
+
+    if skipped := read - imported:
+        console.print(f"Skipped {skipped} rows that already exist")
+
+
+def _remap(
+    row: tuple,
+    columns: tuple[str, ...],
+    references: tuple[tuple[str, str], ...],
+    ids: dict[str, dict[int, int]],
+) -> tuple:
+    # The row with its references to rows restored under another id replaced
+    row = list(row)
+
+    for referenced, column in references:
+        position = columns.index(column)
+        row[position] = ids[referenced].get(row[position], row[position])
+
+    return tuple(row)
@@ -1,7 +1,11 @@
+import time
+from datetime import date, datetime
 from textwrap import dedent
+from typing import Iterable, Optional
 
 import click
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
 from src.logic.learning_exceptions import (
@@ -11,159 +15,502 @@ from src.logic.learning_exceptions import (
     LearningNotFound,
 )
 from src.repositories import learning_repository
-from src.utils import Id, parse_user_input
+from src.utils import (
+    Id,
+    InvalidId,
+    parse_user_input,
+    read_records,
+    write_records,
+)
 
+LEARNING_KEYS = ("challenge", "solution", "type", "project_id", "tags")
 
-def create():
-    create_learning_template = dedent(
-        """\
-        Challenge:
+# Filled with str.format after dedent, dedenting after interpolating would stop
+# working as soon as a value spans several lines
+LEARNING_TEMPLATE = dedent(
+    """\
+    Challenge:
+    {challenge}
 
-        ---
+    ---
 
-        Solution:
+    Solution:
+    {solution}
 
-        ---
+    ---
 
-        Type:
+    Type:
+    {type}
 
-        ---
-        Project id:
-        """
-    )
-    keys_to_extract = ("challenge", "solution", "type", "project_id")
+    ---
+    Project id:
+    {project_id}
 
-    if (user_input := click.edit(create_learning_template)) is None:
-        raise Exception("Invalid user input")
+    ---
 
-    learning_input = parse_user_input(user_input, keys_to_extract)
+    Tags:
+    {tags}
+    """
+)
 
-    if "challenge" not in learning_input or learning_input["challenge"] == "":
+# Past learnings at least this similar are shown after a create, near
+# duplicates score above 0.8
+SIMILAR_MIN_SCORE = 0.5
+SIMILAR_LIMIT = 5
+
+
+def validate_learning_input(learning_input: dict[str, str]):
+    if not learning_input.get("challenge"):
         raise InvalidChallenge()
 
-    if "solution" not in learning_input or learning_input["solution"] == "":
+    if not learning_input.get("solution"):
         raise InvalidSolution()
 
-    if (
-        not learning_input.get("type")
-        or learning_input.get("type") != "soft"
-        and learning_input.get("type") != "hard"
-    ):
+    if learning_input.get("type") not in ("soft", "hard"):
         raise InvalidLearningType()
 
-    if (
-        learning_input.get("project_id") is not None
-        and learning_input.get("project_id") != ""
-    ):
-        value = learning_input.get("project_id")
-        Id.validate(value)
+    if learning_input.get("project_id"):
+        Id.validate(learning_input["project_id"])
+
+
+def create(
+    user_input: Optional[str | Iterable[str]] = None,
+    challenge: Optional[str] = None,
+    solution: Optional[str] = None,
+    learning_type: Optional[str] = None,
+    project_id: Optional[int] = None,
+    tags: Optional[list[str]] = None,
+    show_similar: bool = True,
+) -> list:
+    """
+    Opens the editor unless the learning comes as template text (user_input)
+    or as fields, both go through the same parsing and validation. Unless
+    show_similar is off, returns the most similar past learnings, which are
+    also printed
+    """
+    if user_input is None:
+        user_input = _learning_input_text(
+            challenge or "",
+            solution or "",
+            learning_type or "",
+            project_id,
+            tags or [],
+            interactive=all(
+                field is None
+                for field in (challenge, solution, learning_type, project_id, tags)
+            ),
+        )
+
+    learning_input = parse_user_input(user_input, LEARNING_KEYS)
+
+    validate_learning_input(learning_input)
 
-    learning_repository.create(
-        int(learning_input["project_id"]) if learning_input["project_id"] else None,
+    id = learning_repository.create(
+        _project_id(learning_input),
         learning_input["challenge"],
         learning_input["solution"],
         learning_input["type"],
+        _tags(learning_input),
     )
 
+    if not show_similar:
+        return []
 
-def update(id: int):
+    console = Console()
+
+    # The learning is saved, failing to look up similar ones doesn't undo that
+    try:
+        # Only slow on the first create after upgrading, every learning is
+        # indexed
+        with console.status("Looking for similar learnings"):
+            similar_learnings = [
+                learning
+                for learning in learning_repository.similar(id, SIMILAR_LIMIT)
+                if learning["score"] >= SIMILAR_MIN_SCORE
+            ]
+    except Exception as e:
+        Console(stderr=True).print(
+            f"Saved learning {id} but couldn't look up similar ones: {escape(str(e))}"
+        )
+        return []
+
+    if similar_learnings:
+        console.print("Similar learnings you logged before:")
+        console.print(_similar_table(similar_learnings))
+
+    return similar_learnings
+
+
+def update(
+    id: int,
+    user_input: Optional[str | Iterable[str]] = None,
+    challenge: Optional[str] = None,
+    solution: Optional[str] = None,
+    learning_type: Optional[str] = None,
+    project_id: Optional[int] = None,
+    tags: Optional[list[str]] = None,
+):
+    """
+    Opens the editor with the current values unless the changes come as
+    template text (user_input) or as fields that override the current values.
+    Template text without a Tags section keeps the current tags
+    """
     if (learning := learning_repository.get(id)) is None:
         raise LearningNotFound()
 
-    challenge = learning["challenge"]
-    solution = learning["solution"]
-    learning_type = learning["learning_type"]
-    project_id = learning["project_id"]
-
-    create_learning_template = dedent(
-        f"""\
-        Challenge:
-        {challenge}
+    if user_input is None:
+        user_input = _learning_input_text(
+            learning["challenge"] if challenge is None else challenge,
+            learning["solution"] if solution is None else solution,
+            learning["learning_type"] if learning_type is None else learning_type,
+            learning["project_id"] if project_id is None else project_id,
+            learning_repository.get_tags(id) if tags is None else tags,
+            interactive=all(
+                field is None
+                for field in (challenge, solution, learning_type, project_id, tags)
+            ),
+        )
 
-        ---
+    learning_input = parse_user_input(user_input, LEARNING_KEYS)
 
-        Solution:
-        {solution}
+    validate_learning_input(learning_input)
 
-        ---
+    learning_repository.update(
+        id,
+        _project_id(learning_input),
+        learning_input["challenge"],
+        learning_input["solution"],
+        learning_input["type"],
+        _tags(learning_input),
+    )
 
-        Type:
-        {learning_type}
 
-        ---
-        Project id:
-        {project_id}
-        """
+def _learning_input_text(
+    challenge: str,
+    solution: str,
+    learning_type: str,
+    project_id: Optional[int],
+    tags: list[str],
+    interactive: bool,
+) -> str:
+    template = LEARNING_TEMPLATE.format(
+        challenge=challenge,
+        solution=solution,
+        type=learning_type,
+        project_id="" if project_id is None else project_id,
+        tags=", ".join(tags),
     )
 
-    keys_to_extract = ("challenge", "solution", "type", "project_id")
+    if not interactive:
+        return template
 
-    if (user_input := click.edit(create_learning_template)) is None:
+    if (user_input := click.edit(template)) is None:
         raise Exception("Invalid user input")
 
-    learning_input = parse_user_input(user_input, keys_to_extract)
+    return user_input
 
-    if not learning_input.get("challenge"):
-        raise InvalidChallenge()
 
-    if not learning_input.get("solution"):
-        raise InvalidSolution()
+def _project_id(learning_input: dict[str, str]) -> Optional[int]:
+    return (
+        int(learning_input["project_id"]) if learning_input.get("project_id") else None
+    )
 
-    if (
-        not learning_input.get("type")
-        or learning_input.get("type") != "soft"
-        and learning_input.get("type") != "hard"
-    ):
+
+def _tags(learning_input: dict[str, str]) -> Optional[list[str]]:
+    """
+    Tags of the Tags section, separated by commas or whitespace, lowercased and
+    without repeats. None when the text has no Tags section
+    """
+    if "tags" not in learning_input:
+        return None
+
+    return list(dict.fromkeys(learning_input["tags"].replace(",", " ").lower().split()))
+
+
+def read(
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    stream: bool = False,
+    chunk_size: int = 500,
+    project_id: Optional[int] = None,
+    learning_type: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    output_format: str = "table",
+    tags: Optional[list[str]] = None,
+    any_tag: bool = False,
+    changed_since: Optional[datetime] = None,
+):
+    """
+    Renders learnings as a Rich table, or streams them straight from the
+    cursor as json, ndjson or csv. With tags only learnings with all of them
+    are listed, or with any of them when any_tag is set. changed_since (UTC
+    like the stored times) keeps the learnings updated since then
+    """
+    if learning_type is not None and learning_type not in ("soft", "hard"):
         raise InvalidLearningType()
 
-    if (
-        learning_input.get("project_id") is not None
-        and learning_input.get("project_id") != ""
+    console = Console()
+    filters = {
+        "project_id": project_id,
+        "learning_type": learning_type,
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "tags": [tag.lower() for tag in tags] if tags else None,
+        "any_tag": any_tag,
+        "changed_since": changed_since.isoformat(sep=" ") if changed_since else None,
+    }
+
+    if output_format != "table":
+        write_records(
+            learning_repository.read_chunks(
+                limit, after_id, chunk_size=chunk_size, **filters
+            ),
+            output_format,
+        )
+        return
+
+    if stream:
+        _stream_read(console, limit, after_id, chunk_size, filters)
+        return
+
+    table = _learnings_table()
+
+    if not (
+        learnings := learning_repository.read(limit=limit, after_id=after_id, **filters)
     ):
-        value = learning_input.get("project_id")
-        Id.validate(value)
+        console.print("There are no learnings")
+        return
 
-    updated_challenge = learning_input["challenge"]
-    updated_solution = learning_input["solution"]
-    updated_type = learning_input["type"]
-    updated_project_id = learning_input["project_id"]
+    for learning in learnings:
+        table.add_row(*_learning_row(learning))
 
-    learning_repository.update(
-        id,
-        int(updated_project_id) if updated_project_id else None,
-        updated_challenge,
-        updated_solution,
-        updated_type,
-    )
+    console.print(table)
+
+    if limit is not None and len(learnings) == limit:
+        console.print(f"Next page: --after-id {learnings[-1]['id']}")
 
 
-def read():
+def search(query: str, limit: int = 20):
     console = Console()
-    table = Table(
-        "Id", "Challenge", "Solution", "Learing Type", "Project id", "Date created"
-    )
 
-    if not (learnings := learning_repository.read()):
-        console.print("There are no learnings")
+    if not query.strip():
+        console.print("The search query is empty")
+        return
+
+    if not (learnings := learning_repository.search(query, limit)):
+        console.print(f"There are no learnings matching: {escape(query)}")
         return
 
+    table = Table("Id", "Match", "Learing Type", "Project", "Date created")
+
     for learning in learnings:
-        id, challenge, solution, learning_type, project_id, created_at = (
+        id, snippet, learning_type, created_at = (
             learning["id"],
-            learning["challenge"],
-            learning["solution"],
+            learning["snippet"],
             learning["learning_type"],
-            learning["project_id"],
             learning["created_at"],
         )
 
         table.add_row(
             str(id),
-            challenge,
-            solution,
+            escape(snippet)
+            .replace(learning_repository.SNIPPET_START, "[bold yellow]")
+            .replace(learning_repository.SNIPPET_END, "[/bold yellow]"),
             learning_type,
-            str(project_id) if project_id else "None",
+            _project_label(learning),
             created_at,
         )
 
     console.print(table)
+
+
+def similar(id: int, limit: int = 5):
+    """
+    Lists the learnings closest to the learning by TF-IDF cosine similarity
+    of their challenges and solutions
+    """
+    console = Console()
+
+    if learning_repository.get(id) is None:
+        raise LearningNotFound()
+
+    # Only slow on the first call after upgrading, every learning is indexed
+    with console.status("Indexing learnings"):
+        learning_repository.index_pending_terms()
+
+    if not (learnings := learning_repository.similar(id, limit)):
+        console.print(f"There are no learnings similar to {id}")
+        return
+
+    console.print(_similar_table(learnings))
+
+
+def _similar_table(learnings: list) -> Table:
+    table = Table("Id", "Similarity", "Challenge", "Learing Type", "Project")
+
+    for learning in learnings:
+        table.add_row(
+            str(learning["id"]),
+            f"{learning['score']:.2f}",
+            learning["challenge"],
+            learning["learning_type"],
+            _project_label(learning),
+        )
+
+    return table
+
+
+def _stream_read(
+    console: Console,
+    limit: Optional[int],
+    after_id: Optional[int],
+    chunk_size: int,
+    filters: dict,
+):
+    """
+    Prints one table per chunk as soon as it's fetched, only the first one
+    shows the header
+    """
+    printed = 0
+    last_id = None
+
+    for chunk in learning_repository.read_chunks(
+        limit, after_id, chunk_size=chunk_size, **filters
+    ):
+        table = _learnings_table(show_header=printed == 0)
+
+        for learning in chunk:
+            table.add_row(*_learning_row(learning))
+
+        console.print(table)
+
+        printed += len(chunk)
+        last_id = chunk[-1]["id"]
+
+    if not printed:
+        console.print("There are no learnings")
+    elif limit is not None and printed == limit:
+        console.print(f"Next page: --after-id {last_id}")
+
+
+def _learnings_table(show_header: bool = True) -> Table:
+    return Table(
+        "Id",
+        "Challenge",
+        "Solution",
+        "Learing Type",
+        "Project",
+        "Project context",
+        "Tags",
+        "Date created",
+        show_header=show_header,
+    )
+
+
+def _learning_row(learning) -> tuple[str, ...]:
+    id, challenge, solution, learning_type, project_context, created_at = (
+        learning["id"],
+        learning["challenge"],
+        learning["solution"],
+        learning["learning_type"],
+        learning["project_context"],
+        learning["created_at"],
+    )
+
+    return (
+        str(id),
+        challenge,
+        solution,
+        learning_type,
+        _project_label(learning),
+        project_context or "",
+        learning["tags"] or "",
+        created_at,
+    )
+
+
+def _project_label(learning) -> str:
+    if learning["project_name"] is not None:
+        return learning["project_name"]
+
+    # A learning can point to a project that no longer exists
+    return str(learning["project_id"]) if learning["project_id"] else "None"
+
+
+def import_file(path: str, batch_size: int = 1000):
+    """
+    Imports learnings from a JSONL or CSV file with challenge, solution, type
+    and project_id fields, records are validated like in create
+    """
+    console = Console()
+    errors: list[tuple[int, str]] = []
+    batch: list[tuple[Optional[int], str, str, str]] = []
+    batch_lines: list[int] = []
+    imported = 0
+
+    def flush():
+        nonlocal batch, batch_lines, imported
+
+        failures = learning_repository.create_many(batch)
+        imported += len(batch) - len(failures)
+        errors.extend((batch_lines[position], str(e)) for position, e in failures)
+
+        batch, batch_lines = [], []
+
+    start = time.perf_counter()
+
+    for line_number, record in read_records(path):
+        if record is None:
+            errors.append((line_number, "Invalid record"))
+            continue
+
+        learning_input = {
+            "challenge": _record_value(record, "challenge"),
+            "solution": _record_value(record, "solution"),
+            "type": _record_value(record, "type")
+            or _record_value(record, "learning_type"),
+            "project_id": _record_value(record, "project_id"),
+        }
+
+        try:
+            validate_learning_input(learning_input)
+        except (InvalidChallenge, InvalidSolution, InvalidLearningType, InvalidId) as e:
+            errors.append((line_number, type(e).__name__))
+            continue
+
+        batch.append(
+            (
+                (
+                    int(learning_input["project_id"])
+                    if learning_input["project_id"]
+                    else None
+                ),
+                learning_input["challenge"],
+                learning_input["solution"],
+                learning_input["type"],
+            )
+        )
+        batch_lines.append(line_number)
+
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    elapsed = time.perf_counter() - start
+
+    console.print(
+        f"Imported {imported} learnings in {elapsed:.2f}s "
+        f"({imported / elapsed if elapsed else 0:.0f} rows/sec)"
+    )
+
+    for line_number, error in sorted(errors):
+        console.print(f"Line {line_number}: {error}")
+
+
+def _record_value(record: dict, key: str) -> str:
+    value = record.get(key)
+
+    return "" if value is None else str(value).strip()
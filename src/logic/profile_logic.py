@@ -0,0 +1,90 @@
+import cProfile
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Callable, Optional
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from src.db import connection, profiling
+
+SLOWEST_QUERIES = 10
+SQL_WIDTH = 80
+
+
+def start(output: Optional[str] = None) -> Callable[[], None]:
+    """
+    Records every query run from now on, and with output a cProfile of the
+    command too. The returned function stops recording, prints the summary to
+    stderr and writes the pstats file
+    """
+    start_time = time.perf_counter()
+    log = profiling.start()
+    profiler = cProfile.Profile() if output else None
+
+    connection.configure(factory=profiling.ProfiledConnection)
+
+    if profiler is not None:
+        profiler.enable()
+
+    def stop():
+        if profiler is not None:
+            profiler.disable()
+
+        profiling.stop()
+        connection.configure(factory=sqlite3.Connection)
+
+        console = Console(stderr=True)
+        console.print(summary(log, time.perf_counter() - start_time))
+
+        if profiler is not None and output is not None:
+            profiler.dump_stats(output)
+            console.print(f"cProfile stats written to {output}")
+
+    return stop
+
+
+def summary(log: profiling.QueryLog, elapsed: float) -> Table:
+    """
+    Queries grouped by SQL text, the ones that took the most time in total
+    first
+    """
+    durations: defaultdict[str, list[float]] = defaultdict(list)
+    rows: defaultdict[str, int] = defaultdict(int)
+
+    for query in log.queries:
+        durations[query.sql].append(query.seconds)
+        rows[query.sql] += query.rows
+
+    total = sum(query.seconds for query in log.queries)
+    table = Table(
+        "Query",
+        "Calls",
+        "Rows",
+        "Total ms",
+        "p50 ms",
+        "p95 ms",
+        "Max ms",
+        title=(
+            f"{len(log.queries)} queries took {total * 1000:.1f} ms "
+            f"of {elapsed * 1000:.1f} ms"
+        ),
+    )
+
+    slowest = sorted(durations.items(), key=lambda item: sum(item[1]), reverse=True)
+
+    for sql, seconds in slowest[:SLOWEST_QUERIES]:
+        seconds.sort()
+        table.add_row(
+            escape(sql if len(sql) <= SQL_WIDTH else sql[: SQL_WIDTH - 3] + "..."),
+            str(len(seconds)),
+            str(rows[sql]),
+            f"{sum(seconds) * 1000:.2f}",
+            f"{seconds[len(seconds) // 2] * 1000:.2f}",
+            f"{seconds[int(len(seconds) * 0.95)] * 1000:.2f}",
+            f"{seconds[-1] * 1000:.2f}",
+        )
+
+    return table
@@ -1,4 +1,7 @@
+import time
+from datetime import datetime
 from textwrap import dedent
+from typing import Iterable, Optional
 
 import click
 from rich.console import Console
@@ -10,78 +13,109 @@ from src.logic.project_exceptions import (
     InvalidProjectName,
     ProjectDoesNotExists,
 )
-from src.repositories import project_repository
-from src.utils import parse_user_input
+from src.repositories import learning_repository, project_repository
+from src.utils import parse_user_input, read_records, write_records
 
+PROJECT_KEYS = ("name", "context")
 
-def create():
-    create_project_template = dedent(
-        """\
-        Name:
+PROJECT_TEMPLATE = dedent(
+    """\
+    Name:
+    {name}
 
-        ---
+    ---
 
-        Context:
-        """
-    )
+    Context:
+    {context}
+    """
+)
 
-    user_input = click.edit(text=create_project_template)
 
-    if user_input is None:
-        raise EmptyUserInput()
+def validate_project_input(project_input: dict[str, str]):
+    if not project_input.get("name"):
+        raise InvalidProjectName()
 
-    keys_to_extract = ("name", "context")
+    if not project_input.get("context"):
+        raise InvalidProjectContext()
 
-    project_input = parse_user_input(user_input, keys_to_extract)
 
-    if "name" not in project_input or project_input["name"] == "":
-        raise InvalidProjectName()
+def create(
+    user_input: Optional[str | Iterable[str]] = None,
+    name: Optional[str] = None,
+    context: Optional[str] = None,
+):
+    """
+    Opens the editor unless the project comes as template text (user_input)
+    or as fields, both go through the same parsing and validation
+    """
+    if user_input is None:
+        user_input = _project_input_text(
+            name or "",
+            context or "",
+            interactive=name is None and context is None,
+        )
 
-    if "context" not in project_input or project_input["context"] == "":
-        raise InvalidProjectContext()
+    project_input = parse_user_input(user_input, PROJECT_KEYS)
 
-    name, context = project_input.values()
-    project_repository.create(name, context)
+    validate_project_input(project_input)
 
+    project_repository.create(project_input["name"], project_input["context"])
 
-def update(id: int):
+
+def update(
+    id: int,
+    user_input: Optional[str | Iterable[str]] = None,
+    name: Optional[str] = None,
+    context: Optional[str] = None,
+):
+    """
+    Opens the editor with the current values unless the changes come as
+    template text (user_input) or as fields that override the current values
+    """
     if not (project := project_repository.get(id)):
         raise ProjectDoesNotExists()
 
-    name = project["name"]
-    context = project["context"]
+    if user_input is None:
+        user_input = _project_input_text(
+            project["name"] if name is None else name,
+            project["context"] if context is None else context,
+            interactive=name is None and context is None,
+        )
 
-    update_project_template = dedent(
-        f"""\
-        Name:
-        {name}
+    project_input = parse_user_input(user_input, PROJECT_KEYS)
 
-        ---
+    validate_project_input(project_input)
 
-        Context:
-        {context}
-        """
-    )
+    project_repository.update(id, project_input["name"], project_input["context"])
 
-    if (user_input := click.edit(text=update_project_template)) is None:
-        raise EmptyUserInput()
 
-    project_input = parse_user_input(user_input, ("name", "context"))
+def _project_input_text(name: str, context: str, interactive: bool) -> str:
+    template = PROJECT_TEMPLATE.format(name=name, context=context)
 
-    if "name" not in project_input or project_input["name"] == "":
-        raise InvalidProjectName()
+    if not interactive:
+        return template
 
-    if "name" not in project_input or project_input["context"] == "":
-        raise InvalidProjectContext()
+    if (user_input := click.edit(text=template)) is None:
+        raise EmptyUserInput()
+
+    return user_input
 
-    updated_name = project_input["name"]
-    updated_context = project_input["context"]
 
-    project_repository.update(id, updated_name, updated_context)
+def read(output_format: str = "table", changed_since: Optional[datetime] = None):
+    """
+    Renders projects as a Rich table, or streams them straight from the cursor
+    as json, ndjson or csv. changed_since (UTC like the stored times) keeps the
+    projects updated since then
+    """
+    since = changed_since.isoformat(sep=" ") if changed_since else None
 
+    if output_format != "table":
+        write_records(
+            project_repository.read_chunks(changed_since=since), output_format
+        )
+        return
 
-def read():
-    projects = project_repository.read()
+    projects = project_repository.read(since)
 
     table = Table("Id", "Project", "Context", "Date created")
     console = Console()
@@ -97,3 +131,96 @@ def read():
         table.add_row(str(id), name, context, created_at)
 
     console.print(table)
+
+
+def show(id: int):
+    """
+    Shows a project with its learnings and how many there are of each type
+    """
+    if not (project := project_repository.get(id)):
+        raise ProjectDoesNotExists()
+
+    console = Console()
+    counts = learning_repository.count_by_type(id)
+
+    console.print(project["name"], style="bold")
+    console.print(project["context"])
+    console.print(
+        f"Learnings: {sum(counts.values())} "
+        f"(soft: {counts.get('soft', 0)}, hard: {counts.get('hard', 0)})"
+    )
+
+    if not counts:
+        return
+
+    table = Table("Id", "Challenge", "Solution", "Learing Type", "Date created")
+
+    for chunk in learning_repository.read_chunks(project_id=id):
+        for learning in chunk:
+            table.add_row(
+                str(learning["id"]),
+                learning["challenge"],
+                learning["solution"],
+                learning["learning_type"],
+                learning["created_at"],
+            )
+
+    console.print(table)
+
+
+def import_file(path: str, batch_size: int = 1000):
+    """
+    Imports projects from a JSONL or CSV file with name and context fields,
+    records are validated like in create
+    """
+    console = Console()
+    errors: list[tuple[int, str]] = []
+    batch: list[tuple[str, str]] = []
+    batch_lines: list[int] = []
+    imported = 0
+
+    def flush():
+        nonlocal batch, batch_lines, imported
+
+        failures = project_repository.create_many(batch)
+        imported += len(batch) - len(failures)
+        errors.extend((batch_lines[position], str(e)) for position, e in failures)
+
+        batch, batch_lines = [], []
+
+    start = time.perf_counter()
+
+    for line_number, record in read_records(path):
+        if record is None:
+            errors.append((line_number, "Invalid record"))
+            continue
+
+        project_input = {
+            key: "" if record.get(key) is None else str(record[key]).strip()
+            for key in ("name", "context")
+        }
+
+        try:
+            validate_project_input(project_input)
+        except (InvalidProjectName, InvalidProjectContext) as e:
+            errors.append((line_number, type(e).__name__))
+            continue
+
+        batch.append((project_input["name"], project_input["context"]))
+        batch_lines.append(line_number)
+
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    elapsed = time.perf_counter() - start
+
+    console.print(
+        f"Imported {imported} projects in {elapsed:.2f}s "
+        f"({imported / elapsed if elapsed else 0:.0f} rows/sec)"
+    )
+
+    for line_number, error in sorted(errors):
+        console.print(f"Line {line_number}: {error}")
@@ -0,0 +1,91 @@
+import shlex
+from typing import Callable, Optional
+
+import click
+from rich.console import Console
+
+from src.db.connection import get_connection
+
+PROMPT = "wl> "
+EXIT_COMMANDS = ("exit", "quit")
+
+
+def run(command: click.Command, read_line: Callable[[str], str] = input):
+    """
+    Reads wl commands line by line and runs them in this process, the
+    connection, the imported modules and the repository caches stay warm
+    between commands. Ends on exit, quit or end of input
+    """
+    console = Console()
+
+    warm_up()
+
+    try:
+        # Line editing and history for input()
+        import readline  # noqa: F401
+    except ImportError:
+        pass
+
+    console.print("wl shell, type --help for the commands and exit to leave")
+
+    while (line := _read(read_line)) is not None:
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            continue
+
+        if not args:
+            continue
+
+        if args[0] in EXIT_COMMANDS:
+            break
+
+        if args[0] == "shell":
+            console.print("Already in the shell")
+            continue
+
+        run_command(command, args, console)
+
+
+def run_command(command: click.Command, args: list[str], console: Console) -> int:
+    """
+    Runs one command line through the same click command `wl` uses and returns
+    its exit code, errors are printed instead of ending the process
+    """
+    try:
+        command.main(args, prog_name="wl", standalone_mode=False)
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        console.print("Aborted")
+        return 1
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {type(e).__name__} {e}".rstrip())
+        return 1
+
+    return 0
+
+
+def warm_up():
+    # Everything a command would load on first use is loaded up front: the
+    # logic modules (with Rich and the repositories) and the connection, which
+    # is migrated once
+    from src.logic import db_logic, learning_logic, project_logic  # noqa: F401
+
+    get_connection()
+
+
+def _read(read_line: Callable[[str], str]) -> Optional[str]:
+    while True:
+        try:
+            return read_line(PROMPT)
+        except EOFError:
+            print()
+            return None
+        except KeyboardInterrupt:
+            # Ctrl-C drops the line being typed, like a regular shell
+            print()
@@ -0,0 +1,2 @@
+class InvalidPeriod(Exception):
+    pass
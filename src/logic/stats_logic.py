@@ -0,0 +1,46 @@
+from rich.console import Console
+from rich.table import Table
+
+from src.logic.stats_exceptions import InvalidPeriod
+from src.repositories import learning_repository
+
+
+def show(period: str = "month", use_summary: bool = True):
+    """
+    Prints the learnings per project and per week or month with their soft and
+    hard split, every number is counted in SQL
+    """
+    if period not in learning_repository.PERIODS:
+        raise InvalidPeriod()
+
+    console = Console()
+    by_project = learning_repository.count_by_project(use_summary)
+    by_period = learning_repository.count_by_period(period, use_summary)
+
+    soft = sum(row["soft"] for row in by_project)
+    hard = sum(row["hard"] for row in by_project)
+
+    console.print(f"Learnings: {soft + hard} (soft: {soft}, hard: {hard})")
+
+    if not by_project:
+        return
+
+    projects_table = Table("Project", "Soft", "Hard", "Total")
+
+    for row in by_project:
+        projects_table.add_row(
+            "No project" if row["project_id"] is None else row["project_name"],
+            str(row["soft"]),
+            str(row["hard"]),
+            str(row["total"]),
+        )
+
+    periods_table = Table(period.capitalize(), "Soft", "Hard", "Total")
+
+    for row in by_period:
+        periods_table.add_row(
+            row["period"], str(row["soft"]), str(row["hard"]), str(row["total"])
+        )
+
+    console.print(projects_table)
+    console.print(periods_table)
@@ -0,0 +1,2 @@
+class InvalidChangeset(Exception):
+    pass
@@ -0,0 +1,155 @@
+import gzip
+import json
+import os
+import time
+from typing import Any
+
+from rich.console import Console
+
+from src.db.connection import snapshot
+from src.logic.db_logic import EXPORT_COMPRESSION_LEVEL
+from src.logic.sync_exceptions import InvalidChangeset
+from src.repositories import sync_repository
+
+CHANGESET_FORMAT = "wl-sync"
+CHANGESET_VERSION = 1
+# Keys of a change line besides sync_id, deleted and changed_at
+CHANGE_KEYS = {
+    "project": sync_repository.PROJECT_COLUMNS,
+    "learning": sync_repository.LEARNING_COLUMNS + ("project", "tags"),
+}
+
+
+def export(path: str, since: int = 0, chunk_size: int = 500):
+    """
+    Streams the projects and learnings changed after the since cursor into a
+    gzip compressed NDJSON changeset, a header line with the cursor to pass as
+    --since next time and then one {"type": ..., column: value} line per row
+    """
+    console = Console()
+    start = time.perf_counter()
+    exported = {"project": 0, "learning": 0}
+
+    with snapshot(), gzip.open(
+        path, "wt", compresslevel=EXPORT_COMPRESSION_LEVEL, encoding="utf-8"
+    ) as file:
+        cursor = sync_repository.cursor()
+        header = {
+            "format": CHANGESET_FORMAT,
+            "version": CHANGESET_VERSION,
+            "since": since,
+            "cursor": cursor,
+        }
+        file.write(json.dumps(header) + "\n")
+
+        # Projects first, the learnings reference them by sync_id
+        for row_type, chunks in (
+            ("project", sync_repository.project_changes(since, chunk_size)),
+            ("learning", sync_repository.learning_changes(since, chunk_size)),
+        ):
+            for chunk in chunks:
+                file.write("".join(_change_line(row_type, row) for row in chunk))
+                exported[row_type] += len(chunk)
+
+    elapsed = time.perf_counter() - start
+
+    console.print(
+        f"Exported {exported['project']} project and {exported['learning']} "
+        f"learning changes to {path} ({os.path.getsize(path) / 1000:.1f} kB) in "
+        f"{elapsed * 1000:.0f} ms"
+    )
+    console.print(f"Next export: --since {cursor}")
+
+
+def apply(path: str, batch_size: int = 500):
+    """
+    Applies a changeset written by sync export on another worklog, one
+    transaction per batch. The newer change of a row wins, so changesets can
+    be applied again or in any order
+    """
+    console = Console()
+    start = time.perf_counter()
+    batch: list[dict] = []
+    conflicts: list[tuple[dict, Exception]] = []
+    applied = read = 0
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            header = json.loads(file.readline())
+        except (json.JSONDecodeError, OSError, EOFError):
+            raise InvalidChangeset()
+
+        if not isinstance(header, dict) or header.get("format") != CHANGESET_FORMAT:
+            raise InvalidChangeset()
+
+        for line in file:
+            try:
+                change = json.loads(line)
+            except json.JSONDecodeError:
+                raise InvalidChangeset()
+
+            _validate(change)
+            batch.append(change)
+            read += 1
+
+            if len(batch) >= batch_size:
+                applied += _apply(console, batch, conflicts)
+                batch = []
+
+    if batch:
+        applied += _apply(console, batch, conflicts)
+
+    elapsed = time.perf_counter() - start
+
+    console.print(f"Applied {applied} of {read} changes in {elapsed * 1000:.0f} ms")
+
+    if skipped := read - applied - len(conflicts):
+        console.print(f"Skipped {skipped} changes not newer than the local rows")
+
+    if conflicts:
+        console.print(
+            f"{len(conflicts)} changes conflict with local rows and weren't applied"
+        )
+
+
+def _apply(console: Console, batch: list[dict], conflicts: list) -> int:
+    applied, rejected = sync_repository.apply(batch)
+
+    for change, error in rejected:
+        console.print(f"Conflict on {change['type']} {change['sync_id']}: {error}")
+
+    conflicts.extend(rejected)
+
+    return applied
+
+
+def _validate(change: Any):
+    # Every key the change's row type needs, a deleted row only comes with its
+    # sync_id and change time
+    if not isinstance(change, dict) or change.get("type") not in CHANGE_KEYS:
+        raise InvalidChangeset()
+
+    keys = ("sync_id", "deleted", "changed_at")
+
+    if not change.get("deleted"):
+        keys += CHANGE_KEYS[change["type"]]
+
+    if any(key not in change for key in keys):
+        raise InvalidChangeset()
+
+    if change["type"] == "learning" and not isinstance(change.get("tags", []), list):
+        raise InvalidChangeset()
+
+
+def _change_line(row_type: str, row) -> str:
+    change = {"type": row_type, **dict(row), "deleted": bool(row["deleted"])}
+
+    if row_type == "learning":
+        change["tags"] = json.loads(row["tags"]) if row["tags"] else []
+
+    if change["deleted"]:
+        change = {
+            key: change[key] for key in ("type", "sync_id", "deleted", "changed_at")
+        }
+
+    return json.dumps(change) + "\n"
@@ -1,10 +1,50 @@
+from typing import Optional
+
 import typer
 
-from src.handlers import learning_handler, project_handler
+from src.handlers import (
+    daemon_handler,
+    db_handler,
+    learning_handler,
+    project_handler,
+    shell_handler,
+    stats_handler,
+    sync_handler,
+)
+
+# Handlers import their logic modules (and with them Rich, click and sqlite3)
+# inside each command, importing this module must stay cheap since it runs on
+# every invocation. tests/test_startup.py guards it
 
 app = typer.Typer()
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, help="Print the time spent per query when the command ends"
+    ),
+    profile_output: Optional[str] = typer.Option(
+        None, help="Also write a cProfile of the command to this pstats file"
+    ),
+):
+    """
+    Logs what you learn while working on your projects
+    """
+    if profile or profile_output:
+        from src.logic import profile_logic
+
+        ctx.call_on_close(profile_logic.start(profile_output))
+
+
 app.add_typer(project_handler.app, name="projects")
 app.add_typer(learning_handler.app, name="learnings")
+app.add_typer(db_handler.app, name="db")
+app.add_typer(sync_handler.app, name="sync")
+app.command()(shell_handler.shell)
+app.command()(daemon_handler.daemon)
+app.command()(stats_handler.stats)
 
 if __name__ == "__main__":
     app()
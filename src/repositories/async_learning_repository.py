@@ -0,0 +1,111 @@
+from typing import Any, AsyncIterator, Optional
+
+from src.db.executor import get_executor
+from src.repositories import learning_repository
+
+
+async def create(
+    project_id: Optional[int],
+    challenge: str,
+    solution: str,
+    learning_type: str,
+    tags: Optional[list[str]] = None,
+) -> int:
+    return await get_executor().run(
+        learning_repository.create,
+        project_id,
+        challenge,
+        solution,
+        learning_type,
+        tags,
+    )
+
+
+async def get(id: int) -> Any | None:
+    return await get_executor().run(learning_repository.get, id)
+
+
+async def update(
+    id: int,
+    project_id: Optional[int],
+    challenge: str,
+    solution: str,
+    learning_type: str,
+    tags: Optional[list[str]] = None,
+):
+    await get_executor().run(
+        learning_repository.update,
+        id,
+        project_id,
+        challenge,
+        solution,
+        learning_type,
+        tags,
+    )
+
+
+async def read(
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    learning_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    any_tag: bool = False,
+    changed_since: Optional[str] = None,
+) -> list:
+    return await get_executor().run(
+        learning_repository.read,
+        limit,
+        after_id,
+        project_id,
+        learning_type,
+        since,
+        until,
+        tags,
+        any_tag,
+        changed_since,
+    )
+
+
+async def read_stream(
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    learning_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    chunk_size: int = 500,
+    tags: Optional[list[str]] = None,
+    any_tag: bool = False,
+    changed_since: Optional[str] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yields learnings one by one while fetching them chunk_size at a time, the
+    cursor lives on the executor thread and only one chunk is held in memory
+    """
+    executor = get_executor()
+    chunks = learning_repository.read_chunks(
+        limit,
+        after_id,
+        project_id,
+        learning_type,
+        since,
+        until,
+        chunk_size,
+        tags,
+        any_tag,
+        changed_since,
+    )
+
+    try:
+        while (chunk := await executor.run(next, chunks, None)) is not None:
+            for learning in chunk:
+                yield learning
+    finally:
+        await executor.run(chunks.close)
+
+
+async def search(query: str, limit: int = 20) -> list:
+    return await get_executor().run(learning_repository.search, query, limit)
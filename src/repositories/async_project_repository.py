@@ -0,0 +1,38 @@
+from typing import Any, AsyncIterator, Optional
+
+from src.db.executor import get_executor
+from src.repositories import project_repository
+
+
+async def create(name: Optional[str], context: Optional[str]):
+    await get_executor().run(project_repository.create, name, context)
+
+
+async def get(id: int):
+    return await get_executor().run(project_repository.get, id)
+
+
+async def update(id: int, name: str, context: str):
+    await get_executor().run(project_repository.update, id, name, context)
+
+
+async def read(changed_since: Optional[str] = None) -> list:
+    return await get_executor().run(project_repository.read, changed_since)
+
+
+async def read_stream(
+    chunk_size: int = 500, changed_since: Optional[str] = None
+) -> AsyncIterator[Any]:
+    """
+    Yields projects one by one while fetching them chunk_size at a time on the
+    executor thread
+    """
+    executor = get_executor()
+    chunks = project_repository.read_chunks(chunk_size, changed_since)
+
+    try:
+        while (chunk := await executor.run(next, chunks, None)) is not None:
+            for project in chunk:
+                yield project
+    finally:
+        await executor.run(chunks.close)
@@ -0,0 +1,161 @@
+import atexit
+import threading
+import time
+from typing import Optional
+
+from src.db.connection import get_connection
+from src.repositories import learning_repository, project_repository
+
+
+class BufferedWriter:
+    """
+    Opt-in write buffer for high-volume logging.
+
+    Learnings and projects are queued in memory and written with create_many,
+    one transaction per flush instead of one per row. A flush happens when
+    max_rows rows are queued, when the oldest queued row is max_delay seconds
+    old, on close and at interpreter exit, rows can't be added once closed.
+    Once flush returns the rows are committed with synchronous=FULL, so they
+    survive a power loss.
+
+    Rows rejected by the database are kept in failures as (row, error)
+    """
+
+    def __init__(self, max_rows: int = 1000, max_delay: float = 1.0):
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.failures: list[tuple[tuple, Exception]] = []
+
+        self._learnings: list[tuple[Optional[int], str, str, str]] = []
+        self._projects: list[tuple[str, str]] = []
+        self._oldest: Optional[float] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+
+        # One long-lived thread handles the time threshold so the pool opens a
+        # single extra connection for it
+        self._flusher = threading.Thread(
+            target=self._flush_when_due, name="wl-buffered-writer", daemon=True
+        )
+        self._flusher.start()
+
+        atexit.register(self.close)
+
+    def add_learning(
+        self,
+        project_id: Optional[int],
+        challenge: str,
+        solution: str,
+        learning_type: str,
+    ):
+        with self._lock:
+            self._check_open()
+            self._learnings.append((project_id, challenge, solution, learning_type))
+            full = self._row_added()
+
+        self._after_add(full)
+
+    def add_project(self, name: str, context: str):
+        with self._lock:
+            self._check_open()
+            self._projects.append((name, context))
+            full = self._row_added()
+
+        self._after_add(full)
+
+    def flush(self):
+        # Flushes are serialized so rows are written in the order they came in
+        with self._flush_lock:
+            with self._lock:
+                learnings, self._learnings = self._learnings, []
+                projects, self._projects = self._projects, []
+                self._oldest = None
+
+            if not learnings and not projects:
+                return
+
+            connection = get_connection()
+            (synchronous,) = connection.execute("PRAGMA synchronous").fetchone()
+            connection.execute("PRAGMA synchronous = FULL")
+
+            try:
+                # Projects first, queued learnings may reference them
+                if projects:
+                    failures = project_repository.create_many(projects)
+                    self.failures.extend((projects[i], e) for i, e in failures)
+                    projects = []
+
+                if learnings:
+                    failures = learning_repository.create_many(learnings)
+                    self.failures.extend((learnings[i], e) for i, e in failures)
+            except Exception:
+                # The rows that weren't committed go back to the front of the
+                # queue so a later flush writes them
+                with self._lock:
+                    self._learnings[:0] = learnings
+                    self._projects[:0] = projects
+                    self._oldest = self._oldest or time.monotonic()
+
+                raise
+            finally:
+                connection.execute(f"PRAGMA synchronous = {synchronous}")
+
+    def close(self):
+        # Taken under the lock so no row can be queued after the last flush
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+
+        self._wake.set()
+        self._flusher.join()
+        self.flush()
+
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "BufferedWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("BufferedWriter is closed, rows can't be added")
+
+    def _row_added(self) -> bool:
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+
+        return len(self._learnings) + len(self._projects) >= self.max_rows
+
+    def _after_add(self, full: bool):
+        if full:
+            self.flush()
+        else:
+            self._wake.set()
+
+    def _flush_when_due(self):
+        while not self._closed:
+            with self._lock:
+                oldest = self._oldest
+
+            if oldest is None:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            if (remaining := oldest + self.max_delay - time.monotonic()) > 0:
+                self._wake.wait(remaining)
+                self._wake.clear()
+                continue
+
+            try:
+                self.flush()
+            except Exception:
+                # The rows are queued again, wait a full delay before retrying
+                self._wake.wait(self.max_delay)
+                self._wake.clear()
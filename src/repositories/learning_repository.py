@@ -1,16 +1,81 @@
+import json
+import math
+import re
 import sqlite3
-from typing import Any, Optional
+from collections import Counter
+from typing import Any, Iterator, Optional
 
-from src.db.constants import DATABASE_NAME
+from src.db.cache import RowCache
+from src.db.connection import get_connection, retry_when_busy
 
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
 
+# The project is joined in the same query instead of looking it up per row,
+# the tags come comma separated in name order from the LearningTag primary key
+LEARNING_WITH_PROJECT_COLUMNS = """
+    Learning.*,
+    Project.name AS project_name,
+    Project.context AS project_context,
+    (
+        SELECT group_concat(name, ', ') FROM (
+            SELECT Tag.name
+            FROM LearningTag
+            JOIN Tag ON Tag.id = LearningTag.tag_id
+            WHERE LearningTag.learning_id = Learning.id
+            ORDER BY Tag.name
+        )
+    ) AS tags
+"""
+
+# Stored columns written by db export and restored by db import
+EXPORT_COLUMNS = (
+    "id",
+    "project_id",
+    "challenge",
+    "solution",
+    "learning_type",
+    "created_at",
+    "updated_at",
+)
+
+cache = RowCache()
+
+# Similar learnings are ranked by the cosine of their term vectors. Stored
+# vectors use log tf weights only and queries add the idf (SMART lnc.ltc), so
+# a learning's vector never changes when other learnings are written
+TERM_PATTERN = re.compile(r"\w{2,}")
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be but by for from has have in is it its of on or that
+    the this to was were will with
+    """.split()
+)
+# Only the query's heaviest terms are looked up, the rest barely move the
+# ranking but each one adds its whole posting list to the scan
+SIMILAR_QUERY_TERMS = 12
+TERM_INDEX_BATCH_SIZE = 1000
+
+# Period label of a day, weeks are named after their Monday
+PERIODS = {
+    "week": "date(day, 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m', day)",
+}
+
+
+@retry_when_busy
 def create(
-    project_id: Optional[int], challenge: str, solution: str, learning_type: str
-):
+    project_id: Optional[int],
+    challenge: str,
+    solution: str,
+    learning_type: str,
+    tags: Optional[list[str]] = None,
+) -> int:
+    """
+    Inserts a learning and its tags in one transaction and returns its id
+    """
     try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            connection.row_factory = sqlite3.Row
-
+        with get_connection() as connection:
             cursor = connection.cursor()
 
             create_learning_query = """
@@ -22,45 +87,86 @@ def create(
                 create_learning_query, (challenge, solution, learning_type, project_id)
             )
 
+            if tags:
+                _set_tags(connection, cursor.lastrowid, tags)
+
             connection.commit()
 
             print("Record inserted successfully")
+
+            return cursor.lastrowid
     except Exception as e:
         print(f"Unknown error: {e}")
         raise
 
 
-def get(id: int) -> Any | None:
-    try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            connection.row_factory = sqlite3.Row
+@retry_when_busy
+def create_many(
+    learnings: list[tuple[Optional[int], str, str, str]],
+) -> list[tuple[int, Exception]]:
+    """
+    Inserts (project_id, challenge, solution, learning_type) rows in a single
+    transaction.
 
-            cursor = connection.cursor()
+    When the batch is rejected the rows are retried one by one in the same
+    transaction, the (position, error) of each failed row is returned instead
+    of aborting the batch
+    """
+    create_learning_query = """
+        INSERT INTO Learning (project_id, challenge, solution, learning_type)
+        VALUES (?, ?, ?, ?)
+    """
 
-            get_learning_query = """
-                SELECT * FROM Learning
-                WHERE id = ?
-            """
+    with get_connection() as connection:
+        try:
+            connection.executemany(create_learning_query, learnings)
+            return []
+        except sqlite3.IntegrityError:
+            connection.rollback()
+
+        failures: list[tuple[int, Exception]] = []
 
-            cursor.execute(get_learning_query, (id,))
+        for position, learning in enumerate(learnings):
+            try:
+                connection.execute(create_learning_query, learning)
+            except sqlite3.IntegrityError as e:
+                failures.append((position, e))
 
-            return cursor.fetchone()
+        return failures
+
+
+def get(id: int) -> Any | None:
+    try:
+        with get_connection() as connection:
+            return cache.get(connection, id, lambda: _get(connection, id))
 
     except Exception as e:
         print(f"Unknown error: {e}")
 
 
+def _get(connection: sqlite3.Connection, id: int) -> Any | None:
+    get_learning_query = """
+        SELECT * FROM Learning
+        WHERE id = ?
+    """
+
+    return connection.execute(get_learning_query, (id,)).fetchone()
+
+
+@retry_when_busy
 def update(
     id: int,
     project_id: Optional[int],
     challenge: str,
     solution: str,
     learning_type: str,
+    tags: Optional[list[str]] = None,
 ) -> Any | None:
+    """
+    Updates a learning, tags replace its current tags unless they're None
+    """
     try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            connection.row_factory = sqlite3.Row
-
+        with get_connection() as connection:
             cursor = connection.cursor()
 
             update_learning_query = """
@@ -74,7 +180,11 @@ def update(
                 (project_id, challenge, solution, learning_type, id),
             )
 
+            if tags is not None:
+                _set_tags(connection, id, tags)
+
             connection.commit()
+            cache.invalidate(id)
 
             print("Record updated successfully")
     except Exception as e:
@@ -82,16 +192,63 @@ def update(
         raise
 
 
-def read() -> list:
-    try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            connection.row_factory = sqlite3.Row
+def get_tags(id: int) -> list[str]:
+    with get_connection() as connection:
+        get_tags_query = """
+            SELECT Tag.name
+            FROM LearningTag
+            JOIN Tag ON Tag.id = LearningTag.tag_id
+            WHERE LearningTag.learning_id = ?
+            ORDER BY Tag.name
+        """
+
+        return [name for (name,) in connection.execute(get_tags_query, (id,))]
 
-            cursor = connection.cursor()
 
-            read_learnings_query = """SELECT * FROM Learning"""
+def _set_tags(connection: sqlite3.Connection, id: int, tags: list[str]):
+    # Runs inside the caller's transaction, new tag names are created on the fly
+    connection.executemany(
+        "INSERT INTO Tag (name) VALUES (?) ON CONFLICT DO NOTHING",
+        [(tag,) for tag in tags],
+    )
+    connection.execute("DELETE FROM LearningTag WHERE learning_id = ?", (id,))
+    connection.execute(
+        f"""
+        INSERT INTO LearningTag (learning_id, tag_id)
+        SELECT ?, id FROM Tag WHERE name IN ({', '.join('?' for _ in tags)})
+        """,
+        (id, *tags),
+    )
 
-            cursor.execute(read_learnings_query)
+
+def read(
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    learning_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    any_tag: bool = False,
+    changed_since: Optional[str] = None,
+) -> list:
+    try:
+        with get_connection() as connection:
+            cursor = connection.cursor()
+
+            cursor.execute(
+                *_read_query(
+                    limit,
+                    after_id,
+                    project_id,
+                    learning_type,
+                    since,
+                    until,
+                    tags,
+                    any_tag,
+                    changed_since,
+                )
+            )
 
             print("Read records successfully")
 
@@ -99,3 +256,506 @@ def read() -> list:
     except Exception as e:
         print(f"Error: {e}")
         raise e
+
+
+def read_chunks(
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    learning_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    chunk_size: int = 500,
+    tags: Optional[list[str]] = None,
+    any_tag: bool = False,
+    changed_since: Optional[str] = None,
+) -> Iterator[list]:
+    """
+    Streams learnings in id order, chunk_size rows at a time, so the whole
+    result set is never held in memory
+    """
+    cursor = get_connection().cursor()
+
+    try:
+        cursor.execute(
+            *_read_query(
+                limit,
+                after_id,
+                project_id,
+                learning_type,
+                since,
+                until,
+                tags,
+                any_tag,
+                changed_since,
+            )
+        )
+
+        while chunk := cursor.fetchmany(chunk_size):
+            yield chunk
+    finally:
+        cursor.close()
+
+
+def export_chunks(chunk_size: int = 500) -> Iterator[list]:
+    """
+    Streams the stored learning rows (EXPORT_COLUMNS) in id order, chunk_size
+    rows at a time
+    """
+    cursor = get_connection().cursor()
+
+    try:
+        cursor.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM Learning ORDER BY id")
+
+        while chunk := cursor.fetchmany(chunk_size):
+            yield chunk
+    finally:
+        cursor.close()
+
+
+@retry_when_busy
+def restore_many(learnings: list[tuple]) -> tuple[int, dict[int, int]]:
+    """
+    Inserts learning rows (EXPORT_COLUMNS) with their timestamps in a single
+    transaction, their project_id must already be the local one. A learning
+    with the same creation time and challenge as an existing one is the same
+    learning and isn't inserted again, one whose id is taken by another
+    learning gets a new id. Returns how many rows were inserted and the
+    archived ids that map to a different local id
+    """
+    inserted = 0
+    ids: dict[int, int] = {}
+
+    with get_connection() as connection:
+        for learning in learnings:
+            # Most rows keep their archived id, only the ones whose id is taken
+            # are looked up by creation time and challenge
+            if _restore(connection, EXPORT_COLUMNS, learning):
+                inserted += 1
+                continue
+
+            row = dict(zip(EXPORT_COLUMNS, learning))
+
+            if (local_id := _same_learning(connection, row)) is None:
+                local_id = _restore(connection, EXPORT_COLUMNS[1:], learning[1:])
+                inserted += 1
+
+            if local_id != row["id"]:
+                ids[row["id"]] = local_id
+
+    return inserted, ids
+
+
+def _restore(
+    connection: sqlite3.Connection, columns: tuple[str, ...], values: tuple
+) -> Optional[int]:
+    # The id of the inserted row, None when the id in values is taken
+    cursor = connection.execute(
+        f"""
+        INSERT INTO Learning ({', '.join(columns)})
+        VALUES ({', '.join('?' for _ in columns)})
+        ON CONFLICT (id) DO NOTHING
+        """,
+        values,
+    )
+
+    return cursor.lastrowid if cursor.rowcount else None
+
+
+def _same_learning(connection: sqlite3.Connection, row: dict) -> Optional[int]:
+    # The learning restored from row by an earlier import, under its archived
+    # id or under the one it got when that was taken
+    key = (row["created_at"], row["challenge"])
+    local = (
+        connection.execute(
+            "SELECT id FROM Learning WHERE id = ? AND created_at = ? AND challenge = ?",
+            (row["id"], *key),
+        ).fetchone()
+        or connection.execute(
+            "SELECT id FROM Learning WHERE created_at = ? AND challenge = ?", key
+        ).fetchone()
+    )
+
+    return local[0] if local is not None else None
+
+
+def count_by_type(project_id: int) -> dict[str, int]:
+    try:
+        with get_connection() as connection:
+            cursor = connection.cursor()
+
+            count_learnings_query = """
+                SELECT learning_type, learnings AS total
+                FROM LearningProjectSummary
+                WHERE project_id = ?
+            """
+
+            cursor.execute(count_learnings_query, (project_id,))
+
+            return {row["learning_type"]: row["total"] for row in cursor.fetchall()}
+    except Exception as e:
+        print(f"Error: {e}")
+        raise
+
+
+def count_by_project(use_summary: bool = True) -> list:
+    """
+    Soft, hard and total learnings per project, the most active first.
+    Learnings without a project are counted in a row with project_id None
+    """
+    try:
+        with get_connection() as connection:
+            cursor = connection.cursor()
+
+            count_by_project_query = f"""
+                SELECT
+                    counts.project_id,
+                    Project.name AS project_name,
+                    counts.soft,
+                    counts.hard,
+                    counts.total
+                FROM (
+                    SELECT
+                        project_id,
+                        sum(iif(learning_type = 'soft', learnings, 0)) AS soft,
+                        sum(iif(learning_type = 'hard', learnings, 0)) AS hard,
+                        sum(learnings) AS total
+                    FROM ({_project_counts(use_summary)})
+                    GROUP BY project_id
+                ) AS counts
+                LEFT JOIN Project ON Project.id = counts.project_id
+                ORDER BY counts.total DESC, counts.project_id
+            """
+
+            cursor.execute(count_by_project_query)
+
+            return cursor.fetchall()
+    except Exception as e:
+        print(f"Error: {e}")
+        raise
+
+
+def count_by_period(period: str = "month", use_summary: bool = True) -> list:
+    """
+    Soft, hard and total learnings per week or month (see PERIODS), oldest
+    first, periods without learnings are left out
+    """
+    try:
+        with get_connection() as connection:
+            cursor = connection.cursor()
+
+            count_by_period_query = f"""
+                SELECT
+                    {PERIODS[period]} AS period,
+                    sum(iif(learning_type = 'soft', learnings, 0)) AS soft,
+                    sum(iif(learning_type = 'hard', learnings, 0)) AS hard,
+                    sum(learnings) AS total
+                FROM ({_day_counts(use_summary)})
+                GROUP BY period
+                ORDER BY period
+            """
+
+            cursor.execute(count_by_period_query)
+
+            return cursor.fetchall()
+    except Exception as e:
+        print(f"Error: {e}")
+        raise
+
+
+# The summary tables are kept up to date by triggers and have one row per
+# project or day and type instead of one row per learning, each pair of
+# sources below has the same columns
+
+
+def _project_counts(use_summary: bool) -> str:
+    if use_summary:
+        return """
+            SELECT nullif(project_id, 0) AS project_id, learning_type, learnings
+            FROM LearningProjectSummary
+        """
+
+    return "SELECT project_id, learning_type, 1 AS learnings FROM Learning"
+
+
+def _day_counts(use_summary: bool) -> str:
+    if use_summary:
+        return "SELECT day, learning_type, learnings FROM LearningDaySummary"
+
+    return """
+        SELECT date(created_at) AS day, learning_type, 1 AS learnings
+        FROM Learning
+    """
+
+
+def search(query: str, limit: int = 20) -> list:
+    """
+    Ranks learnings matching every word of the query by bm25, each row carries
+    a snippet of the best matching column with SNIPPET_START/SNIPPET_END
+    around the matched terms
+    """
+    try:
+        with get_connection() as connection:
+            cursor = connection.cursor()
+
+            search_learnings_query = f"""
+                SELECT
+                    {LEARNING_WITH_PROJECT_COLUMNS},
+                    snippet(LearningSearch, -1, ?, ?, '...', 16) AS snippet
+                FROM LearningSearch
+                JOIN Learning ON Learning.id = LearningSearch.rowid
+                LEFT JOIN Project ON Project.id = Learning.project_id
+                WHERE LearningSearch MATCH ?
+                ORDER BY bm25(LearningSearch)
+                LIMIT ?
+            """
+
+            cursor.execute(
+                search_learnings_query,
+                (SNIPPET_START, SNIPPET_END, _match_expression(query), limit),
+            )
+
+            return cursor.fetchall()
+    except Exception as e:
+        print(f"Error: {e}")
+        raise
+
+
+def _match_expression(query: str) -> str:
+    # Every word is quoted so user input like "foo-bar" or "a:b" is searched as
+    # text instead of being parsed as FTS5 query syntax
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+def similar(id: int, limit: int = 5) -> list:
+    """
+    Learnings whose challenge and solution are closest to the learning's by
+    TF-IDF cosine similarity, most similar first, each row with its score
+    """
+    index_pending_terms()
+
+    connection = get_connection()
+
+    if not (query_weights := _query_weights(connection, id)):
+        return []
+
+    similar_learnings_query = f"""
+        WITH Score AS (
+            SELECT
+                LearningTerm.learning_id,
+                sum(query.value * LearningTerm.weight) AS score
+            FROM json_each(?) AS query
+            JOIN LearningTerm ON LearningTerm.term = query.key
+            WHERE LearningTerm.learning_id != ?
+            GROUP BY LearningTerm.learning_id
+            ORDER BY score DESC
+            LIMIT ?
+        )
+        SELECT {LEARNING_WITH_PROJECT_COLUMNS}, Score.score
+        FROM Score
+        JOIN Learning ON Learning.id = Score.learning_id
+        LEFT JOIN Project ON Project.id = Learning.project_id
+        ORDER BY Score.score DESC, Learning.id
+    """
+
+    return connection.execute(
+        similar_learnings_query, (json.dumps(query_weights), id, limit)
+    ).fetchall()
+
+
+@retry_when_busy
+def index_pending_terms() -> int:
+    """
+    Stores the term vectors of the learnings created or edited since the last
+    call, in batches of one transaction each. Returns how many were indexed
+    """
+    connection = get_connection()
+    indexed = 0
+
+    while True:
+        with connection:
+            # Claiming the batch is the transaction's first write, the texts
+            # read after it can't be changed by another writer meanwhile
+            ids = [
+                learning_id
+                for (learning_id,) in connection.execute(
+                    """
+                    DELETE FROM LearningTermPending WHERE learning_id IN (
+                        SELECT learning_id FROM LearningTermPending LIMIT ?
+                    )
+                    RETURNING learning_id
+                    """,
+                    (TERM_INDEX_BATCH_SIZE,),
+                ).fetchall()
+            ]
+
+            if not ids:
+                return indexed
+
+            _index_terms(connection, ids)
+
+        indexed += len(ids)
+
+
+def _index_terms(connection: sqlite3.Connection, ids: list[int]):
+    placeholders = ", ".join("?" for _ in ids)
+    documents: Counter[str] = Counter()
+
+    for term, learnings in connection.execute(
+        f"""
+        SELECT term, count(*) FROM LearningTerm
+        WHERE learning_id IN ({placeholders})
+        GROUP BY term
+        """,
+        ids,
+    ):
+        documents[term] -= learnings
+
+    connection.execute(
+        f"DELETE FROM LearningTerm WHERE learning_id IN ({placeholders})", ids
+    )
+
+    terms = []
+
+    for id, challenge, solution in connection.execute(
+        f"SELECT id, challenge, solution FROM Learning WHERE id IN ({placeholders})",
+        ids,
+    ):
+        for term, weight in _term_weights(f"{challenge}\n{solution}").items():
+            terms.append((term, id, weight))
+            documents[term] += 1
+
+    connection.executemany(
+        "INSERT INTO LearningTerm (term, learning_id, weight) VALUES (?, ?, ?)",
+        sorted(terms),
+    )
+    connection.executemany(
+        """
+        INSERT INTO TermDocuments (term, documents) VALUES (?, ?)
+        ON CONFLICT (term) DO UPDATE SET documents = documents + excluded.documents
+        """,
+        [(term, count) for term, count in documents.items() if count],
+    )
+
+
+def _term_weights(text: str) -> dict[str, float]:
+    # 1 + log tf, normalized to a unit length vector
+    counts = Counter(
+        term for term in TERM_PATTERN.findall(text.lower()) if term not in STOP_WORDS
+    )
+    weights = {term: 1 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+
+    return {term: weight / norm for term, weight in weights.items()}
+
+
+def _query_weights(connection: sqlite3.Connection, id: int) -> dict[str, float]:
+    # The learning's own vector times the idf, its heaviest terms normalized
+    # to a unit length vector
+    (learnings,) = connection.execute(
+        "SELECT coalesce(sum(learnings), 0) FROM LearningProjectSummary"
+    ).fetchone()
+
+    weights = {
+        term: weight * math.log(learnings / documents)
+        for term, weight, documents in connection.execute(
+            """
+            SELECT LearningTerm.term, LearningTerm.weight, TermDocuments.documents
+            FROM LearningTerm
+            JOIN TermDocuments ON TermDocuments.term = LearningTerm.term
+            WHERE LearningTerm.learning_id = ?
+            """,
+            (id,),
+        )
+        if documents > 0
+    }
+    heaviest = sorted(weights.items(), key=lambda item: item[1], reverse=True)[
+        :SIMILAR_QUERY_TERMS
+    ]
+    norm = math.sqrt(sum(weight * weight for _, weight in heaviest))
+
+    return {term: weight / norm for term, weight in heaviest} if norm else {}
+
+
+def _read_query(
+    limit: Optional[int],
+    after_id: Optional[int],
+    project_id: Optional[int],
+    learning_type: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+    tags: Optional[list[str]] = None,
+    any_tag: bool = False,
+    changed_since: Optional[str] = None,
+) -> tuple[str, tuple]:
+    """
+    Builds the filtered read, since and until are inclusive YYYY-MM-DD dates.
+    Learnings need every tag in tags, or one of them with any_tag.
+    changed_since keeps the learnings updated at or after a
+    YYYY-MM-DD[ HH:MM:SS] time
+    """
+    conditions: list[str] = []
+    parameters: list[Any] = []
+
+    if project_id is not None:
+        conditions.append("Learning.project_id = ?")
+        parameters.append(project_id)
+
+    if learning_type is not None:
+        conditions.append("Learning.learning_type = ?")
+        parameters.append(learning_type)
+
+    if since is not None:
+        conditions.append("Learning.created_at >= ?")
+        parameters.append(since)
+
+    if until is not None:
+        conditions.append("Learning.created_at < date(?, '+1 day')")
+        parameters.append(until)
+
+    if changed_since is not None:
+        conditions.append("Learning.updated_at >= ?")
+        parameters.append(changed_since)
+
+    if tags:
+        # Each tag is a range of the LearningTag (tag_id, learning_id) index,
+        # the ranges are intersected for every tag or merged for any tag
+        tagged_query = """
+            SELECT learning_id FROM LearningTag
+            WHERE tag_id = (SELECT id FROM Tag WHERE name = ?)
+        """
+        operator = " UNION " if any_tag else " INTERSECT "
+        conditions.append(
+            f"Learning.id IN ({operator.join([tagged_query] * len(tags))})"
+        )
+        parameters.extend(tags)
+
+    if after_id is not None:
+        # Keyset pagination: seeking past the last seen id uses the primary key
+        # instead of scanning and discarding the skipped rows like OFFSET does.
+        # With other filters the unary + keeps the planner on their index
+        conditions.append("+Learning.id > ?" if conditions else "Learning.id > ?")
+        parameters.append(after_id)
+
+    # Without statistics the planner prefers scanning in id order over a date
+    # range plus a sort, but a date window is a small slice of a worklog and
+    # the changes since a poll even more so
+    index_hint = ""
+
+    if project_id is None and learning_type is None and not tags:
+        if changed_since:
+            index_hint = "INDEXED BY LearningUpdatedAt"
+        elif since or until:
+            index_hint = "INDEXED BY LearningCreatedAt"
+
+    read_learnings_query = f"""
+        SELECT {LEARNING_WITH_PROJECT_COLUMNS}
+        FROM Learning {index_hint}
+        LEFT JOIN Project ON Project.id = Learning.project_id
+        WHERE {" AND ".join(conditions) or "1"}
+        ORDER BY Learning.id
+        LIMIT ?
+    """
+    parameters.append(-1 if limit is None else limit)
+
+    return read_learnings_query, tuple(parameters)
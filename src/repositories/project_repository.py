@@ -1,13 +1,20 @@
 import sqlite3
-from typing import Optional
+from typing import Iterator, Optional
 
-from src.db.create_project_table import DATABASE_NAME
+from src.db.cache import RowCache
+from src.db.connection import get_connection, retry_when_busy
 
+# Stored columns written by db export and restored by db import
+EXPORT_COLUMNS = ("id", "name", "context", "created_at", "updated_at")
 
+# Projects are looked up over and over, e.g. once per learning being annotated
+cache = RowCache()
+
+
+@retry_when_busy
 def create(name: Optional[str], context: Optional[str]):
     try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            # TODO: use row_factory
+        with get_connection() as connection:
             cursor = connection.cursor()
 
             create_project_query_string = """
@@ -31,34 +38,110 @@ def create(name: Optional[str], context: Optional[str]):
         raise
 
 
-def get(id: int):
-    try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            connection.row_factory = sqlite3.Row
+@retry_when_busy
+def create_many(projects: list[tuple[str, str]]) -> list[tuple[int, Exception]]:
+    """
+    Inserts (name, context) rows in a single transaction.
+
+    When the batch is rejected (e.g. a duplicated name) the rows are retried one
+    by one in the same transaction, the (position, error) of each failed row is
+    returned instead of aborting the batch
+    """
+    create_project_query_string = """
+        INSERT INTO Project (name, context)
+        VALUES (?, ?)
+    """
+
+    with get_connection() as connection:
+        try:
+            connection.executemany(create_project_query_string, projects)
+            return []
+        except sqlite3.IntegrityError:
+            connection.rollback()
+
+        failures: list[tuple[int, Exception]] = []
+
+        for position, project in enumerate(projects):
+            try:
+                connection.execute(create_project_query_string, project)
+            except sqlite3.IntegrityError as e:
+                failures.append((position, e))
+
+        return failures
+
+
+@retry_when_busy
+def restore_many(projects: list[tuple]) -> tuple[int, dict[int, int]]:
+    """
+    Inserts project rows (EXPORT_COLUMNS) with their timestamps in a single
+    transaction. A project whose name exists is the same project and isn't
+    inserted again, one whose id is taken by another project gets a new id.
+    Returns how many rows were inserted and the archived ids that map to a
+    different local id
+    """
+    inserted = 0
+    ids: dict[int, int] = {}
+
+    with get_connection() as connection:
+        for project in projects:
+            row = dict(zip(EXPORT_COLUMNS, project))
+            local = connection.execute(
+                "SELECT id FROM Project WHERE name = ?", (row["name"],)
+            ).fetchone()
+
+            if local is not None:
+                (local_id,) = local
+            else:
+                local_id = _restore(connection, row)
+                inserted += 1
+
+            if local_id != row["id"]:
+                ids[row["id"]] = local_id
+
+    return inserted, ids
+
+
+def _restore(connection: sqlite3.Connection, row: dict) -> int:
+    # Keeps the archived id unless another project has it
+    for columns in (EXPORT_COLUMNS, EXPORT_COLUMNS[1:]):
+        cursor = connection.execute(
+            f"""
+            INSERT INTO Project ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+            ON CONFLICT (id) DO NOTHING
+            """,
+            [row[column] for column in columns],
+        )
+
+        if cursor.rowcount:
+            break
+
+    return cursor.lastrowid
 
-            cursor = connection.cursor()
 
-            get_one_query = """
-                SELECT * FROM Project
-                WHERE id = ?
-            """
-
-            cursor.execute(get_one_query, (id,))
-
-            project = cursor.fetchone()
-
-            return project
+def get(id: int):
+    try:
+        with get_connection() as connection:
+            return cache.get(connection, id, lambda: _get(connection, id))
 
     except Exception as e:
         print(f"Error: {e}")
         raise
 
 
+def _get(connection: sqlite3.Connection, id: int):
+    get_one_query = """
+        SELECT * FROM Project
+        WHERE id = ?
+    """
+
+    return connection.execute(get_one_query, (id,)).fetchone()
+
+
+@retry_when_busy
 def update(id: int, name: str, context: str):
     try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            connection.row_factory = sqlite3.Row
-
+        with get_connection() as connection:
             cursor = connection.cursor()
 
             update_query = """
@@ -70,6 +153,7 @@ def update(id: int, name: str, context: str):
             cursor.execute(update_query, (name, context, id))
 
             connection.commit()
+            cache.invalidate(id)
 
             print("Record updated successfully")
 
@@ -78,16 +162,12 @@ def update(id: int, name: str, context: str):
         raise
 
 
-def read() -> list:
+def read(changed_since: Optional[str] = None) -> list:
     try:
-        with sqlite3.connect(DATABASE_NAME) as connection:
-            connection.row_factory = sqlite3.Row
-
+        with get_connection() as connection:
             cursor = connection.cursor()
 
-            read_all_query = """SELECT * FROM Project"""
-
-            cursor.execute(read_all_query)
+            cursor.execute(*_read_query(changed_since))
 
             print("Projects read successfully")
 
@@ -96,3 +176,37 @@ def read() -> list:
     except Exception as e:
         print(f"Error: {e}")
         raise
+
+
+def read_chunks(
+    chunk_size: int = 500, changed_since: Optional[str] = None
+) -> Iterator[list]:
+    """
+    Streams projects in id order, chunk_size rows at a time, so the whole
+    result set is never held in memory
+    """
+    cursor = get_connection().cursor()
+
+    try:
+        cursor.execute(*_read_query(changed_since))
+
+        while chunk := cursor.fetchmany(chunk_size):
+            yield chunk
+    finally:
+        cursor.close()
+
+
+def _read_query(changed_since: Optional[str]) -> tuple[str, tuple]:
+    # changed_since keeps the projects updated at or after a
+    # YYYY-MM-DD[ HH:MM:SS] time, read from the updated_at index
+    if changed_since is None:
+        return "SELECT * FROM Project ORDER BY id", ()
+
+    return (
+        """
+        SELECT * FROM Project INDEXED BY ProjectUpdatedAt
+        WHERE updated_at >= ?
+        ORDER BY id
+        """,
+        (changed_since,),
+    )
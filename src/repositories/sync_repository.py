@@ -0,0 +1,303 @@
+import sqlite3
+from typing import Any, Iterator, Optional
+
+from src.db.connection import get_connection, retry_when_busy
+from src.repositories import learning_repository, project_repository
+
+PROJECT_COLUMNS = ("name", "context", "created_at", "updated_at")
+LEARNING_COLUMNS = (
+    "challenge",
+    "solution",
+    "learning_type",
+    "created_at",
+    "updated_at",
+)
+# updated_at is when a row last changed in this worklog, which --changed-since
+# polls, so the other worklog's value is exported but not applied. Last writer
+# wins compares the ChangeLog change times instead
+APPLIED_PROJECT_COLUMNS = tuple(c for c in PROJECT_COLUMNS if c != "updated_at")
+APPLIED_LEARNING_COLUMNS = tuple(c for c in LEARNING_COLUMNS if c != "updated_at")
+
+
+def cursor() -> int:
+    """
+    Sequence of the latest change, changes exported later come after it
+    """
+    (sequence,) = (
+        get_connection()
+        .execute("SELECT coalesce(max(sequence), 0) FROM ChangeLog")
+        .fetchone()
+    )
+
+    return sequence
+
+
+def project_changes(since: int, chunk_size: int = 500) -> Iterator[list]:
+    """
+    Streams the projects changed after the since cursor in change order, a
+    deleted project comes as its sync_id with deleted set
+    """
+    return _stream(
+        f"""
+        SELECT
+            ChangeLog.sync_id,
+            ChangeLog.deleted,
+            ChangeLog.changed_at,
+            {', '.join(f'Project.{column}' for column in PROJECT_COLUMNS)}
+        FROM ChangeLog
+        LEFT JOIN Project ON Project.id = ChangeLog.row_id
+        WHERE ChangeLog.sequence > ? AND ChangeLog.entity = 'project'
+        ORDER BY ChangeLog.sequence
+        """,
+        (since,),
+        chunk_size,
+    )
+
+
+def learning_changes(since: int, chunk_size: int = 500) -> Iterator[list]:
+    """
+    Streams the learnings changed after the since cursor in change order with
+    the sync_id of their project and their tags as a JSON array
+    """
+    return _stream(
+        f"""
+        SELECT
+            ChangeLog.sync_id,
+            ChangeLog.deleted,
+            ChangeLog.changed_at,
+            {', '.join(f'Learning.{column}' for column in LEARNING_COLUMNS)},
+            ProjectChange.sync_id AS project,
+            (
+                SELECT json_group_array(Tag.name)
+                FROM LearningTag
+                JOIN Tag ON Tag.id = LearningTag.tag_id
+                WHERE LearningTag.learning_id = Learning.id
+            ) AS tags
+        FROM ChangeLog
+        LEFT JOIN Learning ON Learning.id = ChangeLog.row_id
+        LEFT JOIN ChangeLog AS ProjectChange
+            ON ProjectChange.entity = 'project'
+            AND ProjectChange.row_id = Learning.project_id
+        WHERE ChangeLog.sequence > ? AND ChangeLog.entity = 'learning'
+        ORDER BY ChangeLog.sequence
+        """,
+        (since,),
+        chunk_size,
+    )
+
+
+@retry_when_busy
+def apply(changes: list[dict[str, Any]]) -> tuple[int, list[tuple[dict, Exception]]]:
+    """
+    Applies changes exported from another worklog in a single transaction,
+    last writer wins: a change older than the local one for the same row is
+    skipped. A change the local rows reject, e.g. a rename to the name of
+    another local project, is rolled back on its own. Returns how many changes
+    were applied and the rejected ones as (change, error)
+    """
+    connection = get_connection()
+    applied = 0
+    conflicts: list[tuple[dict, Exception]] = []
+
+    try:
+        with connection:
+            # Opened explicitly so releasing a change's savepoint doesn't commit
+            connection.execute("BEGIN")
+
+            for change in changes:
+                connection.execute("SAVEPOINT change")
+
+                try:
+                    if change["type"] == "project":
+                        applied += _apply_project(connection, change)
+                    else:
+                        applied += _apply_learning(connection, change)
+                except sqlite3.IntegrityError as e:
+                    connection.execute("ROLLBACK TO change")
+                    conflicts.append((change, e))
+                finally:
+                    connection.execute("RELEASE change")
+    finally:
+        # Written behind the repositories' backs
+        project_repository.cache.clear()
+        learning_repository.cache.clear()
+
+    return applied, conflicts
+
+
+def _apply_project(connection: sqlite3.Connection, change: dict[str, Any]) -> bool:
+    local = _local_change(connection, "project", change["sync_id"])
+
+    if local is None and not change["deleted"]:
+        local = _merge_project(connection, change)
+
+    if local is not None and local["changed_at"] >= change["changed_at"]:
+        return False
+
+    row_id = _apply_row(connection, "Project", APPLIED_PROJECT_COLUMNS, local, change)
+    _record(connection, "project", row_id, local, change)
+
+    return True
+
+
+def _merge_project(
+    connection: sqlite3.Connection, change: dict[str, Any]
+) -> Optional[sqlite3.Row]:
+    # Projects created apart with the same name are the same project, both
+    # sides keep the smaller sync_id so they end up agreeing on it
+    local = connection.execute(
+        """
+        SELECT ChangeLog.*
+        FROM Project
+        JOIN ChangeLog
+            ON ChangeLog.entity = 'project' AND ChangeLog.row_id = Project.id
+        WHERE Project.name = ?
+        """,
+        (change["name"],),
+    ).fetchone()
+
+    if local is None or local["sync_id"] <= change["sync_id"]:
+        return local
+
+    _adopt_sync_id(connection, "project", local["row_id"], change["sync_id"])
+
+    return _local_change(connection, "project", change["sync_id"])
+
+
+def _apply_learning(connection: sqlite3.Connection, change: dict[str, Any]) -> bool:
+    local = _local_change(connection, "learning", change["sync_id"])
+
+    if local is not None and local["changed_at"] >= change["changed_at"]:
+        return False
+
+    if not change["deleted"]:
+        project = _local_change(connection, "project", change["project"])
+        change = {
+            **change,
+            "project_id": project["row_id"] if project is not None else None,
+        }
+
+    row_id = _apply_row(
+        connection,
+        "Learning",
+        APPLIED_LEARNING_COLUMNS + ("project_id",),
+        local,
+        change,
+    )
+
+    if row_id is not None:
+        learning_repository._set_tags(connection, row_id, change["tags"])
+
+    _record(connection, "learning", row_id, local, change)
+
+    return True
+
+
+def _apply_row(
+    connection: sqlite3.Connection,
+    table: str,
+    columns: tuple[str, ...],
+    local: Optional[sqlite3.Row],
+    change: dict[str, Any],
+) -> Optional[int]:
+    # Returns the id of the written row, None once it's deleted
+    row_id = local["row_id"] if local is not None else None
+
+    if change["deleted"]:
+        if row_id is not None:
+            connection.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+
+        return None
+
+    values = [change[column] for column in columns]
+
+    if row_id is None:
+        return connection.execute(
+            f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+            """,
+            values,
+        ).lastrowid
+
+    connection.execute(
+        f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} "
+        "WHERE id = ?",
+        (*values, row_id),
+    )
+
+    return row_id
+
+
+def _record(
+    connection: sqlite3.Connection,
+    entity: str,
+    row_id: Optional[int],
+    local: Optional[sqlite3.Row],
+    change: dict[str, Any],
+):
+    # The triggers logged the write as a local change made now, the entry
+    # takes the change time of the other worklog instead so applying the
+    # change again, here or back over there, is a no-op
+    if row_id is None:
+        connection.execute(
+            """
+            INSERT INTO ChangeLog (entity, sync_id, deleted, changed_at)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT (entity, sync_id) DO UPDATE SET
+                row_id = NULL,
+                deleted = 1,
+                changed_at = excluded.changed_at
+            """,
+            (entity, change["sync_id"], change["changed_at"]),
+        )
+        return
+
+    if local is None or local["row_id"] is None:
+        # A new row, or one brought back from a tombstone
+        _adopt_sync_id(connection, entity, row_id, change["sync_id"])
+
+    connection.execute(
+        "UPDATE ChangeLog SET changed_at = ? WHERE entity = ? AND row_id = ?",
+        (change["changed_at"], entity, row_id),
+    )
+
+
+def _adopt_sync_id(
+    connection: sqlite3.Connection, entity: str, row_id: int, sync_id: str
+):
+    connection.execute(
+        """
+        DELETE FROM ChangeLog
+        WHERE entity = ? AND sync_id = ? AND row_id IS NULL
+        """,
+        (entity, sync_id),
+    )
+    connection.execute(
+        """
+        UPDATE ChangeLog
+        SET sync_id = ?, sequence = (SELECT max(sequence) FROM ChangeLog) + 1
+        WHERE entity = ? AND row_id = ?
+        """,
+        (sync_id, entity, row_id),
+    )
+
+
+def _local_change(
+    connection: sqlite3.Connection, entity: str, sync_id: Optional[str]
+) -> Optional[sqlite3.Row]:
+    return connection.execute(
+        "SELECT * FROM ChangeLog WHERE entity = ? AND sync_id = ?", (entity, sync_id)
+    ).fetchone()
+
+
+def _stream(query: str, parameters: tuple, chunk_size: int) -> Iterator[list]:
+    cursor = get_connection().cursor()
+
+    try:
+        cursor.execute(query, parameters)
+
+        while chunk := cursor.fetchmany(chunk_size):
+            yield chunk
+    finally:
+        cursor.close()
@@ -0,0 +1,53 @@
+from typing import Iterator
+
+from src.db.connection import get_connection, retry_when_busy
+
+# A learning's tags as one row per tag, tag names rather than ids so they can be
+# restored into a worklog whose Tag ids differ
+EXPORT_COLUMNS = ("learning_id", "tag")
+
+
+def export_chunks(chunk_size: int = 500) -> Iterator[list]:
+    """
+    Streams the (learning_id, tag) pairs in learning order, chunk_size rows at
+    a time
+    """
+    cursor = get_connection().cursor()
+
+    try:
+        cursor.execute(
+            """
+            SELECT LearningTag.learning_id, Tag.name AS tag
+            FROM LearningTag
+            JOIN Tag ON Tag.id = LearningTag.tag_id
+            ORDER BY LearningTag.learning_id, LearningTag.tag_id
+            """
+        )
+
+        while chunk := cursor.fetchmany(chunk_size):
+            yield chunk
+    finally:
+        cursor.close()
+
+
+@retry_when_busy
+def restore_many(learning_tags: list[tuple]) -> int:
+    """
+    Links learnings to tags (EXPORT_COLUMNS) in a single transaction, creating
+    the tags that don't exist yet, learning_id must already be the local id.
+    Links that already exist are skipped. Returns how many links were inserted
+    """
+    with get_connection() as connection:
+        connection.executemany(
+            "INSERT INTO Tag (name) VALUES (?) ON CONFLICT DO NOTHING",
+            [(tag,) for _, tag in learning_tags],
+        )
+
+        return connection.executemany(
+            """
+            INSERT INTO LearningTag (learning_id, tag_id)
+            SELECT ?, id FROM Tag WHERE name = ?
+            ON CONFLICT DO NOTHING
+            """,
+            learning_tags,
+        ).rowcount
@@ -1,10 +1,20 @@
-from typing import Optional
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from src.formats import RECORD_FORMATS
 
 
 class InvalidId(Exception):
     pass
 
 
+class InvalidOutputFormat(Exception):
+    pass
+
+
 class Id:
     @staticmethod
     def validate(id: int | str | None):
@@ -17,25 +27,169 @@ class Id:
             raise InvalidId()
 
 
-def parse_user_input(content: str, keys_to_extract: tuple) -> dict[str, str]:
-    current_field: Optional[str | None] = None
+# Line breaks str.splitlines() knows besides "\n", text containing any of them is
+# normalized first so field bodies can be sliced straight out of it
+OTHER_LINE_BREAKS = (
+    "\r",
+    "\v",
+    "\f",
+    "\x1c",
+    "\x1d",
+    "\x1e",
+    "\x85",
+    "\u2028",
+    "\u2029",
+)
+
+
+def parse_user_input(
+    content: str | Iterable[str], keys_to_extract: tuple
+) -> dict[str, str]:
+    """
+    Extracts the "Key:" sections of template text into {key: body}.
+
+    The text is scanned once for separator and key lines and each body is
+    sliced out of it instead of being rebuilt line by line. Content can also be
+    a text file (stdin) or an iterable of lines, it's read into one string
+    first since slicing that beats splitting it into lines
+    """
+    if not isinstance(content, str):
+        content = content.read() if hasattr(content, "read") else "".join(content)
+
+    if any(line_break in content for line_break in OTHER_LINE_BREAKS):
+        content = "\n".join(content.splitlines())
+
+    current_field: Optional[str] = None
+    body_start = 0
     data: dict[str, list[str]] = {}
 
-    for line in content.splitlines():
+    for start, end in _marker_lines(content):
+        line = content[start:end]
+
         if line == "---":
-            current_field = None
+            field = None
+        elif (field := _field_name(line, keys_to_extract)) is None:
             continue
 
-        if line.endswith(":"):
-            name = "_".join(line[:-1].split()).lower()
-            if name in keys_to_extract:
-                current_field = name
-                data.setdefault(name, [])
+        # A body holds the lines between the previous marker and this one
+        if current_field and start > body_start:
+            data[current_field].append(content[body_start : start - 1])
+
+        current_field = field
+        body_start = end + 1
+
+        if field is not None:
+            data.setdefault(field, [])
+
+    if current_field and body_start < len(content):
+        data[current_field].append(content[body_start:])
+
+    return {field: "\n".join(bodies).strip() for field, bodies in data.items()}
+
+
+def _marker_lines(content: str) -> list[tuple[int, int]]:
+    """
+    (start, end) of the "---" lines and the lines ending in ":", only these
+    can start or end a field. They're found with str.find so the body text in
+    between is skipped at C speed
+    """
+    markers = []
+
+    if content.startswith("---") and content[3:4] in ("", "\n"):
+        markers.append((0, 3))
+
+    position = content.find("\n---")
+
+    while position != -1:
+        end = position + 4
+
+        if content[end : end + 1] in ("", "\n"):
+            markers.append((position + 1, end))
+
+        position = content.find("\n---", end)
+
+    position = content.find(":\n")
+
+    while position != -1:
+        markers.append((content.rfind("\n", 0, position) + 1, position + 1))
+        position = content.find(":\n", position + 2)
+
+    if content.endswith(":"):
+        markers.append((content.rfind("\n") + 1, len(content)))
+
+    return sorted(markers)
+
+
+def _field_name(line: str, keys_to_extract: tuple) -> Optional[str]:
+    name = "_".join(line[:-1].split()).lower()
+
+    return name if name in keys_to_extract else None
+
+
+def read_records(path: str) -> Iterator[tuple[int, Optional[dict[str, Any]]]]:
+    """
+    Streams (line number, record) pairs from a JSONL or CSV file.
+
+    Lines that can't be decoded into an object are yielded as None so callers
+    can report them without aborting the whole file
+    """
+    if Path(path).suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+
+            for record in reader:
+                yield reader.line_num, record
+
+        return
+
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
                 continue
 
-        if current_field:
-            data[current_field].append(line)
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+
+            yield line_number, record if isinstance(record, dict) else None
+
+
+def write_records(
+    chunks: Iterable[list], output_format: str, file: Optional[TextIO] = None
+):
+    """
+    Writes rows as a JSON array, NDJSON or CSV one chunk at a time, memory use
+    doesn't depend on the number of rows
+    """
+    if output_format not in RECORD_FORMATS:
+        raise InvalidOutputFormat()
+
+    file = file or sys.stdout
+    csv_writer = None
+    written = 0
+
+    if output_format == "json":
+        file.write("[")
+
+    for chunk in chunks:
+        if output_format == "json":
+            file.write(
+                "".join(
+                    ("\n" if written + position == 0 else ",\n") + json.dumps(dict(row))
+                    for position, row in enumerate(chunk)
+                )
+            )
+        elif output_format == "ndjson":
+            file.write("".join(json.dumps(dict(row)) + "\n" for row in chunk))
+        else:
+            if csv_writer is None:
+                csv_writer = csv.DictWriter(file, fieldnames=list(dict(chunk[0])))
+                csv_writer.writeheader()
+
+            csv_writer.writerows(dict(row) for row in chunk)
 
-    result = {field: "\n".join(content).strip() for field, content in data.items()}
+        written += len(chunk)
 
-    return result
+    if output_format == "json":
+        file.write("\n]\n" if written else "]\n")
@@ -0,0 +1,17 @@
+import pytest
+
+from src.db import connection
+
+
+@pytest.fixture
+def database(tmp_path):
+    """
+    Points the connection pool at an empty, migrated worklog in a temporary
+    directory
+    """
+    database_path = str(tmp_path / "worklog.db")
+    connection.configure(database=database_path)
+
+    yield database_path
+
+    connection.configure(database=connection.DATABASE_NAME)
@@ -0,0 +1,69 @@
+import sqlite3
+
+from src.db import connection
+from src.db.cache import RowCache
+from src.repositories import project_repository
+
+
+def test_get_loads_a_row_once(database: str):
+    cache = RowCache()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"id": 1}
+
+    assert cache.get(connection.get_connection(), 1, load) == {"id": 1}
+    assert cache.get(connection.get_connection(), "1", load) == {"id": 1}
+
+    assert len(loads) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_get_does_not_cache_missing_rows(database: str):
+    cache = RowCache()
+
+    cache.get(connection.get_connection(), 1, lambda: None)
+
+    assert len(cache) == 0
+
+
+def test_least_recently_used_row_is_evicted(database: str):
+    cache = RowCache(max_size=2)
+    current = connection.get_connection()
+
+    for id in (1, 2, 1, 3):
+        cache.get(current, id, lambda: {"id": id})
+
+    cache.get(current, 2, lambda: {"id": "reloaded"})
+
+    assert cache.misses == 4
+
+
+def test_invalidate_drops_a_row(database: str):
+    cache = RowCache()
+    current = connection.get_connection()
+
+    cache.get(current, 1, lambda: "old")
+    cache.invalidate("1")
+
+    assert cache.get(current, 1, lambda: "new") == "new"
+
+
+def test_commit_from_another_connection_clears_the_cache(database: str):
+    project_repository.create("worklog", "cli")
+    project_repository.get(1)
+
+    with sqlite3.connect(database) as other:
+        other.execute("UPDATE Project SET name = 'renamed' WHERE id = 1")
+
+    assert project_repository.get(1)["name"] == "renamed"
+
+
+def test_configure_clears_the_cache(database: str, tmp_path):
+    project_repository.create("worklog", "cli")
+    project_repository.get(1)
+
+    connection.configure(database=str(tmp_path / "other.db"))
+
+    assert project_repository.get(1) is None
@@ -0,0 +1,40 @@
+import contextlib
+import io
+import multiprocessing
+
+from src.db import connection
+from src.repositories import learning_repository
+
+WRITERS = 4
+WRITES_PER_WRITER = 50
+
+
+def write_learnings(database: str, writer: int):
+    connection.configure(database=database)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(WRITES_PER_WRITER):
+            learning_repository.create(
+                None, f"writer {writer} challenge {index}", "solution", "hard"
+            )
+
+
+def test_concurrent_writer_processes_do_not_lose_writes(database: str):
+    # Spawned processes don't inherit the parent's open connections
+    context = multiprocessing.get_context("spawn")
+    writers = [
+        context.Process(target=write_learnings, args=(database, writer))
+        for writer in range(WRITERS)
+    ]
+
+    for writer in writers:
+        writer.start()
+
+    for writer in writers:
+        writer.join(timeout=60)
+
+    assert [writer.exitcode for writer in writers] == [0] * WRITERS
+    (total,) = (
+        connection.get_connection().execute("SELECT count(*) FROM Learning").fetchone()
+    )
+    assert total == WRITERS * WRITES_PER_WRITER
@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.db import connection
+
+
+def test_get_connection_reuses_connection_within_thread(database: str):
+    assert connection.get_connection() is connection.get_connection()
+
+
+def test_get_connection_opens_one_connection_per_thread(database: str):
+    connections = []
+
+    def worker():
+        connections.append(connection.get_connection())
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert connections[0] is not connection.get_connection()
+
+
+def test_configure_reopens_connections_with_pragmas(database: str):
+    previous = connection.get_connection()
+
+    connection.configure(pragmas={"cache_size": -1234})
+    current = connection.get_connection()
+
+    assert current is not previous
+    assert current.execute("PRAGMA cache_size").fetchone()[0] == -1234
+
+
+def test_close_all_closes_open_connections(database: str):
+    previous = connection.get_connection()
+
+    connection.close_all()
+
+    assert connection.get_connection() is not previous
+
+
+def test_connection_is_closed_when_its_thread_exits(database: str):
+    connections = []
+
+    def worker():
+        connections.append(connection.get_connection())
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert connections[0] not in connection._connections
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+
+def test_get_connection_uses_wal_journal(database: str):
+    assert connection.get_connection().execute("PRAGMA journal_mode").fetchone()[0] == (
+        "wal"
+    )
+
+
+def test_retry_when_busy_retries_until_write_succeeds(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(connection, "BUSY_BACKOFF_SECONDS", 0)
+    attempts = []
+
+    @connection.retry_when_busy
+    def write():
+        attempts.append(1)
+
+        if len(attempts) < 3:
+            raise sqlite3.OperationalError("database is locked")
+
+        return "written"
+
+    assert write() == "written"
+    assert len(attempts) == 3
+
+
+def test_retry_when_busy_gives_up_after_max_retries(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(connection, "BUSY_BACKOFF_SECONDS", 0)
+    attempts = []
+
+    @connection.retry_when_busy
+    def write():
+        attempts.append(1)
+        raise sqlite3.OperationalError("database is locked")
+
+    with pytest.raises(sqlite3.OperationalError):
+        write()
+
+    assert len(attempts) == connection.BUSY_RETRIES
+
+
+def test_retry_when_busy_does_not_retry_other_errors():
+    attempts = []
+
+    @connection.retry_when_busy
+    def write():
+        attempts.append(1)
+        raise sqlite3.OperationalError("no such table: Learning")
+
+    with pytest.raises(sqlite3.OperationalError):
+        write()
+
+    assert len(attempts) == 1
+
+
+def test_snapshot_reads_ignore_later_commits(database: str):
+    connection.get_connection().execute("CREATE TABLE Note (text TEXT)")
+
+    with connection.snapshot() as current:
+        before = current.execute("SELECT count(*) FROM Note").fetchone()[0]
+
+        with sqlite3.connect(database) as other:
+            other.execute("INSERT INTO Note VALUES ('written meanwhile')")
+
+        assert current.execute("SELECT count(*) FROM Note").fetchone()[0] == before
+
+    assert (
+        connection.get_connection().execute("SELECT count(*) FROM Note").fetchone()[0]
+        == 1
+    )
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.db.executor import DatabaseExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = DatabaseExecutor(max_batch_size=8)
+
+    yield executor
+
+    executor.shutdown()
+
+
+def test_calls_queued_while_busy_wake_the_loop_once(executor: DatabaseExecutor):
+    release = threading.Event()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        wake_ups = 0
+        call_soon_threadsafe = loop.call_soon_threadsafe
+
+        def counted(*args):
+            nonlocal wake_ups
+            wake_ups += 1
+            return call_soon_threadsafe(*args)
+
+        loop.call_soon_threadsafe = counted  # type: ignore[method-assign]
+
+        busy = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+        queued = [executor.run(lambda value=value: value) for value in range(5)]
+        tasks = [asyncio.ensure_future(call) for call in queued]
+        await asyncio.sleep(0.01)
+        release.set()
+
+        return await busy, await asyncio.gather(*tasks), wake_ups
+
+    assert asyncio.run(main()) == (True, [0, 1, 2, 3, 4], 2)
+
+
+def test_errors_go_to_their_own_call(executor: DatabaseExecutor):
+    def fail():
+        raise ValueError("bad call")
+
+    async def main():
+        return await asyncio.gather(
+            executor.run(lambda: 1), executor.run(fail), return_exceptions=True
+        )
+
+    ok, error = asyncio.run(main())
+
+    assert ok == 1
+    assert isinstance(error, ValueError)
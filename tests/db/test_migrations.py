@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from src.db import migrations
+
+
+@pytest.fixture
+def connection(tmp_path):
+    connection = sqlite3.connect(tmp_path / "worklog.db")
+
+    yield connection
+
+    connection.close()
+
+
+def test_migrate_applies_every_migration_once(connection: sqlite3.Connection):
+    applied = migrations.migrate(connection)
+
+    assert [migration.version for migration in applied] == [
+        migration.version for migration in migrations.MIGRATIONS
+    ]
+    assert migrations.migrate(connection) == []
+    assert migrations.current_version(connection) == migrations.MIGRATIONS[-1].version
+
+
+def test_migrate_adopts_worklog_created_without_migrations(
+    connection: sqlite3.Connection,
+):
+    connection.execute(migrations.MIGRATIONS[1].statements[0])
+    connection.execute(
+        "INSERT INTO Learning (challenge, solution, learning_type) "
+        "VALUES ('flaky test', 'freeze time', 'hard')"
+    )
+    connection.commit()
+
+    migrations.migrate(connection)
+
+    assert connection.execute(
+        "SELECT rowid FROM LearningSearch WHERE LearningSearch MATCH 'flaky'"
+    ).fetchall() == [(1,)]
+
+
+def test_migrate_rolls_back_every_pending_migration_on_failure(
+    connection: sqlite3.Connection, monkeypatch: pytest.MonkeyPatch
+):
+    broken = migrations.Migration(99, "broken", ("CREATE TABLE Broken (",))
+    monkeypatch.setattr(migrations, "MIGRATIONS", (*migrations.MIGRATIONS, broken))
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrations.migrate(connection)
+
+    assert migrations.current_version(connection) == 0
+    assert (
+        connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'Project'"
+        ).fetchone()
+        is None
+    )
@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+from src.db import connection, profiling
+
+
+@pytest.fixture
+def profiled(database: str):
+    connection.configure(factory=profiling.ProfiledConnection)
+    log = profiling.start()
+
+    yield log
+
+    profiling.stop()
+    connection.configure(factory=sqlite3.Connection)
+
+
+def test_records_sql_time_and_rows_of_each_statement(profiled: profiling.QueryLog):
+    db = connection.get_connection()
+    profiled.queries.clear()
+
+    db.execute("CREATE TABLE Item (name TEXT)")
+    db.executemany("INSERT INTO Item (name) VALUES (?)", [("a",), ("b",), ("c",)])
+    rows = db.execute("SELECT name\n    FROM Item").fetchall()
+    first_two = db.cursor().execute("SELECT name FROM Item").fetchmany(2)
+
+    assert len(rows) == 3 and len(first_two) == 2
+    assert [(query.sql, query.rows) for query in profiled.queries] == [
+        ("CREATE TABLE Item (name TEXT)", 0),
+        ("INSERT INTO Item (name) VALUES (?)", 3),
+        ("SELECT name FROM Item", 3),
+        ("SELECT name FROM Item", 2),
+    ]
+    assert all(query.seconds > 0 for query in profiled.queries)
+
+
+def test_counts_rows_read_by_iterating(profiled: profiling.QueryLog):
+    db = connection.get_connection()
+    profiled.queries.clear()
+
+    assert [row[0] for row in db.execute("SELECT 1 UNION SELECT 2")] == [1, 2]
+    assert profiled.queries[0].rows == 2
+
+
+def test_nothing_is_recorded_once_stopped(profiled: profiling.QueryLog):
+    db = connection.get_connection()
+    profiling.stop()
+    profiled.queries.clear()
+
+    db.execute("SELECT 1").fetchall()
+
+    assert profiled.queries == []
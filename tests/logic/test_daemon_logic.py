@@ -0,0 +1,103 @@
+import os
+import threading
+
+import pytest
+import typer
+
+from src import client
+from src.logic import daemon_logic
+from src.logic.daemon_exceptions import DaemonAlreadyRunning
+from src.main import app
+
+
+@pytest.fixture
+def daemon(database: str, monkeypatch, tmp_path):
+    """
+    Serves the test worklog from a thread and stops it afterwards
+    """
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    thread = threading.Thread(
+        target=daemon_logic.serve, args=(typer.main.get_command(app), database)
+    )
+    thread.start()
+
+    path = client.socket_path(database)
+
+    # The socket exists once the daemon has migrated the worklog and is bound
+    while thread.is_alive() and not (tmp_path / path.split("/")[-1]).exists():
+        thread.join(0.01)
+
+    yield path
+
+    daemon_logic.stop(database)
+    thread.join()
+
+
+def request(args: list[str], stdin=None) -> dict:
+    return {"args": args, "cwd": ".", "stdin": stdin, "columns": 80, "color": False}
+
+
+def test_daemon_runs_commands(daemon: str):
+    created = client.send(
+        daemon, request(["projects", "create", "--name", "worklog", "--context", "cli"])
+    )
+    read = client.send(daemon, request(["projects", "read", "--format", "ndjson"]))
+
+    assert created == {
+        "stdout": "Record inserted successfully\n",
+        "stderr": "",
+        "exit_code": 0,
+    }
+    assert '"name": "worklog"' in read["stdout"]
+
+
+def test_daemon_reads_stdin_from_the_request(daemon: str):
+    client.send(
+        daemon,
+        request(
+            ["projects", "create", "--from-stdin"], "Name:\nworklog\nContext:\ncli\n"
+        ),
+    )
+
+    read = client.send(daemon, request(["projects", "read", "--format", "ndjson"]))
+
+    assert '"context": "cli"' in read["stdout"]
+
+
+def test_daemon_returns_errors_and_exit_codes(daemon: str):
+    missing = client.send(daemon, request(["learnings", "update", "1", "--type", "x"]))
+    usage = client.send(daemon, request(["projects", "unknown"]))
+
+    assert missing["exit_code"] == 1
+    assert "LearningNotFound" in missing["stderr"]
+    assert usage["exit_code"] == 2
+    assert "No such command" in usage["stderr"]
+
+
+def test_stop_without_daemon(database: str, monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    assert not daemon_logic.stop(database)
+
+
+def test_one_daemon_per_worklog(daemon: str, database: str):
+    with pytest.raises(DaemonAlreadyRunning):
+        daemon_logic.serve(typer.main.get_command(app), database)
+
+
+def test_lock_does_not_follow_a_planted_symlink(database: str, monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    target = tmp_path / "target"
+    target.write_text("kept")
+    lock = tmp_path / f"{client.socket_path(database).split('/')[-1]}.lock"
+    lock.symlink_to(target)
+
+    with pytest.raises(OSError):
+        daemon_logic.serve(typer.main.get_command(app), database)
+
+    assert target.read_text() == "kept"
+
+
+def test_lock_is_only_accessible_by_its_owner(daemon: str):
+    assert os.stat(f"{daemon}.lock").st_mode & 0o777 == 0o600
@@ -0,0 +1,113 @@
+import gzip
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from src.db import connection
+from src.logic import db_logic
+from src.logic.db_exceptions import BackupDestinationExists, InvalidExportFile
+from src.repositories import learning_repository, project_repository
+
+
+@pytest.fixture
+def worklog(database: str):
+    project_repository.create("worklog", "cli")
+    learning_repository.create(1, "flaky test", "freeze time", "hard", ["ci", "python"])
+    learning_repository.create(None, "slow query", "add an index", "soft")
+
+    return database
+
+
+def learning_rows() -> list[tuple]:
+    return [
+        tuple(row) for chunk in learning_repository.export_chunks() for row in chunk
+    ]
+
+
+def test_backup_copies_the_worklog(worklog: str, tmp_path):
+    destination = str(tmp_path / "backup.db")
+
+    db_logic.backup(destination, pages=1)
+
+    with closing(sqlite3.connect(destination)) as backup:
+        assert backup.execute("SELECT challenge FROM Learning").fetchall() == [
+            ("flaky test",),
+            ("slow query",),
+        ]
+
+
+def test_backup_does_not_overwrite_files(worklog: str, tmp_path):
+    destination = tmp_path / "backup.db"
+    destination.write_text("notes")
+
+    with pytest.raises(BackupDestinationExists):
+        db_logic.backup(str(destination))
+
+    assert destination.read_text() == "notes"
+
+
+def test_export_and_import_restore_rows_with_their_ids(worklog: str, tmp_path):
+    archive = str(tmp_path / "worklog.ndjson.gz")
+    db_logic.export(archive)
+    exported = learning_rows()
+
+    connection.configure(database=str(tmp_path / "restored.db"))
+    db_logic.import_file(archive, batch_size=1)
+
+    assert learning_rows() == exported
+    assert project_repository.get(1)["name"] == "worklog"
+    assert learning_repository.get_tags(1) == ["ci", "python"]
+    assert [row["id"] for row in learning_repository.search("index")] == [2]
+
+
+def test_import_skips_rows_that_exist(worklog: str, tmp_path, capsys):
+    archive = str(tmp_path / "worklog.ndjson.gz")
+    db_logic.export(archive)
+
+    db_logic.import_file(archive)
+
+    assert "Skipped 5 rows that already exist" in capsys.readouterr().out
+    assert len(learning_repository.read()) == 2
+
+
+@pytest.mark.parametrize(
+    "content", [b"not gzip", gzip.compress(b'{"format": "other"}\n')]
+)
+def test_import_rejects_other_files(database: str, tmp_path, content: bytes):
+    archive = tmp_path / "archive.gz"
+    archive.write_bytes(content)
+
+    with pytest.raises(InvalidExportFile):
+        db_logic.import_file(str(archive))
+
+
+def test_import_remaps_rows_whose_id_is_taken(database: str, tmp_path, capsys):
+    for name in ("worklog", "dotfiles", "blog"):
+        project_repository.create(name, "context")
+    learning_repository.create(3, "slow query", "add an index", "hard", ["db", "perf"])
+    learning_repository.create(1, "flaky test", "freeze time", "soft")
+    archive = str(tmp_path / "worklog.ndjson.gz")
+    db_logic.export(archive)
+
+    connection.configure(database=str(tmp_path / "local.db"))
+    project_repository.create("local", "context")
+    learning_repository.create(None, "local learning", "solution", "soft")
+    capsys.readouterr()
+
+    # Small batches so learnings are flushed while a project is still queued
+    db_logic.import_file(archive, batch_size=2)
+
+    assert "Restored 3 projects, 2 learnings and 2 tags" in capsys.readouterr().out
+    learnings = {
+        learning["challenge"]: learning for learning in learning_repository.read()
+    }
+    assert learnings["local learning"]["tags"] is None
+    assert learnings["slow query"]["project_name"] == "blog"
+    assert learnings["slow query"]["tags"] == "db, perf"
+    assert learnings["flaky test"]["project_name"] == "worklog"
+
+    db_logic.import_file(archive, batch_size=2)
+
+    assert "Skipped 7 rows that already exist" in capsys.readouterr().out
+    assert len(learning_repository.read()) == 3
@@ -1,4 +1,6 @@
+import json
 import sqlite3
+from datetime import date, datetime
 from textwrap import dedent
 from unittest.mock import call
 
@@ -231,9 +233,94 @@ def test_create_learning_successfully_saves_in_db(mocker: MockerFixture, faker:
         "Error while compiling code",
         "update env var from config file",
         "soft",
+        None,
     )
 
 
+def test_create_learning_from_fields_skips_editor(mocker: MockerFixture):
+    mock_learning_repo = mocker.patch("src.logic.learning_logic.learning_repository")
+    mock_click = mocker.patch("src.logic.learning_logic.click")
+
+    learning_logic.create(
+        challenge="Error while compiling code",
+        solution="update env var\nfrom config file",
+        learning_type="hard",
+    )
+
+    mock_click.edit.assert_not_called()
+    mock_learning_repo.create.assert_called_with(
+        None,
+        "Error while compiling code",
+        "update env var\nfrom config file",
+        "hard",
+        [],
+    )
+
+
+def test_create_learning_from_text_skips_editor(mocker: MockerFixture):
+    mock_learning_repo = mocker.patch("src.logic.learning_logic.learning_repository")
+    mock_click = mocker.patch("src.logic.learning_logic.click")
+
+    learning_logic.create(
+        dedent(
+            """\
+            Challenge:
+            Error while compiling code
+            ---
+            Solution:
+            update env var from config file
+            ---
+            Type:
+            soft
+            """
+        )
+    )
+
+    mock_click.edit.assert_not_called()
+    mock_learning_repo.create.assert_called_with(
+        None,
+        "Error while compiling code",
+        "update env var from config file",
+        "soft",
+        None,
+    )
+
+
+def test_create_learning_parses_the_tags_section(mocker: MockerFixture):
+    mock_learning_repo = mocker.patch("src.logic.learning_logic.learning_repository")
+    mocker.patch("src.logic.learning_logic.click")
+
+    learning_logic.create(
+        dedent(
+            """\
+            Challenge:
+            Pod stuck in pending
+            ---
+            Solution:
+            raise the quota
+            ---
+            Type:
+            hard
+            ---
+            Tags:
+            K8s, oncall
+            k8s
+            """
+        )
+    )
+
+    assert mock_learning_repo.create.call_args.args[4] == ["k8s", "oncall"]
+
+
+def test_create_learning_from_fields_is_validated(mocker: MockerFixture):
+    mock_learning_repo = mocker.patch("src.logic.learning_logic.learning_repository")
+
+    with pytest.raises(InvalidSolution):
+        learning_logic.create(challenge="Error while compiling code", solution="")
+
+    mock_learning_repo.create.assert_not_called()
+
+
 class TestUpdateLearning:
     def test_update_learning_fails_when_learning_not_found(
         self, mocker: MockerFixture, faker: Faker
@@ -595,6 +682,28 @@ class TestUpdateLearning:
 
         mock_learning_repo.update.assert_called_once()
 
+    def test_update_learning_from_fields_keeps_other_values(
+        self, mocker: MockerFixture
+    ):
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.get.return_value = {
+            "challenge": "multi\nline challenge",
+            "solution": "solution",
+            "learning_type": "soft",
+            "project_id": None,
+        }
+        mock_learning_repo.get_tags.return_value = ["python"]
+        mock_click = mocker.patch("src.logic.learning_logic.click")
+
+        learning_logic.update(1, learning_type="hard")
+
+        mock_click.edit.assert_not_called()
+        mock_learning_repo.update.assert_called_once_with(
+            1, None, "multi\nline challenge", "solution", "hard", ["python"]
+        )
+
 
 class TestReadLearnings:
     def test_read_successfully_when_there_are_no_learnings(self, mocker: MockerFixture):
@@ -623,6 +732,9 @@ class TestReadLearnings:
                 "solution": "solution 1",
                 "learning_type": "hard",
                 "project_id": 10,
+                "project_name": "worklog",
+                "project_context": "cli to track learnings",
+                "tags": "python, sqlite",
                 "created_at": "",
             },
             {
@@ -631,6 +743,9 @@ class TestReadLearnings:
                 "solution": "solution 2",
                 "learning_type": "soft",
                 "project_id": 10,
+                "project_name": "worklog",
+                "project_context": "cli to track learnings",
+                "tags": "python, sqlite",
                 "created_at": "",
             },
             {
@@ -639,11 +754,23 @@ class TestReadLearnings:
                 "solution": "solution 3",
                 "learning_type": "hard",
                 "project_id": 10,
+                "project_name": "worklog",
+                "project_context": "cli to track learnings",
+                "tags": "python, sqlite",
                 "created_at": "",
             },
         ]
         expected_calls = [
-            call(*[str(value) for value in learning.values()])
+            call(
+                str(learning["id"]),
+                learning["challenge"],
+                learning["solution"],
+                learning["learning_type"],
+                "worklog",
+                "cli to track learnings",
+                "python, sqlite",
+                "",
+            )
             for learning in mock_learnings
         ]
         mock_learning_repo.read.return_value = mock_learnings
@@ -652,3 +779,310 @@ class TestReadLearnings:
 
         assert mock_table_instance.add_row.call_count == len(mock_learnings)
         mock_table_instance.add_row.assert_has_calls(expected_calls)
+
+    def test_read_streams_one_table_per_chunk(self, mocker: MockerFixture):
+        mock_console_instance = mocker.patch(
+            "src.logic.learning_logic.Console"
+        ).return_value
+        mock_table_class = mocker.patch("src.logic.learning_logic.Table")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        learning = {
+            "id": 1,
+            "challenge": "challenge",
+            "solution": "solution",
+            "learning_type": "hard",
+            "project_id": None,
+            "project_name": None,
+            "project_context": None,
+            "tags": None,
+            "created_at": "",
+        }
+        mock_learning_repo.read_chunks.return_value = iter(
+            [[learning, learning], [{**learning, "id": 3}]]
+        )
+
+        learning_logic.read(limit=3, stream=True, chunk_size=2)
+
+        mock_learning_repo.read.assert_not_called()
+        assert mock_table_class.call_count == 2
+        assert mock_table_class.call_args_list[1].kwargs["show_header"] is False
+        mock_console_instance.print.assert_called_with("Next page: --after-id 3")
+
+    def test_read_forwards_filters_to_repository(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.read.return_value = []
+
+        learning_logic.read(
+            project_id=3,
+            learning_type="soft",
+            since=date(2024, 1, 1),
+            until=date(2024, 1, 31),
+        )
+
+        mock_learning_repo.read.assert_called_once_with(
+            limit=None,
+            after_id=None,
+            project_id=3,
+            learning_type="soft",
+            since="2024-01-01",
+            until="2024-01-31",
+            tags=None,
+            any_tag=False,
+            changed_since=None,
+        )
+
+    def test_read_forwards_changed_since_as_a_stored_time(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.read.return_value = []
+
+        learning_logic.read(changed_since=datetime(2024, 1, 31, 8, 30))
+
+        assert (
+            mock_learning_repo.read.call_args.kwargs["changed_since"]
+            == "2024-01-31 08:30:00"
+        )
+
+    def test_read_forwards_lowercased_tags_to_repository(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.read.return_value = []
+
+        learning_logic.read(tags=["Python", "sqlite"], any_tag=True)
+
+        assert mock_learning_repo.read.call_args.kwargs["tags"] == [
+            "python",
+            "sqlite",
+        ]
+        assert mock_learning_repo.read.call_args.kwargs["any_tag"] is True
+
+    def test_read_fails_when_learning_type_filter_is_not_allowed(
+        self, mocker: MockerFixture
+    ):
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+
+        with pytest.raises(InvalidLearningType):
+            learning_logic.read(learning_type="personal")
+
+        mock_learning_repo.read.assert_not_called()
+
+
+class TestSearchLearnings:
+    def test_search_highlights_matches(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_table_instance = mocker.patch(
+            "src.logic.learning_logic.Table"
+        ).return_value
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.SNIPPET_START = "<"
+        mock_learning_repo.SNIPPET_END = ">"
+        mock_learning_repo.search.return_value = [
+            {
+                "id": 1,
+                "snippet": "fix [ci] <postgres> lock",
+                "learning_type": "hard",
+                "project_id": None,
+                "project_name": None,
+                "project_context": None,
+                "created_at": "",
+            }
+        ]
+
+        learning_logic.search("postgres")
+
+        mock_learning_repo.search.assert_called_once_with("postgres", 20)
+        mock_table_instance.add_row.assert_called_once_with(
+            "1",
+            "fix \\[ci] [bold yellow]postgres[/bold yellow] lock",
+            "hard",
+            "None",
+            "",
+        )
+
+    def test_search_skips_empty_query(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+
+        learning_logic.search("  ")
+
+        mock_learning_repo.search.assert_not_called()
+
+
+class TestSimilarLearnings:
+    def test_similar_lists_scored_learnings(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_table_instance = mocker.patch(
+            "src.logic.learning_logic.Table"
+        ).return_value
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.similar.return_value = [
+            {
+                "id": 7,
+                "score": 0.8125,
+                "challenge": "pod pending",
+                "learning_type": "hard",
+                "project_id": None,
+                "project_name": None,
+                "project_context": None,
+            }
+        ]
+
+        learning_logic.similar(1, limit=3)
+
+        mock_learning_repo.index_pending_terms.assert_called_once()
+        mock_learning_repo.similar.assert_called_once_with(1, 3)
+        mock_table_instance.add_row.assert_called_once_with(
+            "7", "0.81", "pod pending", "hard", "None"
+        )
+
+    def test_similar_fails_when_learning_does_not_exist(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.get.return_value = None
+
+        with pytest.raises(LearningNotFound):
+            learning_logic.similar(1)
+
+        mock_learning_repo.similar.assert_not_called()
+
+    def test_create_returns_similar_learnings_above_the_threshold(
+        self, mocker: MockerFixture
+    ):
+        mocker.patch("src.logic.learning_logic.Console")
+        mocker.patch("src.logic.learning_logic._similar_table")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.create.return_value = 3
+        close, distant = (
+            {"id": 1, "score": 0.9, "challenge": "pod pending"},
+            {"id": 2, "score": 0.1, "challenge": "slow query"},
+        )
+        mock_learning_repo.similar.return_value = [close, distant]
+
+        similar = learning_logic.create(
+            challenge="pod stuck pending", solution="raise quota", learning_type="hard"
+        )
+
+        mock_learning_repo.similar.assert_called_once_with(
+            3, learning_logic.SIMILAR_LIMIT
+        )
+        assert similar == [close]
+
+    def test_create_skips_similar_learnings_when_asked(self, mocker: MockerFixture):
+        mocker.patch("src.logic.learning_logic.Console")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+
+        similar = learning_logic.create(
+            challenge="pod stuck pending",
+            solution="raise quota",
+            learning_type="hard",
+            show_similar=False,
+        )
+
+        mock_learning_repo.create.assert_called_once()
+        mock_learning_repo.similar.assert_not_called()
+        assert similar == []
+
+    def test_create_succeeds_when_similar_learnings_fail(self, mocker: MockerFixture):
+        mock_console = mocker.patch("src.logic.learning_logic.Console")
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.create.return_value = 3
+        mock_learning_repo.similar.side_effect = Exception("database is locked")
+
+        similar = learning_logic.create(
+            challenge="pod stuck pending", solution="raise quota", learning_type="hard"
+        )
+
+        assert similar == []
+        mock_console.assert_called_with(stderr=True)
+        mock_console.return_value.print.assert_called_once_with(
+            "Saved learning 3 but couldn't look up similar ones: database is locked"
+        )
+
+
+class TestImportLearnings:
+    def test_import_inserts_valid_records_in_batches(
+        self, mocker: MockerFixture, tmp_path
+    ):
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.create_many.return_value = []
+        mocker.patch("src.logic.learning_logic.Console")
+        path = tmp_path / "learnings.jsonl"
+        path.write_text(
+            "\n".join(
+                json.dumps(
+                    {
+                        "challenge": f"challenge {index}",
+                        "solution": f"solution {index}",
+                        "type": "hard",
+                        "project_id": index,
+                    }
+                )
+                for index in range(1, 6)
+            )
+        )
+
+        learning_logic.import_file(str(path), batch_size=2)
+
+        assert mock_learning_repo.create_many.call_count == 3
+        mock_learning_repo.create_many.assert_any_call(
+            [(5, "challenge 5", "solution 5", "hard")]
+        )
+
+    def test_import_reports_invalid_records_without_aborting(
+        self, mocker: MockerFixture, tmp_path
+    ):
+        mock_learning_repo = mocker.patch(
+            "src.logic.learning_logic.learning_repository"
+        )
+        mock_learning_repo.create_many.return_value = []
+        mock_console_instance = mocker.patch(
+            "src.logic.learning_logic.Console"
+        ).return_value
+        path = tmp_path / "learnings.csv"
+        path.write_text(
+            dedent(
+                """\
+                challenge,solution,type,project_id
+                challenge 1,solution 1,soft,
+                ,solution 2,soft,
+                challenge 3,solution 3,personal,
+                challenge 4,solution 4,hard,abc
+                """
+            )
+        )
+
+        learning_logic.import_file(str(path))
+
+        mock_learning_repo.create_many.assert_called_once_with(
+            [(None, "challenge 1", "solution 1", "soft")]
+        )
+        mock_console_instance.print.assert_any_call("Line 3: InvalidChallenge")
+        mock_console_instance.print.assert_any_call("Line 4: InvalidLearningType")
+        mock_console_instance.print.assert_any_call("Line 5: InvalidId")
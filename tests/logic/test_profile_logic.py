@@ -0,0 +1,42 @@
+import pstats
+
+from src.db import connection, profiling
+from src.logic import profile_logic
+from src.repositories import learning_repository
+
+
+def test_start_profiles_until_stopped(database: str, tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("COLUMNS", "200")
+    # Migrated before profiling starts
+    connection.get_connection()
+    output = str(tmp_path / "wl.pstats")
+    stop = profile_logic.start(output)
+
+    learning_repository.create(None, "challenge", "solution", "hard")
+    learning_repository.get(1)
+    stop()
+
+    err = capsys.readouterr().err
+    assert "SELECT * FROM Learning WHERE id = ?" in err
+    assert "p95 ms" in err
+    assert pstats.Stats(output).total_calls > 0
+    assert type(connection.get_connection()) is not profiling.ProfiledConnection
+
+
+def test_summary_groups_queries_slowest_first():
+    log = profiling.QueryLog()
+
+    for sql, seconds, rows in [
+        ("SELECT 1", 0.001, 1),
+        ("SELECT 2", 0.010, 1),
+        ("SELECT 1", 0.003, 1),
+    ]:
+        query = log.record(sql)
+        query.seconds, query.rows = seconds, rows
+
+    table = profile_logic.summary(log, elapsed=0.1)
+
+    assert table.title == "3 queries took 14.0 ms of 100.0 ms"
+    assert list(table.columns[0].cells) == ["SELECT 2", "SELECT 1"]
+    assert list(table.columns[1].cells) == ["1", "2"]
+    assert list(table.columns[2].cells) == ["1", "2"]
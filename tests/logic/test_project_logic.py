@@ -2,6 +2,7 @@ import sqlite3
 from textwrap import dedent
 from unittest import TestCase, mock
 
+import pytest
 from faker import Faker
 from pytest_mock import MockerFixture
 
@@ -144,6 +145,18 @@ class TestCreateProjectLogic(TestCase):
             self.project_name, self.project_context
         )
 
+    @mock.patch("src.logic.project_logic.click")
+    @mock.patch("src.logic.project_logic.project_repository")
+    def test_create_from_stdin_text_skips_editor(self, mock_project_repo, mock_click):
+        project_logic.create(
+            f"Name:\n{self.project_name}\n---\nContext:\n{self.project_context}\n"
+        )
+
+        mock_click.edit.assert_not_called()
+        mock_project_repo.create.assert_called_with(
+            self.project_name, self.project_context
+        )
+
 
 class TestUpdateProjectLogic(TestCase):
     def setUp(self):
@@ -195,6 +208,21 @@ class TestUpdateProjectLogic(TestCase):
         with self.assertRaises(sqlite3.IntegrityError):
             project_logic.update(self.project_id)
 
+    @mock.patch("src.logic.project_logic.click")
+    @mock.patch("src.logic.project_logic.project_repository")
+    def test_update_from_fields_skips_editor(self, mock_project_repo, mock_click):
+        mock_project_repo.get.return_value = {
+            "name": self.project_name,
+            "context": self.project_context,
+        }
+
+        project_logic.update(self.project_id, context="new context")
+
+        mock_click.edit.assert_not_called()
+        mock_project_repo.update.assert_called_with(
+            self.project_id, self.project_name, "new context"
+        )
+
 
 def test_list_projects_returns_empty_list_when_there_are_no_projects(
     mocker: MockerFixture,
@@ -227,3 +255,81 @@ def test_list_projects_shows_projects_with_properties(
     project_logic.read()
 
     mock_console_print.assert_called_once()
+
+
+def test_import_projects_reports_rows_rejected_by_the_database(
+    mocker: MockerFixture, tmp_path
+):
+    mock_project_repo = mocker.patch("src.logic.project_logic.project_repository")
+    mock_project_repo.create_many.return_value = [
+        (1, sqlite3.IntegrityError("UNIQUE constraint failed: Project.name"))
+    ]
+    mock_console_instance = mocker.patch("src.logic.project_logic.Console").return_value
+    path = tmp_path / "projects.jsonl"
+    path.write_text(
+        dedent(
+            """\
+            {"name": "worklog", "context": "cli"}
+            {"name": "worklog", "context": "duplicated"}
+            not json
+            """
+        )
+    )
+
+    project_logic.import_file(str(path))
+
+    mock_project_repo.create_many.assert_called_once_with(
+        [("worklog", "cli"), ("worklog", "duplicated")]
+    )
+    mock_console_instance.print.assert_any_call(
+        "Line 2: UNIQUE constraint failed: Project.name"
+    )
+    mock_console_instance.print.assert_any_call("Line 3: Invalid record")
+
+
+def test_list_projects_streams_machine_readable_formats(mocker: MockerFixture):
+    mock_table_class = mocker.patch("src.logic.project_logic.Table")
+    mock_write_records = mocker.patch("src.logic.project_logic.write_records")
+    mock_project_repo = mocker.patch("src.logic.project_logic.project_repository")
+
+    project_logic.read("ndjson")
+
+    mock_project_repo.read.assert_not_called()
+    mock_table_class.assert_not_called()
+    mock_write_records.assert_called_once_with(
+        mock_project_repo.read_chunks.return_value, "ndjson"
+    )
+
+
+def test_show_project_fails_when_project_does_not_exist(mocker: MockerFixture):
+    mock_project_repo = mocker.patch("src.logic.project_logic.project_repository")
+    mock_learning_repo = mocker.patch("src.logic.project_logic.learning_repository")
+    mock_project_repo.get.return_value = None
+
+    with pytest.raises(ProjectDoesNotExists):
+        project_logic.show(1)
+
+    mock_learning_repo.read_chunks.assert_not_called()
+
+
+def test_show_project_lists_learnings_with_counts(mocker: MockerFixture):
+    mock_console_instance = mocker.patch("src.logic.project_logic.Console").return_value
+    mock_table_instance = mocker.patch("src.logic.project_logic.Table").return_value
+    mock_project_repo = mocker.patch("src.logic.project_logic.project_repository")
+    mock_learning_repo = mocker.patch("src.logic.project_logic.learning_repository")
+    mock_project_repo.get.return_value = {"name": "worklog", "context": "cli"}
+    mock_learning_repo.count_by_type.return_value = {"soft": 1, "hard": 2}
+    learning = {
+        "id": 1,
+        "challenge": "challenge",
+        "solution": "solution",
+        "learning_type": "hard",
+        "created_at": "",
+    }
+    mock_learning_repo.read_chunks.return_value = iter([[learning] * 2, [learning]])
+
+    project_logic.show(1)
+
+    mock_learning_repo.read_chunks.assert_called_once_with(project_id=1)
+    mock_console_instance.print.assert_any_call("Learnings: 3 (soft: 1, hard: 2)")
+    assert mock_table_instance.add_row.call_count == 3
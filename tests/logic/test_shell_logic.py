@@ -0,0 +1,64 @@
+import typer
+
+from src.db import connection
+from src.logic import shell_logic
+from src.main import app
+
+
+def lines(*commands: str):
+    """
+    Stands in for input(), returns the commands one by one and then ends the
+    input like Ctrl-D
+    """
+    remaining = iter(commands)
+
+    def read_line(prompt: str) -> str:
+        try:
+            return next(remaining)
+        except StopIteration:
+            raise EOFError()
+
+    return read_line
+
+
+def test_shell_runs_commands_in_the_same_process(database: str, capsys):
+    current = connection.get_connection()
+
+    shell_logic.run(
+        typer.main.get_command(app),
+        lines(
+            "projects create --name worklog --context 'command line'",
+            "projects read",
+        ),
+    )
+
+    output = capsys.readouterr().out
+    assert "Record inserted successfully" in output
+    assert "command line" in output
+    assert connection.get_connection() is current
+
+
+def test_shell_keeps_going_after_errors(database: str, capsys):
+    shell_logic.run(
+        typer.main.get_command(app),
+        lines(
+            "learnings update 99 --challenge new",
+            "projects unknown",
+            "'unterminated",
+            "projects create --name worklog --context cli",
+        ),
+    )
+
+    output = capsys.readouterr().out
+    assert "LearningNotFound" in output
+    assert "No closing quotation" in output
+    assert "Record inserted successfully" in output
+
+
+def test_shell_stops_on_exit(database: str, capsys):
+    shell_logic.run(
+        typer.main.get_command(app),
+        lines("exit", "projects create --name worklog --context cli"),
+    )
+
+    assert "Record inserted successfully" not in capsys.readouterr().out
@@ -0,0 +1,37 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from src.logic import stats_logic
+from src.logic.stats_exceptions import InvalidPeriod
+
+
+def test_show_fails_when_period_is_unknown(mocker: MockerFixture):
+    mock_learning_repo = mocker.patch("src.logic.stats_logic.learning_repository")
+    mock_learning_repo.PERIODS = {"week": "", "month": ""}
+
+    with pytest.raises(InvalidPeriod):
+        stats_logic.show("year")
+
+    mock_learning_repo.count_by_project.assert_not_called()
+
+
+def test_show_prints_totals_per_project_and_period(mocker: MockerFixture):
+    mock_console_instance = mocker.patch("src.logic.stats_logic.Console").return_value
+    mock_table = mocker.patch("src.logic.stats_logic.Table")
+    mock_learning_repo = mocker.patch("src.logic.stats_logic.learning_repository")
+    mock_learning_repo.PERIODS = {"week": "", "month": ""}
+    mock_learning_repo.count_by_project.return_value = [
+        {"project_id": 1, "project_name": "worklog", "soft": 1, "hard": 2, "total": 3},
+        {"project_id": None, "project_name": None, "soft": 0, "hard": 1, "total": 1},
+    ]
+    mock_learning_repo.count_by_period.return_value = [
+        {"period": "2024-01-01", "soft": 1, "hard": 3, "total": 4}
+    ]
+
+    stats_logic.show("week", use_summary=False)
+
+    mock_learning_repo.count_by_project.assert_called_once_with(False)
+    mock_learning_repo.count_by_period.assert_called_once_with("week", False)
+    mock_console_instance.print.assert_any_call("Learnings: 4 (soft: 1, hard: 3)")
+    mock_table.assert_any_call("Week", "Soft", "Hard", "Total")
+    mock_table.return_value.add_row.assert_any_call("No project", "0", "1", "1")
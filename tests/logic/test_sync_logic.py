@@ -0,0 +1,190 @@
+import gzip
+import json
+import time
+
+import pytest
+
+from src.db import connection
+from src.logic import sync_logic
+from src.logic.sync_exceptions import InvalidChangeset
+from src.repositories import learning_repository, project_repository
+
+
+@pytest.fixture
+def laptop(database: str) -> str:
+    project_repository.create("worklog", "cli")
+    learning_repository.create(1, "flaky test", "freeze time", "hard", ["ci"])
+    learning_repository.create(None, "slow query", "add an index", "soft")
+
+    return database
+
+
+def sync(source: str, target: str, path: str, since: int = 0):
+    connection.configure(database=source)
+    sync_logic.export(path, since)
+    connection.configure(database=target)
+    sync_logic.apply(path)
+
+
+def challenges() -> list[str]:
+    return [learning["challenge"] for learning in learning_repository.read()]
+
+
+def changes(path: str) -> list[dict]:
+    with gzip.open(path, "rt") as file:
+        return [json.loads(line) for line in file][1:]
+
+
+def test_apply_copies_rows_with_projects_and_tags(laptop: str, tmp_path):
+    sync(laptop, str(tmp_path / "workstation.db"), str(tmp_path / "changes.gz"))
+
+    learning = learning_repository.read()[0]
+    assert challenges() == ["flaky test", "slow query"]
+    assert learning["project_name"] == "worklog"
+    assert learning["tags"] == "ci"
+
+
+def test_export_since_a_cursor_only_has_later_changes(laptop: str, tmp_path, capsys):
+    sync_logic.export(str(tmp_path / "all.gz"))
+    cursor = int(capsys.readouterr().out.split("--since ")[1])
+
+    learning_repository.update(2, None, "slow report", "add an index", "soft")
+    sync_logic.export(str(tmp_path / "since.gz"), since=cursor)
+
+    assert [change["challenge"] for change in changes(str(tmp_path / "since.gz"))] == [
+        "slow report"
+    ]
+
+
+def test_last_writer_wins(laptop: str, tmp_path):
+    workstation = str(tmp_path / "workstation.db")
+    sync(laptop, workstation, str(tmp_path / "initial.gz"))
+
+    learning_repository.update(2, None, "older edit", "add an index", "soft")
+    # Change times have millisecond precision
+    time.sleep(0.01)
+    connection.configure(database=laptop)
+    learning_repository.update(2, None, "newer edit", "add an index", "soft")
+
+    sync(laptop, workstation, str(tmp_path / "laptop.gz"))
+    sync(workstation, laptop, str(tmp_path / "workstation.gz"))
+
+    assert challenges() == ["flaky test", "newer edit"]
+    connection.configure(database=workstation)
+    assert challenges() == ["flaky test", "newer edit"]
+
+
+def test_synced_rows_are_changed_since_they_were_applied(laptop: str, tmp_path):
+    def backdate(*ids: int):
+        with connection.get_connection() as database:
+            database.executemany(
+                "UPDATE Learning SET updated_at = '2024-01-01 10:00:00' WHERE id = ?",
+                [(id,) for id in ids or (1, 2)],
+            )
+
+    def changed() -> list[str]:
+        return [
+            learning["challenge"]
+            for learning in learning_repository.read(changed_since="2025-01-01")
+        ]
+
+    workstation = str(tmp_path / "workstation.db")
+    backdate()
+    sync(laptop, workstation, str(tmp_path / "initial.gz"))
+
+    assert changed() == ["flaky test", "slow query"]
+
+    backdate()
+    connection.configure(database=laptop)
+    learning_repository.update(2, None, "slow report", "add an index", "soft")
+    backdate(2)
+    sync(laptop, workstation, str(tmp_path / "laptop.gz"), since=3)
+
+    assert changed() == ["slow report"]
+
+
+def test_deletes_are_synced(laptop: str, tmp_path):
+    workstation = str(tmp_path / "workstation.db")
+    sync(laptop, workstation, str(tmp_path / "initial.gz"))
+
+    connection.configure(database=laptop)
+    with connection.get_connection() as laptop_connection:
+        laptop_connection.execute("DELETE FROM Learning WHERE id = 1")
+
+    sync(laptop, workstation, str(tmp_path / "delete.gz"))
+
+    assert challenges() == ["slow query"]
+
+
+def test_applying_a_changeset_again_changes_nothing(laptop: str, tmp_path, capsys):
+    sync(laptop, str(tmp_path / "workstation.db"), str(tmp_path / "changes.gz"))
+
+    sync_logic.apply(str(tmp_path / "changes.gz"))
+
+    assert "Applied 0 of 3 changes" in capsys.readouterr().out
+    assert challenges() == ["flaky test", "slow query"]
+
+
+def test_projects_with_the_same_name_are_merged(laptop: str, tmp_path):
+    workstation = str(tmp_path / "workstation.db")
+    connection.configure(database=workstation)
+    project_repository.create("worklog", "cli on the workstation")
+
+    sync(laptop, workstation, str(tmp_path / "laptop.gz"))
+    sync(workstation, laptop, str(tmp_path / "workstation.gz"))
+
+    assert [project["name"] for project in project_repository.read()] == ["worklog"]
+    assert learning_repository.read()[0]["project_name"] == "worklog"
+
+
+@pytest.mark.parametrize(
+    "content", [b"not gzip", gzip.compress(b'{"format": "wl-export"}\n')]
+)
+def test_apply_rejects_other_files(database: str, tmp_path, content: bytes):
+    path = tmp_path / "changes.gz"
+    path.write_bytes(content)
+
+    with pytest.raises(InvalidChangeset):
+        sync_logic.apply(str(path))
+
+
+def test_rename_to_a_taken_name_is_reported_and_the_rest_applied(
+    laptop: str, tmp_path, capsys
+):
+    workstation = str(tmp_path / "workstation.db")
+    sync(laptop, workstation, str(tmp_path / "laptop.gz"))
+    project_repository.create("blog", "posts")
+
+    connection.configure(database=laptop)
+    project_repository.update(1, "blog", "cli")
+    learning_repository.update(2, None, "slow query", "add a covering index", "soft")
+    sync(laptop, workstation, str(tmp_path / "rename.gz"), since=3)
+
+    output = capsys.readouterr().out
+    assert "Applied 1 of 2 changes" in output
+    assert "1 changes conflict with local rows" in output
+    assert [project["name"] for project in project_repository.read()] == [
+        "worklog",
+        "blog",
+    ]
+    assert learning_repository.read()[1]["solution"] == "add a covering index"
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"type": "project", "sync_id": "a", "deleted": False, "changed_at": "now"},
+        {"type": "learning", "deleted": True, "changed_at": "now"},
+        {"type": "project", "sync_id": "a", "changed_at": "now", "name": "wl"},
+    ],
+)
+def test_apply_rejects_changes_with_missing_keys(database: str, tmp_path, change: dict):
+    path = tmp_path / "changes.gz"
+    path.write_bytes(
+        gzip.compress(
+            f'{{"format": "wl-sync"}}\n{json.dumps(change)}\n'.encode("utf-8")
+        )
+    )
+
+    with pytest.raises(InvalidChangeset):
+        sync_logic.apply(str(path))
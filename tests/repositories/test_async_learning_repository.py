@@ -0,0 +1,179 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.db import executor
+from src.db.connection import get_connection
+from src.repositories import async_learning_repository, learning_repository
+
+
+@pytest.fixture(autouse=True)
+def database_executor(database: str):
+    yield
+
+    executor.shutdown()
+
+
+def test_create_update_and_read(database: str):
+    async def main():
+        await async_learning_repository.create(None, "challenge", "solution", "hard")
+        await async_learning_repository.update(
+            1, None, "new challenge", "solution", "soft"
+        )
+
+        return await async_learning_repository.get(1)
+
+    learning = asyncio.run(main())
+
+    assert learning["challenge"] == "new challenge"
+    assert learning["learning_type"] == "soft"
+
+
+def test_create_returns_the_id_and_writes_tags(database: str):
+    async def main():
+        first = await async_learning_repository.create(
+            None, "challenge", "solution", "hard", ["k8s"]
+        )
+        second = await async_learning_repository.create(
+            None, "challenge", "solution", "hard"
+        )
+        await async_learning_repository.update(
+            second, None, "challenge", "solution", "hard", ["oncall", "k8s"]
+        )
+
+        return first, second
+
+    assert asyncio.run(main()) == (1, 2)
+    assert learning_repository.get_tags(1) == ["k8s"]
+    assert learning_repository.get_tags(2) == ["k8s", "oncall"]
+
+
+@pytest.mark.parametrize(
+    "tags, any_tag, expected_ids",
+    [
+        (["k8s", "oncall"], False, [2]),
+        (["oncall", "postgres"], True, [2, 3]),
+    ],
+)
+def test_read_and_read_stream_filter_by_tags(
+    database: str, tags: list[str], any_tag: bool, expected_ids: list[int]
+):
+    learning_repository.create(None, "challenge 1", "solution", "hard", ["k8s"])
+    learning_repository.create(
+        None, "challenge 2", "solution", "hard", ["k8s", "oncall"]
+    )
+    learning_repository.create(None, "challenge 3", "solution", "soft", ["postgres"])
+
+    async def main():
+        read = await async_learning_repository.read(tags=tags, any_tag=any_tag)
+        streamed = [
+            learning
+            async for learning in async_learning_repository.read_stream(
+                chunk_size=1, tags=tags, any_tag=any_tag
+            )
+        ]
+
+        return read, streamed
+
+    read, streamed = asyncio.run(main())
+
+    assert [learning["id"] for learning in read] == expected_ids
+    assert [learning["id"] for learning in streamed] == expected_ids
+
+
+def test_calls_run_on_the_executor_thread(mocker):
+    mocker.patch.object(
+        learning_repository, "get", side_effect=lambda id: threading.get_ident()
+    )
+
+    thread = asyncio.run(async_learning_repository.get(1))
+
+    assert thread != threading.get_ident()
+
+
+def test_concurrent_requests_are_all_served():
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(50)]
+    )
+
+    async def main():
+        return await asyncio.gather(
+            *(async_learning_repository.get(id) for id in range(1, 51))
+        )
+
+    learnings = asyncio.run(main())
+
+    assert [learning["id"] for learning in learnings] == list(range(1, 51))
+
+
+def test_errors_are_raised_in_the_awaiting_task():
+    async def main():
+        await async_learning_repository.create(None, "challenge", "solution", "bad")
+
+    with pytest.raises(Exception, match="CHECK constraint failed"):
+        asyncio.run(main())
+
+
+def test_read_stream_yields_rows_chunk_by_chunk():
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(10)]
+    )
+
+    async def main():
+        return [
+            learning["id"]
+            async for learning in async_learning_repository.read_stream(
+                after_id=3, chunk_size=4
+            )
+        ]
+
+    assert asyncio.run(main()) == list(range(4, 11))
+
+
+def test_read_stream_can_stop_early():
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(10)]
+    )
+
+    async def main():
+        ids = []
+        stream = async_learning_repository.read_stream(chunk_size=2)
+
+        async for learning in stream:
+            ids.append(learning["id"])
+
+            if len(ids) == 3:
+                break
+
+        await stream.aclose()
+
+        return ids
+
+    assert asyncio.run(main()) == [1, 2, 3]
+
+
+def test_read_and_read_stream_changed_since():
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(3)]
+    )
+    with get_connection() as connection:
+        connection.execute("UPDATE Learning SET updated_at = '2024-01-01 10:00:00'")
+
+    learning_repository.update(2, None, "edited", "solution", "soft")
+
+    async def main():
+        read = await async_learning_repository.read(changed_since="2024-01-02")
+        streamed = [
+            learning
+            async for learning in async_learning_repository.read_stream(
+                changed_since="2024-01-02"
+            )
+        ]
+
+        return read, streamed
+
+    read, streamed = asyncio.run(main())
+
+    assert [learning["id"] for learning in read] == [2]
+    assert [learning["id"] for learning in streamed] == [2]
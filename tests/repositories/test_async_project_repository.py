@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from src.db import executor
+from src.db.connection import get_connection
+from src.repositories import async_project_repository, project_repository
+
+
+@pytest.fixture(autouse=True)
+def database_executor(database: str):
+    yield
+
+    executor.shutdown()
+
+
+def test_create_update_and_get():
+    async def main():
+        await async_project_repository.create("worklog", "cli")
+        await async_project_repository.update(1, "wl", "new context")
+
+        return await async_project_repository.get(1)
+
+    project = asyncio.run(main())
+
+    assert project["name"] == "wl"
+    assert project["context"] == "new context"
+
+
+def test_read_stream_yields_rows_chunk_by_chunk():
+    project_repository.create_many(
+        [(f"project {index}", "context") for index in range(5)]
+    )
+
+    async def main():
+        return [
+            project["id"]
+            async for project in async_project_repository.read_stream(chunk_size=2)
+        ]
+
+    assert asyncio.run(main()) == [1, 2, 3, 4, 5]
+
+
+def test_read_and_read_stream_changed_since():
+    project_repository.create("worklog", "cli")
+    project_repository.create("dotfiles", "configs")
+    with get_connection() as connection:
+        connection.execute("UPDATE Project SET updated_at = '2024-01-01 10:00:00'")
+
+    project_repository.update(2, "dotfiles", "shell configs")
+
+    async def main():
+        read = await async_project_repository.read("2024-01-02")
+        streamed = [
+            project
+            async for project in async_project_repository.read_stream(
+                changed_since="2024-01-02"
+            )
+        ]
+
+        return read, streamed
+
+    read, streamed = asyncio.run(main())
+
+    assert [project["name"] for project in read] == ["dotfiles"]
+    assert [project["name"] for project in streamed] == ["dotfiles"]
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from src.repositories import learning_repository, project_repository
+from src.repositories.buffered_writer import BufferedWriter
+
+
+def test_rows_are_written_when_max_rows_are_queued(database: str):
+    with BufferedWriter(max_rows=3, max_delay=60) as writer:
+        writer.add_project("worklog", "cli")
+        writer.add_learning(1, "challenge 1", "solution", "soft")
+
+        assert project_repository.read() == []
+
+        writer.add_learning(1, "challenge 2", "solution", "hard")
+
+        assert len(project_repository.read()) == 1
+        assert len(learning_repository.read()) == 2
+
+
+def test_rows_are_written_when_max_delay_passes(database: str):
+    with BufferedWriter(max_rows=1000, max_delay=0.05) as writer:
+        writer.add_learning(None, "challenge", "solution", "soft")
+
+        deadline = time.monotonic() + 5
+
+        while not learning_repository.read() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(learning_repository.read()) == 1
+
+
+def test_close_flushes_queued_rows(database: str):
+    writer = BufferedWriter(max_rows=1000, max_delay=60)
+
+    for index in range(10):
+        writer.add_learning(None, f"challenge {index}", "solution", "soft")
+
+    writer.close()
+
+    assert len(learning_repository.read()) == 10
+
+
+def test_rows_cannot_be_added_after_close(database: str):
+    writer = BufferedWriter(max_rows=1000, max_delay=60)
+    writer.close()
+
+    with pytest.raises(RuntimeError):
+        writer.add_learning(None, "challenge", "solution", "soft")
+
+    with pytest.raises(RuntimeError):
+        writer.add_project("worklog", "cli")
+
+    assert learning_repository.read() == []
+    assert project_repository.read() == []
+
+
+def test_rejected_rows_are_reported(database: str):
+    with BufferedWriter(max_rows=1000, max_delay=60) as writer:
+        writer.add_project("worklog", "cli")
+        writer.add_project("worklog", "duplicated")
+
+    assert [row for row, _ in writer.failures] == [("worklog", "duplicated")]
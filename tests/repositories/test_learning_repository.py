@@ -0,0 +1,378 @@
+import pytest
+
+from src.db.connection import get_connection
+from src.repositories import learning_repository, project_repository
+
+
+def test_create_and_get_learning(database: str):
+    project_repository.create("worklog", "cli to track learnings")
+
+    learning_repository.create(1, "challenge", "solution", "hard")
+
+    learning = learning_repository.get(1)
+    assert learning["challenge"] == "challenge"
+    assert learning["solution"] == "solution"
+    assert learning["learning_type"] == "hard"
+    assert learning["project_id"] == 1
+
+
+def test_update_learning(database: str):
+    learning_repository.create(None, "challenge", "solution", "hard")
+    learning_repository.get(1)
+
+    learning_repository.update(1, None, "new challenge", "new solution", "soft")
+
+    learning = learning_repository.get(1)
+    assert learning["challenge"] == "new challenge"
+    assert learning["learning_type"] == "soft"
+
+
+def test_read_learnings(database: str):
+    learning_repository.create(None, "challenge 1", "solution 1", "hard")
+    learning_repository.create(None, "challenge 2", "solution 2", "soft")
+
+    learnings = learning_repository.read()
+
+    assert [learning["challenge"] for learning in learnings] == [
+        "challenge 1",
+        "challenge 2",
+    ]
+
+
+def test_create_many_inserts_all_rows(database: str):
+    failures = learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(10)]
+    )
+
+    assert failures == []
+    assert len(learning_repository.read()) == 10
+
+
+def test_read_paginates_after_id(database: str):
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(10)]
+    )
+
+    page = learning_repository.read(limit=3, after_id=4)
+
+    assert [learning["id"] for learning in page] == [5, 6, 7]
+
+
+def test_read_chunks_streams_rows_in_chunks(database: str):
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(10)]
+    )
+
+    chunks = list(learning_repository.read_chunks(after_id=2, chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+    assert chunks[0][0]["id"] == 3
+
+
+def test_search_ranks_matching_learnings_with_snippets(database: str):
+    learning_repository.create(None, "postgres deadlock", "reorder locks", "hard")
+    learning_repository.create(None, "slow build", "cache docker layers", "hard")
+    learning_repository.create(None, "postgres vacuum", "tune postgres", "hard")
+
+    learnings = learning_repository.search("postgres")
+
+    assert [learning["id"] for learning in learnings] == [3, 1]
+    assert (
+        f"{learning_repository.SNIPPET_START}postgres"
+        f"{learning_repository.SNIPPET_END}"
+    ) in learnings[0]["snippet"]
+
+
+def test_search_index_follows_updates(database: str):
+    learning_repository.create(None, "postgres deadlock", "reorder locks", "hard")
+
+    learning_repository.update(1, None, "mysql deadlock", "reorder locks", "hard")
+
+    assert learning_repository.search("postgres") == []
+    assert [learning["id"] for learning in learning_repository.search("mysql")] == [1]
+
+
+def test_search_treats_query_syntax_as_text(database: str):
+    learning_repository.create(None, "kube-proxy crash", "restart node", "hard")
+
+    learnings = learning_repository.search('kube-proxy "crash')
+
+    assert [learning["id"] for learning in learnings] == [1]
+
+
+def test_read_filters_by_project_type_and_date(database: str):
+    learning_repository.create_many(
+        [
+            (1, "challenge 1", "solution", "soft"),
+            (1, "challenge 2", "solution", "hard"),
+            (2, "challenge 3", "solution", "hard"),
+        ]
+    )
+    get_connection().execute(
+        "UPDATE Learning SET created_at = '2024-03-10 18:00:00' WHERE id = 2"
+    )
+    get_connection().commit()
+
+    by_project = learning_repository.read(project_id=1, learning_type="hard")
+    by_date = learning_repository.read(since="2024-03-10", until="2024-03-10")
+
+    assert [learning["id"] for learning in by_project] == [2]
+    assert [learning["id"] for learning in by_date] == [2]
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"project_id": 1}, "LearningProjectId"),
+        ({"learning_type": "hard"}, "LearningType"),
+        ({"since": "2024-01-01"}, "LearningCreatedAt"),
+        ({"until": "2024-01-01"}, "LearningCreatedAt"),
+        ({"changed_since": "2024-01-01 10:00:00"}, "LearningUpdatedAt"),
+    ],
+)
+def test_read_filters_use_an_index(database: str, filters: dict, index: str):
+    query, parameters = learning_repository._read_query(
+        **{
+            "limit": None,
+            "after_id": 10,
+            "project_id": None,
+            "learning_type": None,
+            "since": None,
+            "until": None,
+            **filters,
+        }
+    )
+
+    plan = " ".join(
+        row["detail"]
+        for row in get_connection().execute(f"EXPLAIN QUERY PLAN {query}", parameters)
+    )
+
+    assert f"USING INDEX {index}" in plan
+
+
+def test_create_and_update_tags(database: str):
+    id = learning_repository.create(None, "challenge", "solution", "hard", ["k8s"])
+    learning_repository.get(id)
+
+    learning_repository.update(
+        id, None, "challenge", "solution", "hard", ["postgres", "oncall"]
+    )
+    learning_repository.update(id, None, "new challenge", "solution", "hard")
+
+    assert learning_repository.get_tags(id) == ["oncall", "postgres"]
+    assert learning_repository.read()[0]["tags"] == "oncall, postgres"
+
+
+@pytest.mark.parametrize(
+    "tags, any_tag, expected_ids",
+    [
+        (["k8s"], False, [1, 2]),
+        (["k8s", "oncall"], False, [2]),
+        (["oncall", "postgres"], True, [2, 3]),
+        (["unknown"], True, []),
+    ],
+)
+def test_read_filters_by_tags(
+    database: str, tags: list[str], any_tag: bool, expected_ids: list[int]
+):
+    learning_repository.create(None, "challenge 1", "solution", "hard", ["k8s"])
+    learning_repository.create(
+        None, "challenge 2", "solution", "hard", ["k8s", "oncall"]
+    )
+    learning_repository.create(None, "challenge 3", "solution", "soft", ["postgres"])
+
+    learnings = learning_repository.read(tags=tags, any_tag=any_tag)
+
+    assert [learning["id"] for learning in learnings] == expected_ids
+
+
+@pytest.mark.parametrize("any_tag", [False, True])
+def test_read_tag_filter_uses_the_tag_index(database: str, any_tag: bool):
+    query, parameters = learning_repository._read_query(
+        limit=None,
+        after_id=None,
+        project_id=None,
+        learning_type=None,
+        since=None,
+        until=None,
+        tags=["k8s", "oncall"],
+        any_tag=any_tag,
+    )
+
+    plan = " ".join(
+        row["detail"]
+        for row in get_connection().execute(f"EXPLAIN QUERY PLAN {query}", parameters)
+    )
+
+    assert "USING COVERING INDEX LearningTagTag" in plan
+    assert "SCAN LearningTag" not in plan
+
+
+def test_deleting_a_learning_removes_its_tags(database: str):
+    learning_repository.create(None, "challenge", "solution", "hard", ["k8s"])
+
+    with get_connection() as connection:
+        connection.execute("DELETE FROM Learning WHERE id = 1")
+
+    assert get_connection().execute("SELECT * FROM LearningTag").fetchall() == []
+
+
+def test_read_joins_project_name_and_context(database: str):
+    project_repository.create("worklog", "cli to track learnings")
+    learning_repository.create(1, "challenge", "solution", "hard")
+    learning_repository.create(None, "challenge", "solution", "hard")
+
+    learnings = learning_repository.read()
+
+    assert [
+        (learning["project_name"], learning["project_context"])
+        for learning in learnings
+    ] == [("worklog", "cli to track learnings"), (None, None)]
+
+
+def test_count_by_type_counts_project_learnings(database: str):
+    learning_repository.create_many(
+        [
+            (1, "challenge 1", "solution", "soft"),
+            (1, "challenge 2", "solution", "hard"),
+            (1, "challenge 3", "solution", "hard"),
+            (2, "challenge 4", "solution", "hard"),
+        ]
+    )
+
+    assert learning_repository.count_by_type(1) == {"soft": 1, "hard": 2}
+
+
+def create_learning_on(day: str, project_id, learning_type: str):
+    with get_connection() as connection:
+        connection.execute(
+            "INSERT INTO Learning (challenge, solution, learning_type, project_id, "
+            "created_at) VALUES ('challenge', 'solution', ?, ?, ?)",
+            (learning_type, project_id, f"{day} 10:00:00"),
+        )
+
+
+@pytest.mark.parametrize("use_summary", [True, False])
+def test_count_by_project_and_period(database: str, use_summary: bool):
+    project_repository.create("worklog", "cli")
+    create_learning_on("2024-01-01", 1, "hard")
+    create_learning_on("2024-01-07", 1, "soft")
+    create_learning_on("2024-02-01", None, "hard")
+
+    by_project = learning_repository.count_by_project(use_summary)
+    by_week = learning_repository.count_by_period("week", use_summary)
+    by_month = learning_repository.count_by_period("month", use_summary)
+
+    assert [tuple(row) for row in by_project] == [
+        (1, "worklog", 1, 1, 2),
+        (None, None, 0, 1, 1),
+    ]
+    assert [tuple(row) for row in by_week] == [
+        ("2024-01-01", 1, 1, 2),
+        ("2024-01-29", 0, 1, 1),
+    ]
+    assert [tuple(row) for row in by_month] == [
+        ("2024-01", 1, 1, 2),
+        ("2024-02", 0, 1, 1),
+    ]
+
+
+def test_summary_follows_updates_and_deletes(database: str):
+    project_repository.create("worklog", "cli")
+    create_learning_on("2024-01-01", None, "hard")
+    create_learning_on("2024-01-02", None, "hard")
+
+    learning_repository.update(1, 1, "challenge", "solution", "soft")
+
+    with get_connection() as connection:
+        connection.execute("DELETE FROM Learning WHERE id = 2")
+
+    for period in ("week", "month"):
+        assert [tuple(row) for row in learning_repository.count_by_period(period)] == [
+            tuple(row) for row in learning_repository.count_by_period(period, False)
+        ]
+
+    assert [tuple(row) for row in learning_repository.count_by_project()] == [
+        (1, "worklog", 1, 0, 1)
+    ]
+    assert learning_repository.count_by_type(1) == {"soft": 1}
+
+
+def test_similar_ranks_near_duplicates_first(database: str):
+    learning_repository.create(
+        None, "pod stuck in pending state", "raise the namespace quota", "hard"
+    )
+    learning_repository.create(
+        None, "slow report query", "add an index on created_at", "hard"
+    )
+    learning_repository.create(
+        None, "pod pending forever", "the namespace quota was too low", "hard"
+    )
+    learning_repository.create(None, "flaky test", "freeze the clock", "soft")
+
+    similar = learning_repository.similar(1, limit=2)
+
+    assert [learning["id"] for learning in similar] == [3]
+    assert 0 < similar[0]["score"] <= 1
+
+
+def test_similar_follows_updates_and_deletes(database: str):
+    learning_repository.create(None, "pod stuck pending", "raise the quota", "hard")
+    learning_repository.create(None, "slow query", "add an index", "hard")
+    learning_repository.create(None, "flaky test", "freeze the clock", "soft")
+    learning_repository.similar(1)
+
+    learning_repository.update(2, None, "pod pending", "quota too low", "hard")
+
+    assert [learning["id"] for learning in learning_repository.similar(1)] == [2]
+
+    with get_connection() as connection:
+        connection.execute("DELETE FROM Learning WHERE id = 2")
+
+    assert learning_repository.similar(1) == []
+    assert (
+        get_connection()
+        .execute("SELECT documents FROM TermDocuments WHERE term = 'pending'")
+        .fetchone()[0]
+        == 1
+    )
+
+
+def test_index_pending_terms_indexes_each_learning_once(database: str):
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(5)]
+    )
+
+    assert learning_repository.index_pending_terms() == 5
+    assert learning_repository.index_pending_terms() == 0
+
+
+def test_update_maintains_updated_at(database: str):
+    learning_repository.create(None, "challenge", "solution", "hard")
+    with get_connection() as connection:
+        connection.execute(
+            "UPDATE Learning SET created_at = ?, updated_at = ?",
+            ("2024-01-01 10:00:00", "2024-01-01 10:00:00"),
+        )
+
+    learning_repository.update(1, None, "new challenge", "solution", "hard")
+
+    learning = learning_repository.get(1)
+    assert learning["created_at"] == "2024-01-01 10:00:00"
+    assert learning["updated_at"] > "2024-01-01 10:00:00"
+
+
+def test_read_changed_since(database: str):
+    learning_repository.create_many(
+        [(None, f"challenge {index}", "solution", "soft") for index in range(3)]
+    )
+    with get_connection() as connection:
+        connection.execute("UPDATE Learning SET updated_at = '2024-01-01 10:00:00'")
+
+    learning_repository.update(2, None, "edited", "solution", "soft")
+
+    assert [
+        learning["id"]
+        for learning in learning_repository.read(changed_since="2024-01-02")
+    ] == [2]
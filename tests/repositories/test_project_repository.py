@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from src.db.connection import get_connection
+from src.repositories import project_repository
+
+
+def test_create_and_get_project(database: str):
+    project_repository.create("worklog", "cli to track learnings")
+
+    project = project_repository.get(1)
+
+    assert project["name"] == "worklog"
+    assert project["context"] == "cli to track learnings"
+
+
+def test_create_project_fails_when_name_already_exists(database: str):
+    project_repository.create("worklog", "cli to track learnings")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        project_repository.create("worklog", "another context")
+
+
+def test_update_project(database: str):
+    project_repository.create("worklog", "cli to track learnings")
+
+    project_repository.update(1, "wl", "new context")
+
+    project = project_repository.get(1)
+    assert project["name"] == "wl"
+    assert project["context"] == "new context"
+
+
+def test_get_project_is_cached_until_updated(database: str):
+    project_repository.create("worklog", "cli")
+    hits = project_repository.cache.hits
+
+    project_repository.get(1)
+    project_repository.get(1)
+
+    assert project_repository.cache.hits == hits + 1
+
+    project_repository.update(1, "worklog", "command line")
+
+    assert project_repository.get(1)["context"] == "command line"
+
+
+def test_read_projects(database: str):
+    project_repository.create("worklog", "cli to track learnings")
+    project_repository.create("blog", "personal site")
+
+    projects = project_repository.read()
+
+    assert [project["name"] for project in projects] == ["worklog", "blog"]
+
+
+def test_create_many_keeps_valid_rows_when_some_are_rejected(database: str):
+    failures = project_repository.create_many(
+        [("worklog", "cli"), ("worklog", "duplicated"), ("blog", "site")]
+    )
+
+    assert [position for position, _ in failures] == [1]
+    assert [project["name"] for project in project_repository.read()] == [
+        "worklog",
+        "blog",
+    ]
+
+
+def test_read_chunks_streams_projects(database: str):
+    project_repository.create_many(
+        [(f"project {index}", "context") for index in range(5)]
+    )
+
+    chunks = list(project_repository.read_chunks(chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_read_changed_since_uses_updated_at(database: str):
+    project_repository.create("worklog", "cli")
+    project_repository.create("dotfiles", "configs")
+    with get_connection() as connection:
+        connection.execute("UPDATE Project SET updated_at = '2024-01-01 10:00:00'")
+
+    project_repository.update(2, "dotfiles", "shell configs")
+
+    assert [project["name"] for project in project_repository.read("2024-01-02")] == [
+        "dotfiles"
+    ]
+    assert [
+        project["name"]
+        for chunk in project_repository.read_chunks(changed_since="2024-01-01")
+        for project in chunk
+    ] == ["worklog", "dotfiles"]
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from src import client
+from src.logic.daemon_exceptions import UnsafeSocketDirectory
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["shell"],
+        ["daemon", "--stop"],
+        ["learnings", "create"],
+        ["learnings", "update", "1"],
+        ["projects", "create"],
+    ],
+)
+def test_commands_that_need_the_terminal_run_in_process(args: list[str]):
+    assert client.runs_in_process(args)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--profile", "learnings", "create"],
+        ["--profile", "shell"],
+        ["--profile-output", "wl.pstats", "projects", "update", "1"],
+        ["--profile-output=wl.pstats", "--profile", "daemon"],
+    ],
+)
+def test_root_options_are_skipped_to_find_the_command(args: list[str]):
+    assert client.runs_in_process(args)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["learnings", "read"],
+        ["learnings", "create", "--challenge", "challenge"],
+        ["learnings", "update", "1", "--from-stdin"],
+        ["projects", "show", "1"],
+        ["--profile", "learnings", "read"],
+        ["--profile", "learnings", "create", "--challenge", "challenge"],
+    ],
+)
+def test_other_commands_go_to_the_daemon(args: list[str]):
+    assert not client.runs_in_process(args)
+
+
+def test_socket_path_depends_on_the_database(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    path = client.socket_path("worklog.db")
+
+    assert path.startswith(str(tmp_path))
+    assert path == client.socket_path(os.path.abspath("worklog.db"))
+    assert path != client.socket_path("other.db")
+
+
+def test_socket_directory_is_created_private(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
+
+    directory = client.socket_directory()
+
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+
+
+@pytest.mark.parametrize("shared", ["writable", "symlink"])
+def test_socket_directory_others_can_write_is_refused(
+    monkeypatch, tmp_path, shared: str
+):
+    directory = tmp_path / "run"
+
+    if shared == "writable":
+        directory.mkdir(mode=0o777)
+        directory.chmod(0o777)
+    else:
+        (tmp_path / "private").mkdir(mode=0o700)
+        directory.symlink_to(tmp_path / "private")
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(directory))
+
+    with pytest.raises(UnsafeSocketDirectory):
+        client.socket_path("worklog.db")
+
+
+def test_commands_run_in_process_when_the_socket_directory_is_shared(
+    mocker, monkeypatch, tmp_path
+):
+    (tmp_path / "run").mkdir(mode=0o777)
+    (tmp_path / "run").chmod(0o777)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
+    send = mocker.patch.object(client, "send")
+    run_in_process = mocker.patch.object(client, "run_in_process")
+
+    assert client.main(["learnings", "read"]) == 0
+
+    send.assert_not_called()
+    run_in_process.assert_called_once_with(["learnings", "read"], None)
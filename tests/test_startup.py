@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Time spent importing src.main on top of Typer itself, in microseconds. Typer
+# and click are the floor, everything else should be loaded by the command
+STARTUP_BUDGET_US = 30_000
+
+EAGER_IMPORTS_NOT_ALLOWED = (
+    "rich",
+    "sqlite3",
+    "src.logic",
+    "src.repositories",
+    "src.utils",
+)
+
+
+def import_times() -> dict[str, int]:
+    """
+    Cumulative import time in microseconds of every module loaded by
+    `import src.main` in a fresh interpreter
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, module = line.split("|")
+
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def test_main_does_not_import_logic_or_rich_eagerly():
+    eager_imports = [
+        module
+        for module in import_times()
+        if module.split(".")[0] in EAGER_IMPORTS_NOT_ALLOWED
+        or module.startswith(EAGER_IMPORTS_NOT_ALLOWED)
+    ]
+
+    assert eager_imports == []
+
+
+def test_main_import_time_stays_within_budget():
+    times = import_times()
+
+    assert times["src.main"] - times["typer"] < STARTUP_BUDGET_US
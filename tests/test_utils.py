@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import random
+from typing import Optional
+
+import pytest
+
+from src.utils import InvalidOutputFormat, parse_user_input, write_records
+
+KEYS = ("challenge", "solution", "type", "project_id")
+
+# Pieces the random templates are made of, including separators and line
+# breaks the parser treats specially and key lines that differ in case/spacing
+PIECES = [
+    "Challenge:",
+    "Solution:",
+    "Type:",
+    "Project id:",
+    "  PROJECT   ID:",
+    "challenge :",
+    "Other:",
+    ":",
+    "---",
+    "--- ",
+    "---:",
+    "",
+    " ",
+    "text",
+    "  indented",
+    "trailing:",
+    "a: b",
+    "\t",
+    "é",
+]
+LINE_BREAKS = ["\n", "\n", "\n", "\r\n", "\r", "\x0b", "\x1c", "\x85", "\u2028"]
+
+
+def previous_parse_user_input(content: str, keys_to_extract: tuple) -> dict[str, str]:
+    """
+    The line by line implementation parse_user_input replaced, kept as the
+    reference its results are checked against
+    """
+    current_field: Optional[str | None] = None
+    data: dict[str, list[str]] = {}
+
+    for line in content.splitlines():
+        if line == "---":
+            current_field = None
+            continue
+
+        if line.endswith(":"):
+            name = "_".join(line[:-1].split()).lower()
+            if name in keys_to_extract:
+                current_field = name
+                data.setdefault(name, [])
+                continue
+
+        if current_field:
+            data[current_field].append(line)
+
+    return {field: "\n".join(content).strip() for field, content in data.items()}
+
+
+def random_template(randomizer: random.Random) -> str:
+    lines = randomizer.choices(PIECES, k=randomizer.randint(0, 30))
+
+    return "".join(
+        line + randomizer.choice(LINE_BREAKS) for line in lines
+    ) + randomizer.choice(["", "text", "Solution:"])
+
+
+def test_parse_user_input_extracts_fields():
+    content = "Challenge:\n  slow reads\n\nSolution:\nadd an index\nType:\nhard\n---"
+
+    assert parse_user_input(content, KEYS) == {
+        "challenge": "slow reads",
+        "solution": "add an index",
+        "type": "hard",
+    }
+
+
+def test_parse_user_input_accumulates_repeated_fields():
+    content = "Solution:\nfirst\n---\nnotes\nSolution:\nsecond"
+
+    assert parse_user_input(content, KEYS) == {"solution": "first\nsecond"}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_parse_user_input_matches_previous_implementation(seed: int):
+    randomizer = random.Random(seed)
+
+    for _ in range(200):
+        content = random_template(randomizer)
+
+        assert list(parse_user_input(content, KEYS).items()) == list(
+            previous_parse_user_input(content, KEYS).items()
+        ), repr(content)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_parse_user_input_reads_files_and_lines(seed: int):
+    randomizer = random.Random(seed)
+
+    for _ in range(200):
+        content = random_template(randomizer)
+        expected = previous_parse_user_input(content, KEYS)
+
+        assert parse_user_input(content.splitlines(keepends=True), KEYS) == expected
+        assert parse_user_input(io.StringIO(content), KEYS) == expected
+
+
+CHUNKS = [
+    [{"id": 1, "name": "worklog"}, {"id": 2, "name": "blog"}],
+    [{"id": 3, "name": "notes, drafts"}],
+]
+
+
+def test_write_records_as_json_array():
+    output = io.StringIO()
+
+    write_records(iter(CHUNKS), "json", output)
+
+    assert json.loads(output.getvalue()) == CHUNKS[0] + CHUNKS[1]
+
+
+def test_write_records_as_empty_json_array():
+    output = io.StringIO()
+
+    write_records(iter([]), "json", output)
+
+    assert json.loads(output.getvalue()) == []
+
+
+def test_write_records_as_ndjson():
+    output = io.StringIO()
+
+    write_records(iter(CHUNKS), "ndjson", output)
+
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == (
+        CHUNKS[0] + CHUNKS[1]
+    )
+
+
+def test_write_records_as_csv():
+    output = io.StringIO()
+
+    write_records(iter(CHUNKS), "csv", output)
+
+    output.seek(0)
+    assert list(csv.DictReader(output)) == [
+        {"id": "1", "name": "worklog"},
+        {"id": "2", "name": "blog"},
+        {"id": "3", "name": "notes, drafts"},
+    ]
+
+
+@pytest.mark.parametrize("output_format", ["xml", "table"])
+def test_write_records_fails_when_format_is_not_supported(output_format: str):
+    with pytest.raises(InvalidOutputFormat):
+        write_records(iter(CHUNKS), output_format, io.StringIO())